@@ -0,0 +1,97 @@
+"""
+수집된 기사 컬렉션 (메모리 색인).
+
+- ArticleRecord: __slots__ 기반의 가벼운 기사 레코드 (dict보다 작고 속성 접근이 빠름)
+- 정규화한 링크 해시 색인: 같은 기사의 Google News 링크가 ?oc=5 같은 추적 인자만 다른 경우도
+  O(1)로 중복 판정 (기존: 목록 전체를 훑는 링크 완전 일치 비교)
+- 카테고리 버킷: 추가할 때 바로 분류해 두므로 분석/렌더링 단계에서 매번 다시 묶지 않음
+- ID → 레코드 조회: ID는 추가 순서(0부터)이므로 목록 인덱스로 바로 조회
+- select(ids): 일부 기사만 담은 읽기 전용 보기 (ID 유지, AI 분석에 상위 기사만 넘길 때 사용)
+"""
+from article_store import canonical_link
+
+
+class ArticleRecord:
+    __slots__ = ("id", "title", "link", "canonical_link", "keyword", "category", "date", "published")
+
+    def __init__(self, id, title, link, keyword, category, date="", published=None):
+        self.id = id
+        self.title = title
+        self.link = link
+        self.canonical_link = canonical_link(link)
+        self.keyword = keyword
+        self.category = category
+        self.date = date            # 피드의 발행 시각 문자열 (프롬프트에 그대로 사용)
+        self.published = published  # 파싱한 발행 시각 (UTC datetime, 없으면 None)
+
+    def __repr__(self):
+        return f"ArticleRecord(id={self.id!r}, category={self.category!r}, title={self.title!r})"
+
+
+class ArticleCollection:
+    def __init__(self, categories=(), default_category="기타"):
+        """categories: 버킷 순서 (보고서 카테고리 순서). 목록에 없는 카테고리는 default_category로 분류."""
+        self.default_category = default_category
+        self._records = []
+        self._by_link = {}
+        self._buckets = {category: [] for category in categories}
+        self._buckets.setdefault(default_category, [])
+        self._by_id = None  # select()로 만든 보기에서만 사용 (ID가 목록 인덱스와 다름)
+
+    def add(self, title, link, keyword, category, date="", published=None):
+        """기사 추가 후 레코드 반환. ID는 추가 순서."""
+        if self._by_id is not None:
+            raise TypeError("select()로 만든 보기에는 기사를 추가할 수 없습니다")
+        record = ArticleRecord(len(self._records), title, link, keyword, category, date, published)
+        self._records.append(record)
+        self._by_link.setdefault(record.canonical_link, record)
+        bucket = category if category in self._buckets else self.default_category
+        self._buckets[bucket].append(record)
+        return record
+
+    def has_link(self, link):
+        """정규화한 링크 기준으로 이미 수집된 기사인지."""
+        return canonical_link(link) in self._by_link
+
+    def get(self, article_id, default=None):
+        if self._by_id is not None:
+            return self._by_id.get(article_id, default)
+        if isinstance(article_id, int) and 0 <= article_id < len(self._records):
+            return self._records[article_id]
+        return default
+
+    def ids(self):
+        if self._by_id is not None:
+            return set(self._by_id)
+        return set(range(len(self._records)))
+
+    def select(self, ids):
+        """ids에 해당하는 기사만 담은 보기 (ID/카테고리 순서/추가 순서 유지, 레코드는 공유)."""
+        ids = set(ids)
+        view = ArticleCollection(default_category=self.default_category)
+        view._buckets = {category: [] for category in self._buckets}
+        view._by_id = {}
+        for record in self._records:
+            if record.id in ids:
+                view._records.append(record)
+                view._by_link.setdefault(record.canonical_link, record)
+                view._buckets[record.category if record.category in view._buckets else self.default_category].append(record)
+                view._by_id[record.id] = record
+        return view
+
+    def by_category(self, include_empty=False):
+        """카테고리 → 레코드 목록 (카테고리 순서, 각 목록은 추가 순서)."""
+        return {
+            category: records
+            for category, records in self._buckets.items()
+            if records or include_empty
+        }
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __bool__(self):
+        return bool(self._records)
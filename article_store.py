@@ -0,0 +1,180 @@
+"""
+실행 간 유지되는 기사 저장소 (SQLite).
+
+정규화한 링크와 제목을 키로 최초 수집 시각, 실제 도메인, 필터 판정, 보고서 포함 여부를 저장합니다.
+fetch_news는 이미 보고된 기사와 이미 차단 판정을 받은 기사를 비싼 검사(리다이렉트 해석,
+유사 제목 비교, Gemini 분석) 전에 건너뛰어 매 실행을 "새 기사만" 처리하는 증분 수집으로 만듭니다.
+"""
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from urllib.parse import urlsplit, urlunsplit
+
+VERDICT_ACCEPTED = "accepted"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    link            TEXT PRIMARY KEY,   -- 정규화한 링크
+    title_key       TEXT NOT NULL,      -- 정규화한 제목
+    title           TEXT,
+    first_seen      REAL NOT NULL,
+    last_seen       REAL NOT NULL,
+    domain          TEXT,               -- 리다이렉트 해석 결과 (없으면 NULL)
+    verdict         TEXT,               -- 'accepted' 또는 차단 규칙 이름
+    verdict_version TEXT,               -- 판정 당시 필터 목록 서명 (목록이 바뀌면 재판정)
+    reported_at     REAL                -- 보고서에 포함되어 발송된 시각 (미발송이면 NULL)
+);
+CREATE INDEX IF NOT EXISTS idx_articles_title_key ON articles(title_key);
+CREATE INDEX IF NOT EXISTS idx_articles_last_seen ON articles(last_seen);
+"""
+
+
+# 기사를 구분하지 않는 추적/지역 설정 인자 (Google News의 oc/hl/gl/ceid, 광고·SNS 유입 표시)
+TRACKING_PARAMS = frozenset({"oc", "hl", "gl", "ceid", "fbclid", "gclid", "igshid", "mc_cid", "mc_eid"})
+
+
+def canonical_link(link):
+    """
+    추적 인자와 프래그먼트를 제거하고 호스트를 소문자로 통일.
+    나머지 쿼리 인자(news/read.php?id=101 등 기사 번호)는 원래 순서와 인코딩 그대로 유지.
+    """
+    parts = urlsplit(link.strip())
+    query = "&".join(
+        param for param in parts.query.split("&")
+        if param and not _is_tracking_param(param.split("=", 1)[0])
+    )
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
+
+
+def _is_tracking_param(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith("utm_")
+
+
+def normalize_title(title):
+    """전각/반각, 대소문자, 공백·문장부호 차이를 무시한 제목 키."""
+    text = unicodedata.normalize("NFKC", title).lower()
+    return re.sub(r"[\W_]+", "", text)
+
+
+class ArticleStore:
+    def __init__(self, path, retention_days=30):
+        self.path = path
+        self.retention_days = retention_days
+        self._conn = None
+        self._by_link = {}
+        self._by_title = {}
+        self._pending = {}
+
+        self.skipped_reported = 0
+        self.skipped_rejected = 0
+
+    def open(self):
+        """DB 연결, 보관 기간이 지난 기록 삭제, 판정 조회용 메모리 색인 적재."""
+        if self._conn is not None:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+        cutoff = time.time() - self.retention_days * 86400
+        with self._conn:
+            self._conn.execute("DELETE FROM articles WHERE last_seen < ?", (cutoff,))
+
+        for row in self._conn.execute(
+            "SELECT link, title_key, verdict, verdict_version, reported_at FROM articles"
+        ):
+            record = dict(row)
+            self._by_link[record["link"]] = record
+            self._by_title.setdefault(record["title_key"], record)
+
+    def close(self):
+        if self._conn is not None:
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+    def lookup(self, link, title):
+        """링크 또는 제목이 일치하는 기존 기록 반환. 없으면 None."""
+        self.open()
+        record = self._by_link.get(canonical_link(link))
+        if record is None:
+            record = self._by_title.get(normalize_title(title))
+        return record
+
+    def should_skip(self, link, title, version):
+        """
+        이미 보고된 기사이거나 같은 필터 목록으로 이미 차단 판정을 받은 기사면 건너뛸 사유 반환.
+        건너뛰지 않으면 None.
+        """
+        record = self.lookup(link, title)
+        if record is None:
+            return None
+        if record["reported_at"]:
+            self.skipped_reported += 1
+            return "already_reported"
+        if record["verdict"] and record["verdict"] != VERDICT_ACCEPTED and record["verdict_version"] == version:
+            self.skipped_rejected += 1
+            return record["verdict"]
+        return None
+
+    def record(self, link, title, verdict, version, domain=None):
+        """판정 결과 기록 (flush 시 한 번의 트랜잭션으로 저장)."""
+        self._pending[canonical_link(link)] = (normalize_title(title), title, verdict, version, domain or None)
+
+    def flush(self):
+        if not self._pending:
+            return
+        self.open()
+        now = time.time()
+        rows = [
+            (link, title_key, title, now, now, domain, verdict, version)
+            for link, (title_key, title, verdict, version, domain) in self._pending.items()
+        ]
+        with self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO articles (link, title_key, title, first_seen, last_seen, domain, verdict, verdict_version)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(link) DO UPDATE SET
+                    last_seen = excluded.last_seen,
+                    domain = COALESCE(excluded.domain, articles.domain),
+                    verdict = excluded.verdict,
+                    verdict_version = excluded.verdict_version
+                """,
+                rows,
+            )
+        for link, title_key, _, _, _, _, verdict, version in rows:
+            record = self._by_link.setdefault(link, {"link": link, "title_key": title_key, "reported_at": None})
+            record.update(verdict=verdict, verdict_version=version)
+            self._by_title.setdefault(title_key, record)
+        self._pending.clear()
+
+    def mark_reported(self, links):
+        """보고서 발송에 포함된 기사 표시 (다음 실행부터 건너뜀)."""
+        self.flush()
+        self.open()  # 수집 없이 발송만 하는 경우(상주 모드 재시작 후 발송)에도 저장소를 열어 둠
+        now = time.time()
+        keys = [(now, canonical_link(link)) for link in links]
+        with self._conn:
+            self._conn.executemany("UPDATE articles SET reported_at = ? WHERE link = ?", keys)
+        for _, link in keys:
+            if link in self._by_link:
+                self._by_link[link]["reported_at"] = now
+
+    def stats(self):
+        return {
+            "known_articles": len(self._by_link),
+            "skipped_reported": self.skipped_reported,
+            "skipped_rejected": self.skipped_rejected,
+        }
+
+    def reset_stats(self):
+        self.skipped_reported = 0
+        self.skipped_rejected = 0
+
+    def print_stats(self):
+        if self.skipped_reported or self.skipped_rejected:
+            print(f"🗂️ 기사 저장소: 이미 보고된 기사 {self.skipped_reported}건, 기존 차단 기사 {self.skipped_rejected}건 건너뜀")
@@ -0,0 +1,97 @@
+"""
+유사 제목 중복 판정 벤치마크: 기존 is_duplicate_topic(전수 difflib 비교) vs TitleIndex.
+
+fetch_news와 같은 방식으로 제목을 하나씩 넣으면서 "중복이면 버리고 아니면 수집"을 반복하고,
+두 방식의 판정이 모두 같은지 확인한 뒤 소요 시간을 비교합니다.
+
+사용법:
+    python benchmarks/bench_dedup.py                 # 100 / 1,000 / 10,000건
+    python benchmarks/bench_dedup.py --sizes 100 1000 --full
+
+10,000건의 전수 비교는 수십 분이 걸리므로 기본적으로 표본 제목(--sample)만 전수 비교하여
+판정 일치를 확인하고, 소요 시간은 표본 평균으로 추정합니다. --full을 주면 전부 실행합니다.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.title_corpus import generate_titles  # noqa: E402
+from dedup_index import TitleIndex  # noqa: E402
+from news_bot import is_duplicate_topic  # noqa: E402
+
+
+def run_index(titles):
+    index = TitleIndex(threshold=0.7)
+    decisions = []
+    started = time.perf_counter()
+    for title in titles:
+        dup = index.is_duplicate(title)
+        decisions.append(dup)
+        if not dup:
+            index.add(title)
+    return decisions, time.perf_counter() - started, index.comparisons
+
+
+def run_bruteforce(titles, index_decisions, sample_positions=None):
+    """
+    기존 방식으로 판정. sample_positions가 주어지면 해당 위치의 제목만 판정하고
+    (그 시점까지 수집된 목록은 index 판정 기준으로 구성), 나머지는 시간을 추정.
+    """
+    items = []
+    mismatches = 0
+    checked = 0
+    elapsed = 0.0
+    for pos, title in enumerate(titles):
+        if sample_positions is None or pos in sample_positions:
+            started = time.perf_counter()
+            dup = is_duplicate_topic(title, items)
+            elapsed += time.perf_counter() - started
+            checked += 1
+            if dup != index_decisions[pos]:
+                mismatches += 1
+        if not index_decisions[pos]:
+            items.append(SimpleNamespace(title=title))  # is_duplicate_topic은 기사의 .title을 읽음
+
+    if sample_positions is not None and checked:
+        elapsed = elapsed / checked * len(titles)
+    return mismatches, checked, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--sample", type=int, default=300, help="전수 비교를 표본으로 대체할 때 표본 수")
+    parser.add_argument("--full", action="store_true", help="모든 크기에서 전수 비교를 끝까지 실행")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'titles':>8} | {'difflib(s)':>11} | {'index(s)':>9} | {'speedup':>8} | {'index cmp':>9} | {'dups':>6} | 판정 일치")
+    print("-" * 80)
+    for size in args.sizes:
+        titles = generate_titles(size, seed=args.seed)
+        decisions, index_seconds, comparisons = run_index(titles)
+
+        sample = None
+        if not args.full and size > 1000:
+            rng = random.Random(args.seed)
+            sample = set(rng.sample(range(size), min(args.sample, size)))
+        mismatches, checked, brute_seconds = run_bruteforce(titles, decisions, sample)
+
+        note = f"{checked - mismatches}/{checked}" + (" (표본, 시간 추정)" if sample else "")
+        speedup = brute_seconds / index_seconds if index_seconds else float("inf")
+        print(
+            f"{size:>8,} | {brute_seconds:>11.3f} | {index_seconds:>9.3f} | {speedup:>7.1f}x | "
+            f"{comparisons:>9,} | {sum(decisions):>6,} | {note}"
+        )
+        if mismatches:
+            print(f"❌ 판정 불일치 {mismatches}건")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
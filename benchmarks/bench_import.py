@@ -0,0 +1,116 @@
+"""
+시작 비용 벤치마크: `python -X importtime` 기반.
+
+새 인터프리터에서 모듈을 import하며 -X importtime 출력(stderr)을 파싱하여
+- news_bot import 누적 시간과 가장 무거운 하위 모듈
+- 지연 로딩으로 빠진 무거운 모듈(google.generativeai, requests, feedparser, numpy)을 따로 import했을 때의 비용
+- 필수 환경변수가 없어 바로 끝나는 실행(`python news_bot.py`)의 전체 소요 시간
+을 반복 측정하여 중앙값으로 출력합니다. --budget-ms를 주면 news_bot import가 예산을 넘을 때 실패(종료 코드 1)합니다.
+
+사용법:
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --repeat 9 --budget-ms 150 --json import.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["google.generativeai", "requests", "feedparser", "numpy"]
+
+
+def importtime(module):
+    """
+    새 인터프리터에서 module을 import하고 {모듈명: 누적 µs} 반환.
+    인터프리터 시작 시 로드되는 모듈(site 등)은 제외하고 module과 그 하위 import만 포함.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"import {module} 실패")
+    rows = []  # (들여쓰기 깊이, 모듈명, 누적 µs) — 하위 모듈이 상위 모듈보다 먼저 출력됨
+    for line in proc.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package" 형식
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|")
+        rows.append((len(name) - len(name.lstrip()), name.strip(), int(cum)))
+
+    top = max(i for i, (_, name, _) in enumerate(rows) if name == module)
+    depth = rows[top][0]
+    cumulative = {module: rows[top][2]}
+    for row_depth, name, cum in reversed(rows[:top]):
+        if row_depth <= depth:
+            break
+        cumulative.setdefault(name, cum)
+    return cumulative
+
+
+def noop_run_seconds():
+    """필수 환경변수 없이 news_bot.py 실행 (검증 단계에서 바로 종료) 소요 시간."""
+    env = {k: v for k, v in os.environ.items()
+           if k not in ("GOOGLE_API_KEY", "EMAIL_SENDER", "EMAIL_PASSWORD", "EMAIL_RECEIVERS")}
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "news_bot.py"], cwd=ROOT, env=env, capture_output=True)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="news_bot import에서 보여줄 하위 모듈 수")
+    parser.add_argument("--budget-ms", type=float, help="news_bot import 허용 시간(ms), 초과 시 종료 코드 1")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    runs = [importtime("news_bot") for _ in range(args.repeat)]
+    news_bot_ms = statistics.median(run["news_bot"] for run in runs) / 1000
+    loaded_heavy = sorted({name for run in runs for name in HEAVY_MODULES if name in run})
+
+    print(f"news_bot import (중앙값, {args.repeat}회): {news_bot_ms:.1f} ms")
+    if loaded_heavy:
+        print(f"⚠️ import 시점에 로드된 무거운 모듈: {', '.join(loaded_heavy)}")
+
+    children = {}
+    for name in runs[0]:
+        if name != "news_bot":
+            children[name] = statistics.median(run.get(name, 0) for run in runs) / 1000
+    print(f"\n하위 모듈 누적 시간 상위 {args.top}개:")
+    for name, ms in sorted(children.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"  {ms:>8.1f} ms  {name}")
+
+    heavy = {}
+    print("\n지연 로딩 대상 SDK (따로 import 시):")
+    for module in HEAVY_MODULES:
+        try:
+            heavy[module] = statistics.median(importtime(module)[module] for _ in range(args.repeat)) / 1000
+            print(f"  {heavy[module]:>8.1f} ms  {module}")
+        except RuntimeError as e:
+            print(f"  {'-':>8}     {module} ({e})")
+
+    noop = statistics.median(noop_run_seconds() for _ in range(args.repeat))
+    print(f"\n환경변수 누락으로 바로 종료하는 실행 전체: {noop * 1000:.0f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "news_bot_import_ms": round(news_bot_ms, 2),
+                "heavy_loaded_at_import": loaded_heavy,
+                "heavy_import_ms": {k: round(v, 2) for k, v in heavy.items()},
+                "noop_run_ms": round(noop * 1000, 1),
+            }, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json}")
+
+    if loaded_heavy or (args.budget_ms is not None and news_bot_ms > args.budget_ms):
+        print("❌ 시작 비용 예산 초과")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+검색어 묶음(OR 쿼리) 벤치마크: 요청 절감 수와 검색어별 요청 대비 재현율.
+
+로컬 픽스처 서버(rss_fixtures, 묶음 쿼리는 검색어별 항목을 섞어 상위 100건 응답)로
+news_bot.fetch_news를 QUERY_BATCH_SIZE=1(검색어마다 요청)과 묶음 크기별로 실행하여 비교합니다.
+- 요청 수: RSS 요청 수와 절감률, 리다이렉트 HEAD 요청 수
+- 재현율: 검색어별 요청으로 수집한 기사(링크) 중 묶음 요청으로도 수집된 비율
+- 배정 일치율: 두 방식 모두 수집한 기사 중 같은 검색어/카테고리로 배정된 비율
+- 배정 방식: 제목 완전 일치 / 부분 일치 / 일치 없음(차례 배정) 건수
+
+--topic-ratio는 제목에 검색어 단어가 들어 있는 기사 비율입니다 (실제 Google News는 대부분 제목에 검색어가 있음).
+
+사용법:
+    python benchmarks/bench_query_plan.py
+    python benchmarks/bench_query_plan.py --keywords 60 --batch-sizes 2 3 4 6 --topic-ratio 0.6
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.local_server import FixtureServer  # noqa: E402
+from benchmarks.run_suite import make_keywords, reset_state  # noqa: E402
+
+
+def collect(nb, server, keywords, batch_size, cache_dir, hours):
+    reset_state(nb, cache_dir)
+    nb.KEYWORDS = keywords
+    nb.QUERY_BATCH_SIZE = batch_size
+    before = server.requests["feed"]
+    with contextlib.redirect_stdout(io.StringIO()):
+        articles = nb.fetch_news(time_window_days=hours // 24, time_window_hours=hours)
+    return {
+        "requests": server.requests["feed"] - before,
+        "head": nb.domain_resolver.network_requests,
+        "items": {item.link: (item.keyword, item.category) for item in articles},
+        "match": dict(nb.query_match_stats) if batch_size > 1 else {},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keywords", type=int, default=15, help="검색어 수 (기본 키워드 15개를 넘으면 '키워드 #n'으로 늘림)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[2, 3, 4, 6])
+    parser.add_argument("--entries", type=int, default=30, help="검색어별 피드 기사 수")
+    parser.add_argument("--topic-ratio", type=float, default=0.7)
+    parser.add_argument("--hours", type=int, default=24, choices=[24, 72])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    server = FixtureServer(latency=0.0, entries=args.entries, seed=args.seed, topic_ratio=args.topic_ratio).start()
+    try:
+        with tempfile.TemporaryDirectory(prefix="news-query-plan-") as cache_root:
+            os.environ.update({
+                "NEWS_CACHE_DIR": cache_root,
+                "GOOGLE_NEWS_BASE_URL": server.base_url,
+                "HTTP_PROXY": server.base_url,
+                "http_proxy": server.base_url,
+                "NO_PROXY": "127.0.0.1,localhost",
+                "no_proxy": "127.0.0.1,localhost",
+                "ARTICLE_STORE_ENABLED": "0",
+            })
+            import news_bot as nb
+
+            keywords = make_keywords(list(nb.KEYWORDS), args.keywords)
+            runs = []
+            for batch_size in [1] + [b for b in args.batch_sizes if b > 1]:
+                cache_dir = os.path.join(cache_root, f"batch-{batch_size}")
+                runs.append((batch_size, collect(nb, server, keywords, batch_size, cache_dir, args.hours)))
+    finally:
+        server.stop()
+
+    baseline = runs[0][1]
+    print(f"검색어 {len(keywords)}개, 검색어별 피드 {args.entries}건, 제목 검색어 포함 비율 {args.topic_ratio:.0%}")
+    print(f"{'batch':>5} | {'RSS 요청':>8} | {'절감':>6} | {'HEAD':>5} | {'수집':>5} | {'재현율':>6} | "
+          f"{'검색어 일치':>8} | {'카테고리 일치':>10} | 배정(완전/부분/없음)")
+    for batch_size, run in runs:
+        common = set(run["items"]) & set(baseline["items"])
+        recall = len(common) / len(baseline["items"]) if baseline["items"] else 1.0
+        same_keyword = sum(run["items"][link][0] == baseline["items"][link][0] for link in common)
+        same_category = sum(run["items"][link][1] == baseline["items"][link][1] for link in common)
+        saved = 1 - run["requests"] / baseline["requests"] if baseline["requests"] else 0.0
+        match = run["match"]
+        print(
+            f"{batch_size:>5} | {run['requests']:>8} | {saved:>6.0%} | {run['head']:>5} | {len(run['items']):>5} | "
+            f"{recall:>6.1%} | {same_keyword / len(common) if common else 1:>8.1%} | "
+            f"{same_category / len(common) if common else 1:>10.1%} | "
+            f"{match.get('full', 0)}/{match.get('partial', 0)}/{match.get('fallback', 0)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
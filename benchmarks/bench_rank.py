@@ -0,0 +1,147 @@
+"""
+관련도 순위 벤치마크: relevance.RelevanceRanker (NumPy) vs 같은 계산의 순수 파이썬 구현.
+
+합성 제목(title_corpus) 1,000 / 5,000 / 20,000건에 CATEGORY_MAP 검색어를 무작위로 배정하고
+점수 계산 + 카테고리별 상위 K 선정 시간을 비교합니다. 두 구현의 점수가 같은지(오차 1e-4) 확인하고,
+순수 파이썬 구현은 --python-max 이하 크기에서만 실행합니다.
+
+사용법:
+    python benchmarks/bench_rank.py
+    python benchmarks/bench_rank.py --sizes 1000 5000 20000 50000 --top-k 15 --show 5
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from article_collection import ArticleCollection  # noqa: E402
+from benchmarks.title_corpus import generate_titles  # noqa: E402
+from news_bot import CATEGORY_MAP, KOREAN_COMPANIES  # noqa: E402
+from relevance import RelevanceRanker, char_ngrams  # noqa: E402
+
+NOW = datetime(2025, 1, 6, 0, 0, tzinfo=timezone.utc)
+
+
+def make_articles(size, seed=42):
+    rng = random.Random(seed)
+    keywords = [(keyword, category) for category, ks in CATEGORY_MAP.items() for keyword in ks]
+    articles = ArticleCollection(CATEGORY_MAP.keys())
+    for idx, title in enumerate(generate_titles(size, seed=seed), start=1):
+        keyword, category = rng.choice(keywords)
+        articles.add(title, f"https://news.google.com/rss/articles/rank{idx}", keyword, category,
+                     published=NOW - timedelta(minutes=rng.randint(0, 24 * 60)))
+    return articles
+
+
+def python_scores(ranker, records, now_utc):
+    """RelevanceRanker.score와 같은 계산을 dict 기반 희소 벡터로 (비교 기준)."""
+    low_high = ranker.ngram_range
+    title_grams = []
+    for item in records:
+        counts = {}
+        for gram in char_ngrams(item.title, low_high):
+            counts[gram] = counts.get(gram, 0) + 1
+        title_grams.append(counts)
+    doc_freq = {}
+    for counts in title_grams:
+        for gram in counts:
+            if gram in ranker.vocab:
+                doc_freq[gram] = doc_freq.get(gram, 0) + 1
+    n = len(records)
+    oov_idf = math.log(1.0 + n) + 1.0
+
+    def idf(gram):
+        return math.log((1.0 + n) / (1.0 + doc_freq.get(gram, 0))) + 1.0
+
+    seeds = []
+    for category, keywords in CATEGORY_MAP.items():
+        counts = {}
+        for gram in char_ngrams(" ".join([category.replace("/", " ")] + list(keywords)), low_high):
+            counts[gram] = counts.get(gram, 0) + 1
+        weighted = {gram: c * idf(gram) for gram, c in counts.items()}
+        seeds.append((weighted, math.sqrt(sum(v * v for v in weighted.values()))))
+    category_index = {category: i for i, category in enumerate(CATEGORY_MAP)}
+
+    scores = []
+    for item, counts in zip(records, title_grams):
+        weighted = {}
+        norm_sq = 0.0
+        for gram, c in counts.items():
+            if gram in ranker.vocab:
+                weighted[gram] = c * idf(gram)
+                norm_sq += weighted[gram] ** 2
+            else:
+                norm_sq += (c * oov_idf) ** 2
+        norm = max(math.sqrt(norm_sq), 1e-9)
+        sims = [sum(w * seed.get(gram, 0.0) for gram, w in weighted.items()) / norm / max(seed_norm, 1e-9)
+                for seed, seed_norm in seeds]
+        column = category_index.get(item.category)
+        own = sims[column] if column is not None else max(sims)
+        company = 1.0 if any(c in item.title for c in ranker.companies) else 0.0
+        age = (now_utc - item.published).total_seconds() / 3600.0 if item.published else math.inf
+        recency = 0.5 ** (max(age, 0.0) / ranker.recency_half_life_hours)
+        scores.append(ranker.similarity_weight * own + ranker.company_weight * company
+                      + ranker.recency_weight * recency)
+    return scores
+
+
+def best_of(repeat, fn):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--top-k", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=3, help="크기별 반복 횟수 (최소 시간 사용)")
+    parser.add_argument("--python-max", type=int, default=5000, help="순수 파이썬 비교를 실행할 최대 크기")
+    parser.add_argument("--show", type=int, default=0, help="가장 작은 크기에서 카테고리별 상위/하위 제목 n개 출력")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    ranker = RelevanceRanker(CATEGORY_MAP, KOREAN_COMPANIES)
+    print(f"씨앗 어휘 {len(ranker.vocab)}개 n-gram, 카테고리 {len(ranker.categories)}개, 카테고리별 상위 {args.top_k}건")
+    print(f"{'titles':>7} | {'numpy(ms)':>9} | {'µs/title':>8} | {'top-k(ms)':>9} | {'python(ms)':>10} | {'speedup':>7} | 점수 일치")
+    print("-" * 80)
+    for size in args.sizes:
+        articles = make_articles(size, seed=args.seed)
+        records = list(articles)
+        np_time, scores = best_of(args.repeat, lambda: ranker.score(records, NOW))
+        top_time, selected = best_of(args.repeat, lambda: ranker.top_k(records, args.top_k, NOW))
+        if size <= args.python_max:
+            py_time, reference = best_of(1, lambda: python_scores(ranker, records, NOW))
+            same = "예" if np.allclose(scores, reference, atol=1e-4) else "아니오"
+            py_text, speedup = f"{py_time * 1000:>10.1f}", f"{py_time / np_time:>6.1f}x"
+        else:
+            py_text, speedup, same = f"{'-':>10}", f"{'-':>7}", "-"
+        print(f"{size:>7,} | {np_time * 1000:>9.1f} | {np_time / size * 1e6:>8.2f} | {top_time * 1000:>9.1f} | "
+              f"{py_text} | {speedup} | {same} (선정 {len(selected)}건)")
+
+    if args.show:
+        articles = make_articles(min(args.sizes), seed=args.seed)
+        records = list(articles)
+        scores = ranker.score(records, NOW)
+        for category, items in articles.by_category().items():
+            ordered = sorted(items, key=lambda item: -scores[item.id])
+            print(f"\n[{category}] 상위")
+            for item in ordered[:args.show]:
+                print(f"  {scores[item.id]:.3f}  {item.title}")
+            print(f"[{category}] 하위")
+            for item in ordered[-args.show:]:
+                print(f"  {scores[item.id]:.3f}  {item.title}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+보고서 렌더링 벤치마크: report_renderer.render_report.
+
+합성 제목으로 50 / 500 / 5,000건짜리 기사 목록과 선정 카드 5개를 만들고,
+렌더링(전체 HTML / Executive Summary 전용 HTML / 텍스트 버전)을 반복 실행하여
+총 소요 시간과 기사당 시간(µs)을 출력합니다. 기사 수가 늘어도 기사당 시간이 일정해야 정상입니다.
+
+사용법:
+    python benchmarks/bench_render.py
+    python benchmarks/bench_render.py --sizes 50 500 5000 50000 --repeat 20
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from article_collection import ArticleCollection  # noqa: E402
+from benchmarks.title_corpus import generate_titles  # noqa: E402
+from news_bot import CATEGORY_MAP  # noqa: E402
+from report_renderer import render_report  # noqa: E402
+
+RISK_LEVELS = ["Critical", "Warning", "Info"]
+
+
+def make_report_input(size, seed=42, cards=5):
+    categories = list(CATEGORY_MAP.keys()) + ["기타"]
+    rng = random.Random(seed)
+    articles = ArticleCollection(CATEGORY_MAP.keys())
+    for idx, title in enumerate(generate_titles(size, seed=seed), start=1):
+        articles.add(
+            title, f"https://news.google.com/rss/articles/bench{idx}?oc=5&hl=ko", "bench",
+            rng.choice(categories), date="2025-01-06 09:00",
+        )
+    selected = rng.sample(list(articles), min(cards, size))
+    ai_data = {
+        "weather_summary": f"🌤️ 벤치마크: {size}건 중 {len(selected)}건 선정",
+        "selected_cards": [
+            {
+                "id": item.id,
+                "summary": f"요약: {item.title}",
+                "insight": "구매계약실 대응 방안 검토 필요.",
+                "risk_level": RISK_LEVELS[rank % len(RISK_LEVELS)],
+            }
+            for rank, item in enumerate(selected)
+        ],
+    }
+    return ai_data, articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--repeat", type=int, default=10, help="크기별 반복 횟수 (최소 시간 사용)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'items':>7} | {'render(ms)':>10} | {'µs/item':>8} | {'html(KB)':>8} | {'exec(KB)':>8} | {'text(KB)':>8}")
+    print("-" * 64)
+    for size in args.sizes:
+        ai_data, articles = make_report_input(size, seed=args.seed)
+        rng = random.Random(args.seed)
+        best = float("inf")
+        report = None
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            report = render_report(ai_data, articles, "2025년 01월 06일", rng=rng)
+            best = min(best, time.perf_counter() - started)
+        print(
+            f"{size:>7,} | {best * 1000:>10.2f} | {best / size * 1e6:>8.2f} | "
+            f"{len(report.html) / 1024:>8.0f} | {len(report.exec_html) / 1024:>8.1f} | {len(report.text) / 1024:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+벤치마크용 로컬 HTTP 서버 (Google News RSS + 리다이렉트 체인 대역).
+
+- GET  /rss/search?q=...         → rss_fixtures.build_feed 피드 (ETag / If-None-Match → 304 지원)
+                                   "(A) OR (B)" 묶음 쿼리는 build_merged_feed로 검색어별 항목을 섞어 응답
+- HEAD/GET /rss/articles/<token> → 302 → /rss/hop/<token>/<n> … → 302 → 언론사 기사 주소
+- 언론사 주소(http://<domain>/article/...)는 HTTP 프록시 형식 요청으로 받아 200 응답.
+  벤치마크는 HTTP_PROXY를 이 서버로 지정하여 외부 도메인으로의 마지막 요청까지 로컬에서 처리합니다.
+- POST /webhook                  → 보고서 웹훅 대역: JSON 본문을 webhooks에 저장하고 204 응답
+                                   (처음 webhook_failures건은 503으로 응답하여 재시도 경로 확인)
+
+모든 응답 전에 latency초 대기하여 실제 네트워크 지연을 흉내 냅니다.
+"""
+import hashlib
+import http.server
+import json
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.rss_fixtures import article_target, build_feed, build_merged_feed
+
+
+class FixtureServer:
+    def __init__(self, latency=0.05, entries=30, seed=42, redirect_hops=2, now=None, topic_ratio=0.0,
+                 webhook_failures=0):
+        self.latency = latency
+        self.entries = entries
+        self.topic_ratio = topic_ratio
+        self.seed = seed
+        self.redirect_hops = redirect_hops
+        self.now = now or datetime.now(timezone.utc)  # 피드 내용이 실행 중 바뀌지 않도록 기준 시각 고정
+        self.requests = Counter()
+        self.webhooks = []
+        self.webhook_failures = webhook_failures
+        self._lock = threading.Lock()
+        self._feeds = {}
+        self._httpd = None
+        self.base_url = None
+
+    def _count(self, kind):
+        with self._lock:
+            self.requests[kind] += 1
+
+    def feed(self, query):
+        with self._lock:
+            body = self._feeds.get(query)
+        if body is None:
+            build = build_merged_feed if " OR " in query else build_feed
+            body = build(query, self.base_url, self.now, entries=self.entries, seed=self.seed, topic_ratio=self.topic_ratio)
+            with self._lock:
+                self._feeds[query] = body
+        return body
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body=b"", headers=None, send_body=True):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if send_body and body:
+                    self.wfile.write(body)
+
+            def _handle(self, send_body):
+                time.sleep(server.latency)
+                url = urlsplit(self.path)
+                if url.netloc and url.netloc != urlsplit(server.base_url).netloc:  # 프록시 형식 요청: 언론사 기사 주소
+                    server._count("publisher")
+                    return self._reply(200, b"<html>article</html>", {"Content-Type": "text/html"}, send_body)
+
+                parts = url.path.strip("/").split("/")
+                if url.path == "/rss/search":
+                    server._count("feed")
+                    query = parse_qs(url.query).get("q", [""])[0]
+                    body = server.feed(query)
+                    etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+                    if self.headers.get("If-None-Match") == etag:
+                        server._count("feed_304")
+                        return self._reply(304, headers={"ETag": etag})
+                    headers = {"Content-Type": "application/rss+xml; charset=utf-8", "ETag": etag}
+                    return self._reply(200, body, headers, send_body)
+                if len(parts) == 3 and parts[:2] == ["rss", "articles"]:
+                    server._count("redirect")
+                    token = parts[2]
+                    location = f"/rss/hop/{token}/1" if server.redirect_hops > 1 else article_target(token)
+                    return self._reply(302, headers={"Location": location}, send_body=send_body)
+                if len(parts) == 4 and parts[:2] == ["rss", "hop"]:
+                    server._count("redirect")
+                    token, hop = parts[2], int(parts[3])
+                    if hop + 1 < server.redirect_hops:
+                        location = f"/rss/hop/{token}/{hop + 1}"
+                    else:
+                        location = article_target(token)
+                    return self._reply(302, headers={"Location": location}, send_body=send_body)
+                server._count("not_found")
+                return self._reply(404, b"not found", send_body=send_body)
+
+            def do_GET(self):
+                self._handle(send_body=True)
+
+            def do_HEAD(self):
+                self._handle(send_body=False)
+
+            def do_POST(self):
+                time.sleep(server.latency)
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if urlsplit(self.path).path != "/webhook":
+                    server._count("not_found")
+                    return self._reply(404, b"not found")
+                server._count("webhook")
+                with server._lock:
+                    failing = server.webhook_failures > 0
+                    if failing:
+                        server.webhook_failures -= 1
+                    else:
+                        server.webhooks.append(json.loads(body.decode("utf-8")))
+                self._reply(503 if failing else 204)
+
+        return Handler
+
+    def start(self):
+        self._httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._httpd.server_port}"
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
@@ -0,0 +1,112 @@
+"""
+벤치마크용 합성 Google News RSS 피드 생성기.
+
+검색어마다 title_corpus의 합성 제목(유사 제목·스팸·영상 태그 포함)으로 Google News 형식 RSS를 만듭니다.
+- 기사 링크는 "{base_url}/rss/articles/<token>?oc=5" 형식의 리다이렉트 링크
+  (로컬 서버가 몇 단계 리다이렉트 후 언론사 주소로 보냄, 일부는 BLOCKED_DOMAINS의 해외 매체)
+- 일부 기사는 기간 밖(오래된 기사), 일부는 해외 현지 매체 source
+- 같은 (검색어, seed, 기준 시각)이면 항상 같은 바이트가 생성되므로 ETag/304 경로도 재현 가능
+- topic_ratio > 0이면 그 비율만큼 제목 앞에 검색어 단어를 붙임 (묶음 쿼리의 검색어 배정 시험용)
+- build_merged_feed: "(A) OR (B)" 묶음 쿼리 응답 대역. 검색어별 피드 항목을 번갈아 섞고 상위 max_entries건만 반환
+  (같은 기사는 검색어별 요청과 같은 링크를 가지므로 두 방식의 수집 결과를 링크로 비교 가능)
+"""
+import hashlib
+import html
+import random
+from datetime import timedelta
+from email.utils import format_datetime
+
+from benchmarks.title_corpus import SOURCES, generate_titles
+
+KOREAN_DOMAINS = [
+    "www.yna.co.kr", "www.newsis.com", "www.news1.kr", "news.mt.co.kr", "www.edaily.co.kr",
+    "www.hankyung.com", "www.mk.co.kr", "www.cnews.co.kr", "www.dnews.co.kr", "biz.chosun.com",
+]
+OVERSEAS_DOMAINS = ["vietstock.vn", "vnexpress.net", "insidevina.com", "cafef.vn"]
+OVERSEAS_SOURCES = ["Vietstock", "VnExpress", "인사이드비나"]
+
+
+def _seed_for(query, seed):
+    return int(hashlib.sha1(f"{seed}:{query}".encode("utf-8")).hexdigest()[:12], 16)
+
+
+def article_token(query, index, seed=42):
+    return hashlib.sha1(f"{seed}:{query}:{index}".encode("utf-8")).hexdigest()[:16]
+
+
+def article_target(token, blocked_ratio=0.08):
+    """리다이렉트 최종 목적지 (언론사 기사 주소). token으로 결정되므로 서버는 상태 없이 응답 가능."""
+    rng = random.Random(token)
+    if rng.random() < blocked_ratio:
+        domain = rng.choice(OVERSEAS_DOMAINS)
+    else:
+        domain = rng.choice(KOREAN_DOMAINS)
+    return f"http://{domain}/article/{token}"
+
+
+def split_or_query(query):
+    """
+    묶음 쿼리 "(A) OR (B) <제외어 when:Nd>" → ["A <제외어 when:Nd>", "B <제외어 when:Nd>"].
+    묶음이 아니면 [query].
+    """
+    if " OR " not in query or not query.startswith("("):
+        return [query]
+    core, _, suffix = query.rpartition(")")
+    return [part.strip().strip("()") + suffix for part in (core + ")").split(" OR ")]
+
+
+def build_items(query, base_url, now, entries=30, seed=42, stale_ratio=0.1, overseas_ratio=0.03, topic_ratio=0.0):
+    """검색어 하나에 대한 RSS <item> 문자열 목록."""
+    rng = random.Random(_seed_for(query, seed))
+    titles = generate_titles(entries, seed=_seed_for(query, seed))
+    topic_terms = query.split(" -", 1)[0].split()
+    items = []
+    for index, title in enumerate(titles):
+        if topic_ratio and rng.random() < topic_ratio:
+            picked = rng.sample(topic_terms, min(len(topic_terms), rng.randint(1, 3)))
+            title = " ".join(picked) + " " + title
+        if rng.random() < stale_ratio:
+            age = timedelta(hours=rng.uniform(80, 240))  # 월요일 72시간 기준으로도 기간 밖
+        else:
+            age = timedelta(minutes=rng.uniform(5, 20 * 60))
+        source = rng.choice(SOURCES)
+        if rng.random() < overseas_ratio:
+            source = rng.choice(OVERSEAS_SOURCES)
+            title = title.rsplit(" - ", 1)[0] + f" - {source}"
+        token = article_token(query, index, seed)
+        items.append(
+            "<item>"
+            f"<title>{html.escape(title)}</title>"
+            f"<link>{base_url}/rss/articles/{token}?oc=5</link>"
+            f"<guid isPermaLink=\"false\">{token}</guid>"
+            f"<pubDate>{format_datetime(now - age)}</pubDate>"
+            f"<source url=\"https://example.com\">{html.escape(source)}</source>"
+            "</item>"
+        )
+    return items
+
+
+def _wrap_feed(query, base_url, items):
+    return (
+        "<?xml version=\"1.0\" encoding=\"UTF-8\" standalone=\"yes\"?>"
+        "<rss version=\"2.0\"><channel>"
+        f"<title>\"{html.escape(query)}\" - Google 뉴스</title>"
+        f"<link>{base_url}/search?q={html.escape(query)}</link>"
+        "<language>ko</language>"
+        + "".join(items)
+        + "</channel></rss>"
+    ).encode("utf-8")
+
+
+def build_feed(query, base_url, now, entries=30, seed=42, **options):
+    """검색어 하나에 대한 RSS 피드(bytes) 생성. now: 기간 필터 기준 시각 (aware datetime)."""
+    return _wrap_feed(query, base_url, build_items(query, base_url, now, entries, seed, **options))
+
+
+def build_merged_feed(query, base_url, now, entries=30, seed=42, max_entries=100, **options):
+    """묶음 쿼리 응답: 검색어별 항목을 순위대로 번갈아 섞어 상위 max_entries건 (Google News RSS 상한 100건)."""
+    per_query = [build_items(q, base_url, now, entries, seed, **options) for q in split_or_query(query)]
+    merged = []
+    for rank in range(entries):
+        merged.extend(items[rank] for items in per_query if rank < len(items))
+    return _wrap_feed(query, base_url, merged[:max_entries])
@@ -0,0 +1,190 @@
+"""
+오프라인 종단간(end-to-end) 벤치마크.
+
+로컬 HTTP 서버(합성 Google News RSS + 리다이렉트 체인), 스텁 LLM 백엔드, 로컬 SMTP 수신 서버를 띄우고
+news_bot.run_daily_report(수집 → 분석 → 렌더링 → 발송)를 여러 규모로 실행하여
+단계별 소요 시간과 처리량, 네트워크 호출 수를 출력합니다. 외부 네트워크와 API 키가 필요 없습니다.
+
+규모는 검색 키워드 수입니다 (기본 키워드 15개를 넘으면 "키워드 #n" 형식으로 늘림).
+규모마다 빈 캐시로 한 번(cold), 같은 캐시로 한 번 더(warm: RSS 304, 리다이렉트/LLM 캐시 적중) 실행합니다.
+
+사용법:
+    python benchmarks/run_suite.py
+    python benchmarks/run_suite.py --scales 15 60 --latency 0.1 --llm-latency 2 --json result.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.local_server import FixtureServer  # noqa: E402
+from benchmarks.smtp_sink import SMTPSink  # noqa: E402
+
+STAGES = ["fetch_news", "rss_fetch", "redirect_resolve", "dedup", "analysis", "llm_call", "render", "publish", "smtp"]
+
+
+def configure_environment(args, cache_root, server, sink):
+    """news_bot import 전에 모든 외부 연결을 로컬 대역으로 돌림."""
+    os.environ.update({
+        "NEWS_CACHE_DIR": cache_root,
+        "GOOGLE_NEWS_BASE_URL": server.base_url,
+        # 리다이렉트 마지막 단계(언론사 도메인) 요청도 로컬 서버가 프록시로 받음
+        "HTTP_PROXY": server.base_url,
+        "http_proxy": server.base_url,
+        "NO_PROXY": "127.0.0.1,localhost",
+        "no_proxy": "127.0.0.1,localhost",
+        "LLM_BACKEND": "stub",
+        "STUB_LLM_LATENCY": str(args.llm_latency),
+        "SMTP_HOST": "127.0.0.1",
+        "SMTP_PORT": str(sink.port),
+        "SMTP_STARTTLS": "0",
+        "SMTP_MESSAGES_PER_MINUTE": "100000",
+        "SMTP_BURST": "1000",
+        "EMAIL_SENDER": "bench@localhost",
+        "EMAIL_PASSWORD": "unused",
+        "EMAIL_RECEIVERS": ",".join(f"user{i}@localhost" for i in range(args.recipients)),
+        "ARTICLE_STORE_ENABLED": "0" if args.no_store else "1",
+        # 보관함은 임시 디렉터리에, 웹훅은 로컬 서버의 /webhook으로
+        "OUTPUT_SINKS": ",".join(args.sinks),
+        "ARCHIVE_DIR": os.path.join(cache_root, "archive"),
+        "WEBHOOK_URL": server.base_url + "/webhook",
+        "EXEC_RECEIVERS": "exec@localhost",
+    })
+
+
+def make_keywords(base_keywords, count):
+    keywords = list(base_keywords[:count])
+    n = 2
+    while len(keywords) < count:
+        for keyword in base_keywords:
+            if len(keywords) >= count:
+                break
+            keywords.append(f"{keyword} #{n}")
+        n += 1
+    return keywords
+
+
+def reset_state(nb, cache_dir):
+    """규모별로 독립된 캐시 디렉터리를 쓰도록 캐시/저장소/메트릭 객체를 새로 만듦."""
+    from article_store import ArticleStore
+    from deadline import BreakerBoard
+    from delivery import DeliveryLog
+    from domain_resolver import DomainResolver
+    from feed_cache import FeedCache
+    from llm_backend import LLMCache
+    from metrics import RunMetrics
+
+    nb.metrics = RunMetrics()
+    nb.feed_breakers = BreakerBoard(nb.BREAKER_FAILURE_THRESHOLD, nb.BREAKER_RESET_SECONDS)
+    nb.redirect_breakers = BreakerBoard(nb.BREAKER_FAILURE_THRESHOLD, nb.BREAKER_RESET_SECONDS)
+    nb.feed_cache = FeedCache(os.path.join(cache_dir, "feeds"), timeout=nb.FEED_TIMEOUT,
+                              pool_size=max(1, nb.FETCH_MAX_WORKERS), breakers=nb.feed_breakers,
+                              retry_attempts=nb.RETRY_ATTEMPTS, retry_base_delay=nb.RETRY_BASE_DELAY,
+                              retry_max_delay=nb.RETRY_MAX_DELAY)
+    nb.domain_resolver = DomainResolver(
+        cache_path=os.path.join(cache_dir, "redirect_domains.json"),
+        ttl_days=nb.REDIRECT_CACHE_TTL_DAYS, max_entries=nb.REDIRECT_CACHE_MAX_ENTRIES,
+        max_workers=nb.REDIRECT_MAX_WORKERS, timeout=3,
+        breakers=nb.redirect_breakers, deadline=lambda: nb.run_budget.deadline("redirect"),
+    )
+    nb.llm_cache = LLMCache(os.path.join(cache_dir, "llm"), nb.LLM_CACHE_TTL_HOURS, nb.LLM_CACHE_MAX_ENTRIES)
+    # 발송 기록은 매 실행 새로 시작 (warm 실행에서도 발송 단계를 측정하기 위해)
+    nb.delivery_log = DeliveryLog(os.path.join(cache_dir, f"deliveries-{time.time_ns()}.db"))
+    if nb.article_store is not None:
+        # 보고 이력은 매 실행 새로 시작 (warm 실행도 같은 기사를 다시 처리하도록)
+        nb.article_store = ArticleStore(os.path.join(cache_dir, f"articles-{time.time_ns()}.db"))
+
+
+def run_once(nb, keywords, cache_dir, verbose):
+    reset_state(nb, cache_dir)
+    nb.KEYWORDS = keywords
+    output = io.StringIO()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(sys.stdout if verbose else output):
+        items = nb.run_daily_report(is_monday=False)
+    wall = time.perf_counter() - started
+    result = nb.metrics.to_dict()
+    result["wall_seconds"] = round(wall, 3)
+    result["news_items"] = len(items)
+    return result
+
+
+def print_table(rows):
+    header = f"{'keywords':>8} | {'pass':>4} | {'items':>5} | {'wall(s)':>7} | " + " | ".join(f"{s[:10]:>10}" for s in STAGES)
+    print(header)
+    print("-" * len(header))
+    for scale, pass_name, result in rows:
+        spans = result["spans"]
+        cells = " | ".join(f"{spans.get(stage, {}).get('total_seconds', 0.0):>10.3f}" for stage in STAGES)
+        print(f"{scale:>8} | {pass_name:>4} | {result['news_items']:>5} | {result['wall_seconds']:>7.2f} | {cells}")
+
+    print()
+    print(f"{'keywords':>8} | {'pass':>4} | {'entries/s':>9} | {'items/s(분석)':>12} | {'rss 요청':>8} | {'HEAD':>6} | {'llm':>4} | {'smtp':>5}")
+    for scale, pass_name, result in rows:
+        spans, network = result["spans"], result["network"]
+        fetch = spans.get("fetch_news", {}).get("total_seconds", 0.0)
+        analysis = spans.get("analysis", {}).get("total_seconds", 0.0)
+        entries = sum(result["rejections"].values()) + result["news_items"]
+        print(
+            f"{scale:>8} | {pass_name:>4} | {entries / fetch if fetch else 0:>9.0f} | "
+            f"{result['news_items'] / analysis if analysis else 0:>12.0f} | "
+            f"{network.get('rss', {}).get('calls', 0):>8} | {network.get('redirect', {}).get('calls', 0):>6} | "
+            f"{network.get('llm', {}).get('calls', 0):>4} | {network.get('smtp', {}).get('calls', 0):>5}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[15, 60, 240], help="규모별 검색 키워드 수")
+    parser.add_argument("--entries", type=int, default=30, help="피드당 기사 수")
+    parser.add_argument("--latency", type=float, default=0.05, help="로컬 HTTP 서버 응답 지연(초)")
+    parser.add_argument("--hops", type=int, default=2, help="기사 링크 리다이렉트 단계 수")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="스텁 LLM 응답 지연(초)")
+    parser.add_argument("--smtp-latency", type=float, default=0.01, help="SMTP DATA 응답 지연(초)")
+    parser.add_argument("--recipients", type=int, default=100)
+    parser.add_argument("--no-store", action="store_true", help="기사 저장소(SQLite) 없이 실행")
+    parser.add_argument("--sinks", nargs="+", default=["email"], choices=["email", "exec_email", "archive", "webhook"],
+                        help="보고서 출력 대상 (동시에 내보냄)")
+    parser.add_argument("--webhook-failures", type=int, default=0, help="로컬 웹훅이 처음 n건을 503으로 응답 (재시도 확인)")
+    parser.add_argument("--cold-only", action="store_true", help="warm 실행 생략")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--verbose", action="store_true", help="news_bot 출력 표시")
+    args = parser.parse_args()
+
+    server = FixtureServer(latency=args.latency, entries=args.entries, seed=args.seed, redirect_hops=args.hops,
+                           webhook_failures=args.webhook_failures).start()
+    sink = SMTPSink(latency=args.smtp_latency).start()
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="news-bench-") as cache_root:
+        configure_environment(args, cache_root, server, sink)
+        import news_bot as nb
+
+        base_keywords = list(nb.KEYWORDS)
+        try:
+            for scale in args.scales:
+                keywords = make_keywords(base_keywords, scale)
+                cache_dir = os.path.join(cache_root, f"scale-{scale}")
+                for pass_name in (["cold"] if args.cold_only else ["cold", "warm"]):
+                    rows.append((scale, pass_name, run_once(nb, keywords, cache_dir, args.verbose)))
+        finally:
+            server.stop()
+            sink.stop()
+
+    print_table(rows)
+    print(f"\n로컬 서버 요청: {dict(server.requests)} / SMTP 수신: 메시지 {sink.messages}건, 수신자 {sink.recipients}명"
+          + (f" / 웹훅 수신: {len(server.webhooks)}건" if "webhook" in args.sinks else ""))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([{"keywords": s, "pass": p, **r} for s, p, r in rows], f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+벤치마크용 로컬 SMTP 수신 서버 (받은 메일은 저장하지 않고 건수와 크기만 집계).
+
+EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT만 처리하는 최소 구현입니다.
+STARTTLS/AUTH는 광고하지 않으므로 발송 측은 SMTP_STARTTLS=0으로 연결하고 로그인은 생략됩니다.
+disconnects=n이면 처음 n번의 MAIL 명령에 응답하지 않고 연결을 끊어 재연결 경로를 확인할 수 있습니다.
+"""
+import socketserver
+import threading
+import time
+
+
+class SMTPSink:
+    def __init__(self, latency=0.0, disconnects=0):
+        self.latency = latency  # DATA 수신 후 응답까지의 지연 (실제 서버 처리 시간 흉내)
+        self.disconnects = disconnects  # 남은 연결 끊기 횟수
+        self.messages = 0
+        self.recipients = 0
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self.port = None
+
+    def _make_handler(self):
+        sink = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def _send(self, line):
+                self.wfile.write((line + "\r\n").encode("ascii"))
+
+            def handle(self):
+                self._send("220 localhost benchmark sink")
+                rcpts = 0
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    command = line.decode("utf-8", "replace").strip().upper()
+                    if command.startswith(("EHLO", "HELO")):
+                        self._send("250-localhost")
+                        self._send("250 8BITMIME")
+                    elif command.startswith("MAIL"):
+                        with sink._lock:
+                            drop = sink.disconnects > 0
+                            if drop:
+                                sink.disconnects -= 1
+                        if drop:
+                            return
+                        rcpts = 0
+                        self._send("250 OK")
+                    elif command.startswith("RCPT"):
+                        rcpts += 1
+                        self._send("250 OK")
+                    elif command == "DATA":
+                        self._send("354 End data with <CR><LF>.<CR><LF>")
+                        size = 0
+                        while True:
+                            data_line = self.rfile.readline()
+                            if not data_line or data_line in (b".\r\n", b".\n"):
+                                break
+                            size += len(data_line)
+                        if sink.latency:
+                            time.sleep(sink.latency)
+                        with sink._lock:
+                            sink.messages += 1
+                            sink.recipients += rcpts
+                            sink.bytes_received += size
+                        self._send("250 OK queued")
+                    elif command in ("RSET", "NOOP"):
+                        self._send("250 OK")
+                    elif command == "QUIT":
+                        self._send("221 Bye")
+                        return
+                    else:
+                        self._send("502 Command not implemented")
+
+        return Handler
+
+    def start(self):
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
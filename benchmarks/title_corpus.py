@@ -0,0 +1,88 @@
+"""
+벤치마크용 합성 뉴스 제목 생성기.
+
+CATEGORY_MAP 키워드·국내 건설사·매체명을 조합한 Google News 형식 제목("제목 - 매체명")을 만들고,
+일정 비율로 같은 사건을 다른 매체가 조금 바꿔 쓴 유사 제목(중복 주제)을 섞습니다.
+seed가 같으면 항상 같은 코퍼스가 생성되므로 판정 비교용 고정 픽스처로 사용할 수 있습니다.
+"""
+import random
+
+SUBJECTS = [
+    "포스코이앤씨", "현대건설", "삼성물산", "GS건설", "대우건설", "롯데건설", "DL이앤씨", "HDC현대산업개발",
+    "SK에코플랜트", "한화건설", "국토교통부", "공정거래위원회", "고용노동부", "기획재정부", "산업통상자원부",
+    "대한건설협회", "전문건설협회", "화물연대", "민주노총 건설노조", "한국노총", "레미콘 업계", "시멘트 업계",
+    "철강업계", "중소 협력사", "해운업계", "건설산업연구원", "조달청", "한국은행", "서울시", "부산시",
+    "인천항만공사", "경기도", "LH", "한국전력", "국회 국토위", "중소벤처기업부", "관세청", "무역협회",
+]
+TOPICS = [
+    "건설 원자재 가격", "철근 가격", "시멘트 단가", "레미콘 운송비", "원·달러 환율", "국제 유가", "아스팔트 가격",
+    "납품대금 연동제", "노란봉투법", "화물연대 운송 거부", "SCFI 운임", "외국인 근로자 도입", "숙련 인력 부족",
+    "하도급 대금 지급", "중대재해처벌법", "건설산업기본법 개정안", "협력사 ESG 평가", "동반성장 지수",
+    "모듈러 주택", "OSC 공법", "스마트 건설 기술", "공급망 재편", "골재 수급", "전기요금 인상", "PF 부실",
+    "미분양 주택", "해외 수주", "원가율 상승", "공사비 분쟁", "안전보건 관리체계", "탄소중립 자재", "물류비 부담",
+    "컨테이너 운임", "홍해 물류 차질", "중국산 철강 덤핑", "건설기계 임대료", "레미콘 공급 중단", "공공 발주",
+]
+PREDICATES = [
+    "인상 추진", "동결 결정", "3개월 연속 상승", "하락 전환", "협상 결렬", "본격 시행", "개정안 국회 통과",
+    "현장 점검 착수", "대책 마련 나서", "부담 가중 우려", "공급 차질 현실화", "제도 개선 요구", "업계 반발",
+    "지원 확대", "시범 사업 착수", "전년 대비 12% 증가", "1분기 실적 발표", "역대 최고치 경신", "긴급 간담회 개최",
+    "가이드라인 발표", "과징금 부과", "직권 조사 착수", "상생 협약 체결", "MOU 체결", "기술 실증 성공",
+    "정부에 건의", "2년 만에 최저", "연내 도입 검토", "단계적 폐지", "입법 예고", "파업 돌입 예고",
+]
+DETAILS = [
+    "4.2% 올라", "3천억원 규모", "내달부터", "하반기 본격화", "현장 혼란", "업계 \"대책 시급\"", "비용 20% 증가",
+    "수도권 중심", "지방 현장 타격", "중소업체 직격탄", "연말까지 이어질 듯", "전문가 \"장기화 우려\"",
+]
+SOURCES = [
+    "연합뉴스", "뉴시스", "뉴스1", "머니투데이", "이데일리", "아시아경제", "서울경제", "한국경제", "매일경제",
+    "건설경제", "대한경제", "국토일보", "조선비즈", "헤럴드경제", "파이낸셜뉴스", "아주경제", "에너지경제",
+    "뉴스핌", "데일리안", "KBS 뉴스", "MBC 뉴스", "SBS 뉴스", "YTN", "한겨레", "경향신문", "중앙일보",
+]
+SPAM_TERMS = ["특징주", "주가", "급등", "코스피", "비트코인", "카지노"]
+VIDEO_TAGS = ["[영상]", "[포토]", "[VOD]"]
+
+
+def make_title(rng):
+    title = f"{rng.choice(SUBJECTS)}, {rng.choice(TOPICS)} {rng.choice(PREDICATES)}"
+    roll = rng.random()
+    if roll < 0.3:
+        title += f"…{rng.choice(TOPICS)} {rng.choice(PREDICATES)}"
+    elif roll < 0.6:
+        title += f"…{rng.choice(DETAILS)}"
+    return title
+
+
+def rewrite_title(rng, title):
+    """같은 사건을 다른 매체가 쓴 것처럼 제목을 약간 변형 (어순·조사·수식어 일부 변경)."""
+    variants = [
+        lambda t: t.replace(", ", " "),
+        lambda t: "[단독] " + t,
+        lambda t: t + " 전망",
+        lambda t: t.replace("추진", "검토").replace("결정", "확정"),
+        lambda t: t.split("…")[0],
+        lambda t: "(종합) " + t,
+    ]
+    for fn in rng.sample(variants, rng.randint(1, 2)):
+        title = fn(title)
+    return title
+
+
+def generate_titles(count, seed=42, dup_ratio=0.3, spam_ratio=0.05, video_ratio=0.03):
+    """Google News 형식("제목 - 매체명")의 합성 제목 count개 생성."""
+    rng = random.Random(seed)
+    bases = []
+    titles = []
+    for _ in range(count):
+        if bases and rng.random() < dup_ratio:
+            base = rewrite_title(rng, rng.choice(bases))
+        else:
+            base = make_title(rng)
+            bases.append(base)
+
+        roll = rng.random()
+        if roll < spam_ratio:
+            base = f"{base} {rng.choice(SPAM_TERMS)}"
+        elif roll < spam_ratio + video_ratio:
+            base = f"{rng.choice(VIDEO_TAGS)} {base}"
+        titles.append(f"{base} - {rng.choice(SOURCES)}")
+    return titles
@@ -0,0 +1,192 @@
+"""
+상주(daemon) 실행 스케줄러.
+
+매일 발송 시각에 모든 수집/필터/분석을 처음부터 하는 대신,
+- 하루 동안 일정 간격(± 무작위 지터)으로 피드를 다시 수집하여 발송 후보를 미리 만들어 두고
+  (RSS는 조건부 GET, 리다이렉트 해석/차단 판정은 캐시·저장소에 쌓이므로 반복 수집은 새 기사만 실제로 처리)
+- 발송 직전(presend_minutes 전)에 한 번 더 수집한 뒤
+- 발송 시각에는 준비된 후보로 AI 최종 선정 → 렌더링 → 발송만 진행합니다.
+
+상태(최근 후보, 다음 수집 시각, 마지막 발송일)는 매 단계 JSON으로 저장하므로
+재시작하면 다시 수집하지 않고 저장된 후보와 일정으로 이어서 실행합니다.
+SIGTERM/SIGINT를 받으면 진행 중인 단계를 마치고 상태를 저장한 뒤 종료합니다.
+
+수집/발송 내용은 호출하는 쪽이 정합니다.
+- poll(send_date) → 후보 스냅샷 (JSON으로 저장 가능한 값)
+- merge(saved, snapshot) → 같은 발송일의 저장된 후보에 이번 수집 결과를 합친 스냅샷
+  (피드 창에서 밀려난 기사도 발송 후보에 남도록. 생략하면 이번 수집 결과로 교체)
+- send(send_date, snapshot) → 발송 성공 여부
+"""
+import json
+import os
+import random
+import signal
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+KST = timezone(timedelta(hours=9))
+
+
+def _atomic_write(path, data):
+    """임시 파일에 쓴 뒤 교체 (중간에 죽어도 기존 상태 파일이 깨지지 않도록)."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def parse_send_time(value):
+    """"HH:MM" → (시, 분)."""
+    hour, minute = value.strip().split(":")
+    return int(hour), int(minute)
+
+
+class BriefingDaemon:
+    def __init__(self, poll, send, state_path, send_time=(7, 0), poll_minutes=30, jitter=0.2,
+                 presend_minutes=10, grace_minutes=120, retry_minutes=5, skip_weekends=True, tz=KST,
+                 clock=time.time, rng=None, merge=None):
+        self.poll = poll
+        self.send = send
+        self.merge = merge
+        self.state_path = state_path
+        self.send_time = send_time
+        self.poll_seconds = poll_minutes * 60
+        self.jitter = jitter
+        self.presend_seconds = presend_minutes * 60
+        self.grace_seconds = grace_minutes * 60
+        self.retry_seconds = retry_minutes * 60
+        self.skip_weekends = skip_weekends
+        self.tz = tz
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self.stop_event = threading.Event()
+
+        self.state = {
+            "snapshot": None,       # 발송 후보 (같은 발송일의 수집 결과 누적, merge가 없으면 마지막 수집 결과)
+            "snapshot_for": None,   # 후보가 대상으로 하는 발송일 (YYYY-MM-DD)
+            "polled_at": 0.0,       # 마지막 수집 시각 (epoch)
+            "next_poll_at": 0.0,    # 다음 정기 수집 시각 (epoch)
+            "retry_send_at": 0.0,   # 발송 실패 시 재시도 시각 (epoch)
+            "last_sent": None,      # 마지막으로 발송을 끝낸 날짜 (YYYY-MM-DD)
+        }
+
+    # --- 상태 저장/복원 ---
+    def load(self):
+        """저장된 상태 복원. 없거나 깨졌으면 처음부터 시작."""
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                self.state.update(json.load(f))
+            print(f"♻️ 상주 모드 상태 복원: 후보 {self.state['snapshot_for'] or '없음'}, "
+                  f"마지막 발송 {self.state['last_sent'] or '없음'}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️ 상주 모드 상태 파일을 읽지 못해 새로 시작합니다: {e}")
+
+    def checkpoint(self):
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        _atomic_write(self.state_path, json.dumps(self.state, ensure_ascii=False))
+
+    # --- 일정 계산 ---
+    def _send_datetime(self, day):
+        return datetime(day.year, day.month, day.day, self.send_time[0], self.send_time[1], tzinfo=self.tz)
+
+    def next_send(self, now):
+        """
+        아직 발송하지 않은 다음 발송일과 발송 시각 (now 기준).
+        오늘 발송 시각이 지났어도 grace_minutes 안이면 오늘 발송 대상.
+        """
+        local = datetime.fromtimestamp(now, self.tz)
+        day = local.date()
+        while True:
+            send_at = self._send_datetime(day)
+            weekend = self.skip_weekends and day.weekday() >= 5
+            missed = now > send_at.timestamp() + self.grace_seconds
+            if not weekend and not missed and day.isoformat() != self.state["last_sent"]:
+                return day, send_at.timestamp()
+            day += timedelta(days=1)
+
+    def _jittered_interval(self, seconds):
+        spread = seconds * self.jitter
+        return max(60.0, seconds + self._rng.uniform(-spread, spread))
+
+    # --- 실행 ---
+    def _do_poll(self, send_day):
+        started = time.perf_counter()
+        try:
+            snapshot = self.poll(send_day)
+            if self.merge is not None and self.state["snapshot_for"] == send_day.isoformat():
+                snapshot = self.merge(self.state["snapshot"], snapshot)
+        except Exception as e:
+            print(f"⚠️ 수집 실패 (다음 주기에 재시도): {e}")
+        else:
+            self.state.update(snapshot=snapshot, snapshot_for=send_day.isoformat(), polled_at=self._clock())
+            print(f"⏱️ 수집 완료 ({time.perf_counter() - started:.1f}초), {send_day} 발송 후보 갱신")
+        self.state["next_poll_at"] = self._clock() + self._jittered_interval(self.poll_seconds)
+        self.checkpoint()
+
+    def _do_send(self, send_day):
+        started = time.perf_counter()
+        try:
+            sent = self.send(send_day, self.state["snapshot"])
+        except Exception as e:
+            print(f"❌ 발송 단계 오류: {e}")
+            sent = False
+        if sent:
+            self.state.update(last_sent=send_day.isoformat(), retry_send_at=0.0)
+            print(f"📮 {send_day} 브리핑 발송 완료 ({time.perf_counter() - started:.1f}초)")
+        else:
+            self.state["retry_send_at"] = self._clock() + self._jittered_interval(self.retry_seconds)
+            print(f"⚠️ {send_day} 브리핑 발송 실패, "
+                  f"{datetime.fromtimestamp(self.state['retry_send_at'], self.tz):%H:%M}에 재시도")
+        self.checkpoint()
+
+    def step(self):
+        """지금 해야 할 일(수집 또는 발송)을 하나 처리하고 다음 작업까지 기다릴 시간(초) 반환."""
+        now = self._clock()
+        send_day, send_at = self.next_send(now)
+        presend_at = send_at - self.presend_seconds
+        has_candidates = self.state["snapshot_for"] == send_day.isoformat()
+        presend_polled = has_candidates and self.state["polled_at"] >= presend_at
+
+        if now >= send_at:
+            if not presend_polled:
+                self._do_poll(send_day)  # 발송 직전 수집을 놓친 경우 (재시작 등)
+            if now < self.state["retry_send_at"]:
+                return self.state["retry_send_at"] - now
+            self._do_send(send_day)
+            return 0.0
+
+        if (not has_candidates                          # 새 발송일: 바로 후보 수집 시작
+                or now >= self.state["next_poll_at"]    # 정기 수집
+                or (now >= presend_at and not presend_polled)):  # 발송 직전 수집
+            self._do_poll(send_day)
+            return 0.0
+
+        wake_at = min(self.state["next_poll_at"], send_at)
+        if not presend_polled:
+            wake_at = min(wake_at, presend_at)
+        return max(0.0, wake_at - now)
+
+    def _handle_signal(self, signum, frame):
+        if not self.stop_event.is_set():
+            print(f"🛑 종료 신호({signal.Signals(signum).name}) 수신: 진행 중인 작업을 마치고 상태를 저장한 뒤 종료합니다.")
+        self.stop_event.set()
+
+    def run(self):
+        self.load()
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self._handle_signal)
+            signal.signal(signal.SIGINT, self._handle_signal)
+
+        send_day, send_at = self.next_send(self._clock())
+        print(f"🛰️ 상주 모드 시작: 다음 발송 {datetime.fromtimestamp(send_at, self.tz):%Y-%m-%d %H:%M}, "
+              f"수집 주기 약 {self.poll_seconds / 60:.0f}분(±{self.jitter:.0%})")
+        while not self.stop_event.is_set():
+            wait = self.step()
+            if wait > 0:
+                self.stop_event.wait(wait)
+        self.checkpoint()
+        print("👋 상주 모드 종료 (상태 저장 완료)")
+
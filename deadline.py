@@ -0,0 +1,222 @@
+"""
+실행 시간 예산, 재시도 백오프, 호스트별 회로 차단기.
+
+한 번의 실행(또는 상주 모드의 수집/발송 주기) 전체에 시간 예산을 두고 단계별로 나눠 씁니다.
+- RunBudget: 단계(rss → redirect → llm → smtp)마다 예산 비율을 정하고, 각 단계의 마감 시각은
+  "실행 시작 + 전체 예산 × 그 단계까지의 누적 비율". 앞 단계가 일찍 끝나면 남은 시간은 뒤 단계가 씀.
+  네트워크 요청의 timeout은 단계 마감까지 남은 시간을 넘지 않고, 마감이 지나면 요청을 보내지 않음
+  (RSS는 캐시된 피드, 리다이렉트는 매체 정보로 대체, AI 분석은 헤드라인만 발송)
+- call_with_retry: 지수 백오프 + full jitter 재시도 (대기가 마감을 넘으면 재시도하지 않음)
+- CircuitBreaker / BreakerBoard: 호스트별로 연속 실패가 failure_threshold번이면 reset_seconds 동안 요청 차단,
+  이후 한 건만 시험 요청(half-open)으로 보내 성공하면 다시 허용
+- is_transient_error: HTTP 요청(RSS, 출력 대상 웹훅)에서 재시도할 만한 실패인지 판단
+"""
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+DEFAULT_STAGE_SHARES = (("rss", 0.25), ("redirect", 0.2), ("llm", 0.4), ("smtp", 0.15))
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class DeadlineExceeded(Exception):
+    """단계 예산을 모두 써서 더 이상 요청을 보내지 않는 경우."""
+
+
+class CircuitOpen(Exception):
+    """호스트의 회로 차단기가 열려 있어 요청을 보내지 않는 경우."""
+
+
+def is_transient_error(error):
+    """재시도할 만한 실패: 연결/시간 초과, 5xx, 429 (그 외 4xx는 다시 보내도 같음)."""
+    if isinstance(error, (DeadlineExceeded, CircuitOpen)):
+        return False
+    response = getattr(error, "response", None)
+    if response is not None:
+        return response.status_code >= 500 or response.status_code == 429
+    return isinstance(error, OSError)  # requests의 연결/시간 초과 예외도 OSError(IOError) 하위 클래스
+
+
+def parse_stage_shares(value):
+    """"rss=0.25,redirect=0.2,..." → 순서 있는 [(단계, 비율)]. 형식 오류는 ValueError."""
+    shares = []
+    for part in (value or "").split(","):
+        if not part.strip():
+            continue
+        name, _, share = part.partition("=")
+        shares.append((name.strip(), float(share)))
+        if shares[-1][1] < 0:
+            raise ValueError(f"단계 예산 비율은 0 이상이어야 합니다: {part.strip()}")
+    if not shares or sum(share for _, share in shares) <= 0:
+        raise ValueError(f"단계 예산 비율이 없습니다: {value!r}")
+    return shares
+
+
+class RunBudget:
+    def __init__(self, total_seconds, stage_shares=DEFAULT_STAGE_SHARES, clock=time.monotonic):
+        """total_seconds가 0 이하이면 제한 없음. 마감 시각은 clock(time.monotonic) 기준."""
+        self.total_seconds = total_seconds
+        self._clock = clock
+        self._started = None
+
+        total_share = sum(share for _, share in stage_shares)
+        self._cumulative = {}
+        running = 0.0
+        for name, share in stage_shares:
+            running += share
+            self._cumulative[name] = running / total_share
+
+    @property
+    def enabled(self):
+        return self.total_seconds > 0 and self._started is not None
+
+    def start(self):
+        """예산 시작 (실행마다, 상주 모드는 수집/발송 주기마다 다시 시작)."""
+        self._started = self._clock()
+
+    def elapsed(self):
+        return self._clock() - self._started if self._started is not None else 0.0
+
+    def deadline(self, stage):
+        """단계 마감 시각. 제한이 없거나 시작 전이면 None. 모르는 단계는 실행 전체 마감."""
+        if not self.enabled:
+            return None
+        return self._started + self.total_seconds * self._cumulative.get(stage, 1.0)
+
+    def remaining(self, stage):
+        deadline = self.deadline(stage)
+        return None if deadline is None else deadline - self._clock()
+
+    def timeout(self, stage, default):
+        """요청 timeout: default와 단계 마감까지 남은 시간 중 작은 값. 마감이 지났으면 DeadlineExceeded."""
+        remaining = self.remaining(stage)
+        if remaining is None:
+            return default
+        if remaining <= 0:
+            raise DeadlineExceeded(f"{stage} 단계 예산 소진")
+        return min(default, remaining) if default else remaining
+
+    def stats(self):
+        return {
+            "budget_seconds": self.total_seconds,
+            "elapsed_seconds": round(self.elapsed(), 3),
+            "stage_deadlines": {
+                stage: round(self.total_seconds * share, 1) for stage, share in self._cumulative.items()
+            } if self.total_seconds > 0 else {},
+        }
+
+
+def backoff_delay(attempt, base_delay=1.0, max_delay=10.0, rng=random):
+    """attempt번째(1부터) 재시도 전 대기 시간: 0 ~ min(max_delay, base_delay × 2^(attempt-1)) 균등 분포."""
+    return rng.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+
+
+def call_with_retry(fn, attempts=3, base_delay=1.0, max_delay=10.0, deadline=None, retryable=None,
+                    on_retry=None, clock=time.monotonic, sleep=time.sleep, rng=random):
+    """
+    fn()을 최대 attempts번 시도. retryable(예외)가 False인 예외, 마지막 시도의 예외,
+    대기 후 deadline을 넘게 되는 경우의 예외는 그대로 다시 발생.
+    on_retry(재시도 번호, 대기 시간, 예외)는 대기 전에 호출 (로그 출력용).
+    """
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except Exception as e:
+            attempt += 1
+            if attempt >= attempts or isinstance(e, (DeadlineExceeded, CircuitOpen)):
+                raise
+            if retryable is not None and not retryable(e):
+                raise
+            delay = backoff_delay(attempt, base_delay, max_delay, rng)
+            if deadline is not None and clock() + delay >= deadline:
+                raise
+            if on_retry is not None:
+                on_retry(attempt, delay, e)
+            sleep(delay)
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_seconds=60.0, clock=time.monotonic):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = STATE_CLOSED
+        self.failures = 0          # 연속 실패 수
+        self.opened_at = 0.0
+        self._trial_running = False
+
+        self.trips = 0             # 열린 횟수
+        self.rejected = 0          # 열려 있어 보내지 않은 요청 수
+
+    def allow(self):
+        """요청을 보내도 되는지. 열린 뒤 reset_seconds가 지나면 시험 요청 한 건만 허용."""
+        with self._lock:
+            if self.state == STATE_OPEN and self._clock() - self.opened_at >= self.reset_seconds:
+                self.state = STATE_HALF_OPEN
+                self._trial_running = False
+            if self.state == STATE_CLOSED:
+                return True
+            if self.state == STATE_HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = STATE_CLOSED
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == STATE_HALF_OPEN or (self.state == STATE_CLOSED and self.failures >= self.failure_threshold):
+                self.state = STATE_OPEN
+                self.opened_at = self._clock()
+                self.trips += 1
+            self._trial_running = False
+
+    def reset_stats(self):
+        with self._lock:
+            self.trips = 0
+            self.rejected = 0
+
+
+class BreakerBoard:
+    """호스트별 CircuitBreaker 모음."""
+
+    def __init__(self, failure_threshold=5, reset_seconds=60.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._breakers = {}
+
+    def for_url(self, url):
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_seconds, self._clock)
+            return breaker
+
+    def reset_stats(self):
+        """열린 횟수/생략한 요청 수만 초기화 (차단기 상태는 유지)."""
+        with self._lock:
+            for breaker in self._breakers.values():
+                breaker.reset_stats()
+
+    def stats(self):
+        """한 번이라도 열렸거나 요청을 막은 호스트만 {호스트: {state, trips, rejected}}."""
+        with self._lock:
+            return {
+                host: {"state": b.state, "trips": b.trips, "rejected": b.rejected}
+                for host, b in self._breakers.items() if b.trips or b.rejected
+            }
@@ -0,0 +1,122 @@
+"""
+유사 제목(중복 주제) 색인.
+
+기존 is_duplicate_topic은 새 제목마다 수집된 모든 제목과 difflib 유사도를 계산하므로 O(n²)입니다.
+TitleIndex는 글자(음절) 단위 prefix filter 역색인으로 "유사도 0.7을 넘을 수 있는" 후보만 추려서
+difflib 정밀 비교를 수행합니다. 후보를 거르는 조건은 모두 SequenceMatcher.ratio()의 상한이므로
+판정 결과는 전수 비교와 완전히 동일합니다.
+
+  ratio = 2M / (la + lb),  M ≤ 두 제목의 공통 글자 수(multiset 교집합, quick_ratio) ≤ min(la, lb)
+  → ratio > r 이려면 교집합 크기 > la·r/(2-r) 이어야 하고,
+    전역 순서로 정렬한 글자 토큰의 앞부분(prefix) 중 하나 이상을 반드시 공유함
+
+전역 순서는 "드문 토큰 먼저"일수록 후보가 줄어들므로, 색인 크기가 두 배가 될 때마다
+그 시점의 토큰 빈도로 순서를 다시 정하고 색인을 재구성합니다 (분할 상환 O(n)).
+"""
+import difflib
+from collections import Counter, defaultdict
+
+REBUILD_MIN_SIZE = 64  # 이 크기 이상부터 토큰 빈도 기반 재정렬/재색인 수행
+
+
+def _char_tokens(title):
+    """제목을 (글자, 등장 순번) 토큰 목록으로 변환 (글자 multiset → set)."""
+    seen = Counter()
+    tokens = []
+    for ch in title:
+        tokens.append((ch, seen[ch]))
+        seen[ch] += 1
+    return tokens
+
+
+class TitleIndex:
+    def __init__(self, threshold=0.7):
+        self.threshold = threshold
+        self.titles = []
+        self._counters = []
+        self._postings = defaultdict(list)  # 토큰 → 해당 토큰을 prefix에 가진 제목 번호 목록
+        self._token_df = Counter()          # 마지막 재구성 시점의 토큰별 제목 수 (전역 순서 기준)
+        self._next_rebuild = REBUILD_MIN_SIZE
+        self._has_empty = False
+        self.comparisons = 0  # difflib 정밀 비교 횟수 (벤치마크/통계용)
+
+    def __len__(self):
+        return len(self.titles)
+
+    def _min_overlap(self, length):
+        """길이 length인 제목과 유사도 threshold를 넘으려면 필요한 최소 공통 글자 수 (보수적으로 내림)."""
+        r = self.threshold
+        return int(length * r / (2 - r))
+
+    def _prefix(self, title):
+        """전역 순서(드문 토큰 먼저)로 정렬한 토큰 중 후보 탐색에 필요한 앞부분만 반환."""
+        df = self._token_df
+        tokens = sorted(_char_tokens(title), key=lambda tok: (df.get(tok, 0), tok))
+        size = len(tokens) - self._min_overlap(len(tokens)) + 1
+        return tokens[:size]
+
+    def _rebuild(self):
+        """현재까지의 토큰 빈도로 전역 순서를 다시 정하고 역색인을 재구성."""
+        df = Counter()
+        for title in self.titles:
+            df.update(_char_tokens(title))
+        self._token_df = df
+        self._postings = defaultdict(list)
+        for idx, title in enumerate(self.titles):
+            if title:
+                for token in self._prefix(title):
+                    self._postings[token].append(idx)
+        self._next_rebuild = len(self.titles) * 2
+
+    def find_duplicate(self, title):
+        """유사도가 threshold를 넘는 기존 제목의 번호 반환. 없으면 None."""
+        if not title:
+            # SequenceMatcher는 빈 문자열끼리 ratio 1.0
+            return self.titles.index("") if self._has_empty else None
+
+        length = len(title)
+        r = self.threshold
+        counter = None
+        checked = set()
+        for token in self._prefix(title):
+            for idx in self._postings.get(token, ()):
+                if idx in checked:
+                    continue
+                checked.add(idx)
+
+                other = self.titles[idx]
+                # 1) 길이 상한 (real_quick_ratio)
+                if 2.0 * min(length, len(other)) / (length + len(other)) <= r:
+                    continue
+                # 2) 공통 글자 수 상한 (quick_ratio)
+                if counter is None:
+                    counter = Counter(title)
+                other_counter = self._counters[idx]
+                overlap = 0
+                for ch, n in counter.items():
+                    m = other_counter.get(ch)
+                    if m:
+                        overlap += n if n < m else m
+                if 2.0 * overlap / (length + len(other)) <= r:
+                    continue
+                # 3) 기존 is_duplicate_topic과 동일한 정밀 비교
+                self.comparisons += 1
+                if difflib.SequenceMatcher(None, title, other).ratio() > r:
+                    return idx
+        return None
+
+    def is_duplicate(self, title):
+        return self.find_duplicate(title) is not None
+
+    def add(self, title):
+        idx = len(self.titles)
+        self.titles.append(title)
+        self._counters.append(Counter(title))
+        if not title:
+            self._has_empty = True
+        elif len(self.titles) >= self._next_rebuild:
+            self._rebuild()
+        else:
+            for token in self._prefix(title):
+                self._postings[token].append(idx)
+        return idx
@@ -0,0 +1,253 @@
+"""
+SMTP 발송 스케줄러.
+
+- MIME 메시지는 한 번만 직렬화하여 모든 배치에 같은 바이트를 사용
+- 고정 60초 대기 대신 분당 메시지 수 기반 토큰 버킷으로 발송 속도 제한
+  (대기가 길면 연결을 닫아 두었다가 다음 배치에서 다시 연결)
+- 연결이 끊기면 재연결 후 같은 배치를 재시도 (지수 백오프 + jitter), 한 배치가 실패해도 나머지 배치는 계속 발송
+- deadline(실행 예산의 발송 단계 마감)이 있으면 연결 timeout을 남은 시간으로 줄이고, 마감이 지나면 재연결 재시도 없음
+- 수신자별 발송 결과를 SQLite에 기록하여, 재실행 시 이미 받은 수신자는 건너뛰고 실패한 수신자에게만 발송
+- SMTP 호스트/포트/STARTTLS를 설정할 수 있어 로컬 SMTP 서버(aiosmtpd, smtpd 등)로 시험 가능
+"""
+import os
+import smtplib
+import sqlite3
+import time
+from collections import namedtuple
+
+from deadline import backoff_delay
+
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+
+DeliveryResult = namedtuple("DeliveryResult", ["sent", "failed", "skipped"])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS deliveries (
+    message_key TEXT NOT NULL,   -- 같은 보고서를 식별하는 키 (날짜가 들어간 메일 제목)
+    recipient   TEXT NOT NULL,
+    status      TEXT NOT NULL,   -- 'sent' 또는 'failed'
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    last_error  TEXT,
+    updated_at  REAL NOT NULL,
+    PRIMARY KEY (message_key, recipient)
+);
+"""
+
+
+class TokenBucket:
+    """분당 rate_per_minute개씩 채워지고 최대 burst개까지 쌓이는 토큰 버킷."""
+
+    def __init__(self, rate_per_minute, burst=1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self):
+        """토큰 하나를 얻기까지 기다려야 하는 시간(초)."""
+        self._refill()
+        if self._tokens >= 1 or self.rate <= 0:
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """토큰 하나를 사용. 부족하면 채워질 때까지 대기하고 대기한 시간(초) 반환."""
+        waited = self.wait_time()
+        if waited > 0:
+            self._sleep(waited)
+            self._refill()
+        self._tokens = max(0.0, self._tokens - 1)
+        return waited
+
+
+class DeliveryLog:
+    """수신자별 발송 기록 (재실행 시 실패한 수신자에게만 재발송)."""
+
+    def __init__(self, path, retention_days=30):
+        self.path = path
+        self.retention_days = retention_days
+        self._conn = None
+
+    def open(self):
+        if self._conn is not None:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(SCHEMA)
+        cutoff = time.time() - self.retention_days * 86400
+        with self._conn:
+            self._conn.execute("DELETE FROM deliveries WHERE updated_at < ?", (cutoff,))
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def delivered(self, message_key):
+        """이미 발송에 성공한 수신자 집합."""
+        self.open()
+        rows = self._conn.execute(
+            "SELECT recipient FROM deliveries WHERE message_key = ? AND status = ?",
+            (message_key, STATUS_SENT),
+        )
+        return {row[0] for row in rows}
+
+    def record(self, message_key, recipients, status, error=None):
+        """배치 결과 기록 (배치마다 바로 커밋하여 중간에 죽어도 기록이 남도록)."""
+        self.open()
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO deliveries (message_key, recipient, status, attempts, last_error, updated_at)
+                VALUES (?, ?, ?, 1, ?, ?)
+                ON CONFLICT(message_key, recipient) DO UPDATE SET
+                    status = excluded.status,
+                    attempts = deliveries.attempts + 1,
+                    last_error = excluded.last_error,
+                    updated_at = excluded.updated_at
+                """,
+                [(message_key, r, status, error, now) for r in recipients],
+            )
+
+
+class DeliveryScheduler:
+    def __init__(self, host, port, sender, password=None, starttls=True, batch_size=15,
+                 messages_per_minute=1, burst=1, max_retries=2, idle_timeout=30,
+                 timeout=30, log=None, sleep=time.sleep, deadline=None, min_timeout=5):
+        """deadline: 발송 단계 마감 시각(time.monotonic 기준). 지나도 연결 timeout은 min_timeout초까지 보장."""
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.password = password
+        self.starttls = starttls
+        self.batch_size = max(1, batch_size)
+        self.max_retries = max_retries
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.log = log
+        self._sleep = sleep
+        self.deadline = deadline
+        self.min_timeout = min_timeout
+        self.bucket = TokenBucket(messages_per_minute, burst, sleep=sleep)
+        self._server = None
+
+        self.connects = 0
+        self.reconnects = 0
+        self.messages_sent = 0
+        self.bytes_sent = 0
+        self.waited_seconds = 0.0
+
+    def _remaining(self):
+        return None if self.deadline is None else self.deadline - time.monotonic()
+
+    def _connect(self):
+        timeout = self.timeout
+        remaining = self._remaining()
+        if remaining is not None:
+            timeout = min(timeout, max(remaining, self.min_timeout))
+        server = smtplib.SMTP(self.host, self.port, timeout=timeout)
+        if self.starttls:
+            server.starttls()
+        # 로컬 시험용 SMTP 서버처럼 AUTH를 지원하지 않으면 로그인 생략
+        if self.password and server.has_extn("auth"):
+            server.login(self.sender, self.password)
+        self.connects += 1
+        self._server = server
+        return server
+
+    def _disconnect(self):
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            try:
+                self._server.close()
+            except Exception:
+                pass
+        self._server = None
+
+    def _wait_for_slot(self):
+        """토큰 버킷 대기. 오래 기다려야 하면 연결을 유지하지 않고 닫아 둠."""
+        wait = self.bucket.wait_time()
+        if wait > self.idle_timeout:
+            self._disconnect()
+        if wait >= 1:
+            print(f"⏳ 발송 속도 제한: {wait:.0f}초 대기 중...")
+        self.waited_seconds += self.bucket.acquire()
+
+    def _send_batch(self, message_bytes, batch):
+        """배치 하나 발송. 연결이 끊기면 재연결 후 재시도. 수신 거부된 주소 {주소: 사유} 반환."""
+        attempt = 0
+        while True:
+            try:
+                server = self._server or self._connect()
+                refused = server.sendmail(self.sender, batch, message_bytes)
+                self.messages_sent += 1
+                self.bytes_sent += len(message_bytes)
+                return refused
+            except smtplib.SMTPRecipientsRefused as e:
+                return {r: str(reason) for r, reason in e.recipients.items()}
+            except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError) as e:
+                # 서버가 응답 코드로 거절한 경우(SMTPResponseException)는 재연결해도 같으므로 재시도하지 않음
+                if isinstance(e, smtplib.SMTPResponseException) and not isinstance(e, smtplib.SMTPConnectError):
+                    raise
+                self._disconnect()
+                attempt += 1
+                delay = backoff_delay(attempt, base_delay=2, max_delay=30)
+                remaining = self._remaining()
+                if attempt > self.max_retries or (remaining is not None and remaining < delay):
+                    raise
+                print(f"⚠️ SMTP 연결 끊김, {delay:.1f}초 후 재연결하여 재시도 ({attempt}/{self.max_retries}): {e}")
+                self.reconnects += 1
+                self._sleep(delay)
+
+    def deliver(self, message_bytes, recipients, message_key):
+        """
+        직렬화된 메시지를 수신자 목록에 배치 단위로 발송하고 DeliveryResult 반환.
+        message_key로 이미 발송에 성공한 수신자는 건너뜀.
+        """
+        already = self.log.delivered(message_key) if self.log else set()
+        pending, skipped = [], []
+        for r in dict.fromkeys(recipients):
+            (skipped if r in already else pending).append(r)
+        if skipped:
+            print(f"📨 이미 발송된 수신자 {len(skipped)}명은 건너뜁니다.")
+
+        sent, failed = [], []
+        total_batches = (len(pending) + self.batch_size - 1) // self.batch_size
+        try:
+            for start in range(0, len(pending), self.batch_size):
+                batch = pending[start:start + self.batch_size]
+                batch_no = start // self.batch_size + 1
+                self._wait_for_slot()
+                try:
+                    refused = self._send_batch(message_bytes, batch)
+                except Exception as e:
+                    print(f"❌ Batch {batch_no}/{total_batches} 발송 실패 ({len(batch)}명): {e}")
+                    failed.extend(batch)
+                    if self.log:
+                        self.log.record(message_key, batch, STATUS_FAILED, str(e))
+                    continue
+
+                ok = [r for r in batch if r not in refused]
+                sent.extend(ok)
+                failed.extend(refused)
+                if self.log:
+                    self.log.record(message_key, ok, STATUS_SENT)
+                    for r, reason in refused.items():
+                        self.log.record(message_key, [r], STATUS_FAILED, reason)
+                print(f"📧 Batch {batch_no}/{total_batches} 발송 완료 ({len(ok)}명).")
+        finally:
+            self._disconnect()
+
+        return DeliveryResult(sent=sent, failed=failed, skipped=skipped)
@@ -0,0 +1,268 @@
+"""
+Google News 리다이렉트 링크 → 실제 기사 도메인 해석기.
+
+- requests.Session 하나로 연결 풀을 재사용 (매 요청마다 TCP/TLS 핸드셰이크 반복 방지)
+- 키워드 단위로 후보 링크를 모아 스레드 풀에서 한 번에 해석 (배치)
+- 링크→도메인 결과를 디스크(JSON)에 TTL·최대 개수 제한을 두고 저장하여
+  이전 실행에서 본 링크는 다시 HEAD 요청을 보내지 않음
+- 호스트별 회로 차단기: 연속으로 시간 초과/연결 실패가 나면 한동안 HEAD 요청을 보내지 않고 "확인 실패"로 처리,
+  단계 마감(deadline)이 지나도 마찬가지 (HEAD 한 건이 timeout초씩 쌓여 실행 전체가 늘어지지 않도록)
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+
+class DomainResolver:
+    def __init__(self, cache_path=None, ttl_days=30, max_entries=20000, max_workers=8, timeout=3, offline=False,
+                 breakers=None, deadline=None):
+        """
+        breakers: 호스트별 회로 차단기(deadline.BreakerBoard)
+        deadline: 호출하면 HEAD 요청 마감 시각(time.monotonic 기준, 없으면 None)을 돌려주는 함수
+        """
+        self.cache_path = cache_path
+        self.breakers = breakers
+        self.deadline = deadline
+        self.offline = offline  # True면 캐시에 없는 링크도 HEAD 요청 없이 "확인 실패"로 처리
+        self.ttl_seconds = ttl_days * 86400
+        self.max_entries = max_entries
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+
+        self._cache = {}      # link → [domain, resolved_at, last_used]  (디스크에 저장되는 성공 결과)
+        # 아래 두 집합은 한 번의 실행(상주 모드에서는 수집 주기 하나) 동안만 유지 (reset_run_state 참고)
+        self._failed = set()  # 이번 실행에서 해석 실패한 링크 (디스크에는 저장하지 않음 → 다음 실행에서 재시도)
+        self._counted = set()  # 이번 실행에서 이미 집계한 링크 (배치 선해석 후 재조회는 적중으로 세지 않음)
+        self._lock = threading.Lock()
+        self._session = None
+        self._loaded = False
+        self._dirty = False
+
+        # 캐시 효과 측정용 카운터
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.network_requests = 0
+        self.network_seconds = 0.0
+        self.skipped = 0  # 마감 초과/회로 차단으로 HEAD 요청을 보내지 않은 링크 수
+        self._past_avg_seconds = 0.0  # 이전 실행들의 HEAD 평균 소요 시간 (이번 실행에 미적중이 없을 때 절약 시간 추정용)
+
+    def _get_session(self):
+        if self._session is None:
+            import requests  # 캐시에서 모두 해결되면 requests를 로드하지 않음
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
+    def load(self):
+        """디스크 캐시 로드. 만료된 항목은 버림. 파일이 없거나 깨져 있으면 빈 캐시로 시작."""
+        self._loaded = True
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                raw = json.load(f)
+        except Exception as e:
+            print(f"⚠️ 리다이렉트 캐시 로드 실패 (빈 캐시로 시작): {e}")
+            return
+
+        now = time.time()
+        self._past_avg_seconds = float(raw.get("avg_resolve_seconds", 0.0))
+        self._cache = {
+            link: value for link, value in raw.get("links", {}).items()
+            if isinstance(value, list) and len(value) == 3 and now - value[1] < self.ttl_seconds
+        }
+
+    def save(self):
+        """디스크 캐시 저장. 최대 개수를 넘으면 가장 오래 사용되지 않은 항목부터 제거."""
+        if not self.cache_path or not self._dirty:
+            return
+        with self._lock:
+            items = self._cache
+            if len(items) > self.max_entries:
+                keep = sorted(items.items(), key=lambda kv: kv[1][2], reverse=True)[:self.max_entries]
+                items = dict(keep)
+                self._cache = items
+            snapshot = {"avg_resolve_seconds": round(self._avg_seconds(), 4), "links": dict(items)}
+
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)  # 중간에 죽어도 기존 캐시가 깨지지 않도록 교체 방식으로 저장
+            self._dirty = False
+        except Exception as e:
+            print(f"⚠️ 리다이렉트 캐시 저장 실패: {e}")
+
+    def reset_run_state(self):
+        """
+        실행 단위 상태 초기화 (상주 모드에서 수집 주기마다 호출).
+        해석 실패로 표시한 링크를 다시 시도하도록 하여, 한 번 실패한(마감/회로 차단으로 생략된) 링크가
+        프로세스가 끝날 때까지 "확인 실패"로 남아 차단 도메인 검사를 계속 건너뛰지 않게 함.
+        """
+        with self._lock:
+            self._failed.clear()
+            self._counted.clear()
+
+    def _lookup(self, link):
+        """캐시 조회. (찾았는지, 도메인) 반환."""
+        with self._lock:
+            if link in self._failed:
+                return True, ""
+            value = self._cache.get(link)
+            if value is None:
+                return False, ""
+            if time.time() - value[1] >= self.ttl_seconds:
+                del self._cache[link]
+                return False, ""
+            value[2] = time.time()
+            self._dirty = True
+            return True, value[0]
+
+    def _fetch(self, link):
+        """실제 HEAD 요청으로 리다이렉트를 따라가 최종 도메인 반환. 실패 시 빈 문자열."""
+        if self.offline:
+            return ""
+        timeout = self.timeout
+        deadline = self.deadline() if self.deadline is not None else None
+        if deadline is not None:
+            timeout = min(timeout, deadline - time.monotonic())
+        breaker = self.breakers.for_url(link) if self.breakers is not None else None
+        if timeout <= 0 or (breaker is not None and not breaker.allow()):
+            with self._lock:
+                self._failed.add(link)  # 이번 실행에서는 "확인 실패"로 처리 (디스크에는 저장하지 않음)
+                self.skipped += 1
+            return ""
+
+        started = time.perf_counter()
+        try:
+            res = self._get_session().head(link, allow_redirects=True, timeout=timeout)
+            domain = urlparse(res.url).netloc.lower()
+        except Exception:
+            domain = ""
+            if breaker is not None:  # 어떤 실패든 기록 (반쯤 열린 상태의 시험 요청이 풀리지 않으면 그 호스트가 영구히 차단됨)
+                breaker.record_failure()
+        else:
+            if breaker is not None:
+                breaker.record_success()
+        elapsed = time.perf_counter() - started
+
+        now = time.time()
+        with self._lock:
+            self.network_requests += 1
+            self.network_seconds += elapsed
+            if domain:
+                self._cache[link] = [domain, now, now]
+                self._dirty = True
+            else:
+                self._failed.add(link)
+                self.failures += 1
+        return domain
+
+    def cached_domain(self, link):
+        """이번 실행 또는 디스크 캐시에 있는 도메인 (집계·네트워크 요청 없음). 없으면 빈 문자열."""
+        with self._lock:
+            value = self._cache.get(link)
+            return value[0] if value else ""
+
+    def remember(self, domains):
+        """다른 프로세스(샤드 수집)가 해석한 {링크: 도메인}을 캐시에 반영 (다음 실행부터 HEAD 요청 생략)."""
+        if not self._loaded:
+            self.load()
+        now = time.time()
+        with self._lock:
+            for link, domain in domains.items():
+                if domain and link not in self._cache:
+                    self._cache[link] = [domain, now, now]
+                    self._dirty = True
+
+    def resolve(self, link):
+        """링크 하나의 실제 도메인 반환 (캐시 우선)."""
+        if not self._loaded:
+            self.load()
+        found, domain = self._lookup(link)
+        self._count([link] if found else [], [] if found else [link])
+        if found:
+            return domain
+        return self._fetch(link)
+
+    def resolve_many(self, links):
+        """
+        여러 링크를 한 번에 해석하여 {link: domain} 반환.
+        캐시에 없는 링크만 스레드 풀로 동시에 HEAD 요청을 보냄.
+        """
+        if not self._loaded:
+            self.load()
+        results = {}
+        pending = []
+        for link in dict.fromkeys(links):  # 순서 유지 중복 제거
+            found, domain = self._lookup(link)
+            if found:
+                results[link] = domain
+            else:
+                pending.append(link)
+
+        self._count(results, pending)
+
+        if len(pending) == 1:
+            results[pending[0]] = self._fetch(pending[0])
+        elif pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as pool:
+                for link, domain in zip(pending, pool.map(self._fetch, pending)):
+                    results[link] = domain
+        return results
+
+    def _count(self, hit_links, miss_links):
+        with self._lock:
+            for link in hit_links:
+                if link not in self._counted:
+                    self._counted.add(link)
+                    self.hits += 1
+            for link in miss_links:
+                self._counted.add(link)
+                self.misses += 1
+
+    def _avg_seconds(self):
+        if self.misses and not self.offline:
+            return self.network_seconds / self.misses
+        return self._past_avg_seconds
+
+    def stats(self):
+        """캐시 적중/실패 카운터와 네트워크 소요 시간, 캐시로 절약한 시간(추정) 반환."""
+        lookups = self.hits + self.misses
+        avg_seconds = self._avg_seconds()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "failures": self.failures,
+            "network_requests": self.network_requests,
+            "skipped": self.skipped,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "network_seconds": round(self.network_seconds, 3),
+            "estimated_saved_seconds": round(avg_seconds * self.hits, 3),
+            "cached_links": len(self._cache),
+        }
+
+    def reset_stats(self):
+        """카운터 초기화. 평균 HEAD 소요 시간은 절약 시간 추정용으로 이어서 사용."""
+        with self._lock:
+            self._past_avg_seconds = self._avg_seconds()
+            self.hits = self.misses = self.failures = self.network_requests = self.skipped = 0
+            self.network_seconds = 0.0
+
+    def print_stats(self):
+        s = self.stats()
+        print(
+            f"🔗 리다이렉트 캐시: 적중 {s['hits']} / 미적중 {s['misses']} (적중률 {s['hit_rate']:.0%}), "
+            f"HEAD 요청 {s['network_seconds']:.1f}초, 캐시로 절약한 시간 약 {s['estimated_saved_seconds']:.1f}초"
+            + (f", 마감/회로 차단으로 생략 {s['skipped']}건" if s['skipped'] else "")
+        )
@@ -0,0 +1,242 @@
+"""
+RSS 피드 디스크 캐시 (조건부 GET + 오프라인 재실행).
+
+- 검색 URL마다 원본 피드 바이트와 검증자(ETag / Last-Modified)를 저장
+- 다음 요청에 If-None-Match / If-Modified-Since를 붙여 보내고, 304면 캐시된 바이트를 파싱
+- 요청이 실패하면 캐시된 피드로 대체 (stale-if-error)
+- offline=True면 네트워크 없이 캐시된 피드만 사용 (--offline 재실행, 로컬 프로파일링용)
+- 일시적인 실패(연결/시간 초과, 5xx, 429)는 지수 백오프로 재시도, 호스트별 회로 차단기가 열려 있거나
+  단계 마감(deadline)이 지났으면 요청 없이 캐시된 피드로 대체 (deadline.py)
+  피드 본문은 requests로 timeout을 두고 받은 뒤 feedparser로는 바이트만 파싱 (feedparser가 직접 네트워크를 쓰지 않음)
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+from deadline import CircuitOpen, DeadlineExceeded, call_with_retry, is_transient_error
+
+
+def _atomic_write(path, data):
+    """임시 파일에 쓴 뒤 교체 (중간에 죽어도 기존 캐시가 깨지지 않도록)."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class FeedCacheMiss(Exception):
+    """오프라인 모드에서 캐시된 피드가 없는 경우."""
+
+
+class FeedCache:
+    def __init__(self, cache_dir, offline=False, timeout=10, pool_size=8,
+                 breakers=None, retry_attempts=1, retry_base_delay=1.0, retry_max_delay=10.0):
+        """breakers: 호스트별 회로 차단기(deadline.BreakerBoard), retry_attempts: 요청당 최대 시도 횟수."""
+        self.cache_dir = cache_dir
+        self.offline = offline
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.breakers = breakers
+        self.retry_attempts = max(1, retry_attempts)
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+        self.requests = 0           # 네트워크 요청 수 (실패 포함)
+        self.downloads = 0          # 200 응답 (새 피드)
+        self.not_modified = 0       # 304 응답 (캐시 재사용)
+        self.offline_reads = 0      # 오프라인 모드 캐시 읽기
+        self.stale_fallbacks = 0    # 요청 실패 → 캐시로 대체
+        self.retries = 0            # 일시적 실패 후 재시도
+        self.skipped = 0            # 마감 초과/회로 차단으로 요청하지 않음
+        self.bytes_downloaded = 0
+
+    def _get_session(self):
+        # requests/feedparser는 첫 요청 때 로드 (주말·환경변수 누락으로 바로 끝나는 실행은 import 비용 없음)
+        import feedparser
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers["User-Agent"] = feedparser.USER_AGENT
+                self._session = session
+            return self._session
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + ".xml", base + ".json"
+
+    def _load(self, url):
+        """캐시된 (피드 바이트, 메타데이터) 반환. 없으면 (None, {})."""
+        body_path, meta_path = self._paths(url)
+        if not (os.path.exists(body_path) and os.path.exists(meta_path)):
+            return None, {}
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                return f.read(), meta
+        except Exception as e:
+            print(f"⚠️ 피드 캐시 읽기 실패: {e}")
+            return None, {}
+
+    def _store(self, url, body, response):
+        body_path, meta_path = self._paths(url)
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_type": response.headers.get("Content-Type"),
+            "fetched_at": time.time(),
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            _atomic_write(body_path, body)
+            _atomic_write(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+        except Exception as e:
+            print(f"⚠️ 피드 캐시 저장 실패: {e}")
+        return meta
+
+    def _parse(self, body, meta, replay=False):
+        """
+        피드 바이트 파싱. replay=True(오프라인 재실행)면 수집 당시 시각을 feed['fetched_at']에 붙여
+        기간 필터가 그 시각 기준으로 동작하도록 함 (그날의 실행을 그대로 재현).
+        """
+        import feedparser
+
+        headers = {"content-type": meta["content_type"]} if meta.get("content_type") else None
+        feed = feedparser.parse(body, response_headers=headers)
+        if replay and meta.get("fetched_at"):
+            feed["fetched_at"] = datetime.fromtimestamp(meta["fetched_at"], tz=timezone.utc)
+        return feed
+
+    def _get(self, url, headers, deadline=None):
+        """
+        요청 한 번. timeout은 deadline(time.monotonic 기준)까지 남은 시간을 넘지 않음.
+        마감이 지났거나 회로 차단기가 열려 있으면 요청하지 않고 DeadlineExceeded / CircuitOpen.
+        """
+        timeout = self.timeout
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise DeadlineExceeded("RSS 단계 예산 소진")
+            timeout = min(timeout, remaining)
+        breaker = self.breakers.for_url(url) if self.breakers is not None else None
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpen(f"회로 차단 중인 호스트: {urlparse(url).netloc}")
+
+        with self._stats_lock:
+            self.requests += 1
+        try:
+            res = self._get_session().get(url, headers=headers, timeout=timeout)
+            if res.status_code >= 500 or res.status_code == 429:
+                res.raise_for_status()
+        except Exception:
+            if breaker is not None:  # 여기서 나는 예외는 5xx/429/연결 실패뿐이지만, 그 밖의 예외도 반쯤 열린 상태의 시험 요청을 풀어 줌
+                breaker.record_failure()
+            raise
+        if breaker is not None:
+            breaker.record_success()
+        return res
+
+    def _on_retry(self, attempt, delay, error):
+        with self._stats_lock:
+            self.retries += 1
+        print(f"⚠️ RSS 요청 실패, {delay:.1f}초 후 재시도 ({attempt}/{self.retry_attempts - 1}): {error}")
+
+    def fetch(self, url, deadline=None):
+        """
+        URL의 피드를 파싱하여 반환 (조건부 GET, 오프라인이면 캐시만 사용).
+        deadline: 이 시각(time.monotonic 기준)이 지나면 요청하지 않고 캐시로 대체 (캐시도 없으면 DeadlineExceeded).
+        """
+        cached_body, meta = self._load(url)
+
+        if self.offline:
+            if cached_body is None:
+                raise FeedCacheMiss(f"캐시된 피드 없음: {url}")
+            with self._stats_lock:
+                self.offline_reads += 1
+            return self._parse(cached_body, meta, replay=True)
+
+        headers = {}
+        if cached_body is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            res = call_with_retry(
+                lambda: self._get(url, headers, deadline),
+                attempts=self.retry_attempts,
+                base_delay=self.retry_base_delay,
+                max_delay=self.retry_max_delay,
+                deadline=deadline,
+                retryable=is_transient_error,
+                on_retry=self._on_retry,
+            )
+            if res.status_code == 304 and cached_body is not None:
+                with self._stats_lock:
+                    self.not_modified += 1
+                return self._parse(cached_body, meta)
+            res.raise_for_status()
+        except Exception as e:
+            if isinstance(e, (DeadlineExceeded, CircuitOpen)):
+                with self._stats_lock:
+                    self.skipped += 1
+            if cached_body is None:
+                raise
+            print(f"⚠️ RSS 요청 실패, 캐시된 피드 사용: {e}")
+            with self._stats_lock:
+                self.stale_fallbacks += 1
+            return self._parse(cached_body, meta)
+
+        body = res.content
+        with self._stats_lock:
+            self.downloads += 1
+            self.bytes_downloaded += len(body)
+        meta = self._store(url, body, res)
+        return self._parse(body, meta)
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "offline": self.offline,
+                "requests": self.requests,
+                "downloads": self.downloads,
+                "not_modified": self.not_modified,
+                "offline_reads": self.offline_reads,
+                "stale_fallbacks": self.stale_fallbacks,
+                "retries": self.retries,
+                "skipped": self.skipped,
+                "bytes_downloaded": self.bytes_downloaded,
+            }
+
+    def reset_stats(self):
+        """카운터 초기화 (상주 모드에서 주기마다 메트릭을 따로 기록하도록)."""
+        with self._stats_lock:
+            self.requests = self.downloads = self.not_modified = self.offline_reads = 0
+            self.stale_fallbacks = self.retries = self.skipped = self.bytes_downloaded = 0
+
+    def print_stats(self):
+        if self.offline:
+            print(f"📦 피드 캐시(오프라인): {self.offline_reads}개 피드 재생")
+            return
+        print(
+            f"📦 피드 캐시: 신규 {self.downloads}건 ({self.bytes_downloaded / 1024:.0f}KB), "
+            f"304 재사용 {self.not_modified}건, 요청 실패 대체 {self.stale_fallbacks}건"
+            + (f", 재시도 {self.retries}건" if self.retries else "")
+            + (f", 마감/회로 차단으로 생략 {self.skipped}건" if self.skipped else "")
+        )
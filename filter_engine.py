@@ -0,0 +1,109 @@
+"""
+제목/매체 필터 엔진.
+
+EXCLUDE_KEYWORDS(스팸), VIDEO_KEYWORDS(영상/포토), OVERSEAS_LOCAL_SOURCES(해외 현지 매체),
+KOREAN_COMPANIES(국내 건설사 허용 목록)를 정규식 하나로 한 번만 컴파일해 두고,
+기사마다 "제목 + source" 문자열을 단 한 번 훑어서 어떤 규칙에 걸렸는지 판정합니다.
+
+판정 규칙은 기존 함수들과 동일합니다.
+- 스팸/영상/건설사: 제목에서만, 대소문자 구분
+- 해외 현지 매체: 제목 + source를 이어 붙인 문자열에서, 대소문자 무시
+- 우선순위: 스팸 → 영상 → 해외 현지 매체 (건설사가 제목에 있으면 해외 매체 규칙만 무시)
+"""
+import re
+from collections import Counter, namedtuple
+from functools import lru_cache
+
+RULE_SPAM = "spam"
+RULE_VIDEO = "video"
+RULE_OVERSEAS = "overseas_source"
+RULE_COMPANY = "company"  # 허용 목록 (차단 규칙 아님)
+
+# fetch_news의 나머지 단계에서 기록하는 탈락 사유
+RULE_STALE = "stale"
+RULE_DUP_LINK = "duplicate_link"
+RULE_DUP_TOPIC = "duplicate_topic"
+RULE_BLOCKED_DOMAIN = "blocked_domain"
+
+# rule: 차단 규칙 이름 (통과면 None) / term: 걸린 단어
+# company: 제목에 등장한 국내 건설사 (없으면 None)
+# overridden: 해외 매체 규칙에 걸렸지만 건설사 허용 목록으로 통과된 경우 해당 매체명
+Verdict = namedtuple("Verdict", ["rule", "term", "company", "overridden"])
+
+
+class FilterEngine:
+    def __init__(self, exclude_keywords, video_keywords, companies, overseas_sources):
+        self._patterns = []  # (term, rule, case_insensitive)
+        for term in exclude_keywords:
+            self._patterns.append((term, RULE_SPAM, False))
+        for term in video_keywords:
+            self._patterns.append((term, RULE_VIDEO, False))
+        for term in companies:
+            self._patterns.append((term, RULE_COMPANY, False))
+        for term in overseas_sources:
+            self._patterns.append((term, RULE_OVERSEAS, True))
+
+        # 같은 위치에서 시작하는 패턴 중 가장 긴 것이 잡히도록 길이 내림차순 정렬.
+        # 전방 탐색((?=...))으로 매 위치를 검사하므로 겹치는 단어도 빠짐없이 찾음.
+        alternatives = []
+        for term, _, ignore_case in sorted(self._patterns, key=lambda p: -len(p[0])):
+            escaped = re.escape(term)
+            alternatives.append(f"(?i:{escaped})" if ignore_case else escaped)
+        self._regex = re.compile("(?=(" + "|".join(alternatives) + "))") if alternatives else None
+        self._expand = lru_cache(maxsize=1024)(self._expand_match)
+
+        self.rejections = Counter()  # 규칙별 탈락 건수
+
+    def _expand_match(self, matched):
+        """
+        한 위치에서 잡힌 가장 긴 문자열 → 그 위치에서 동시에 성립하는 모든 (길이, 규칙, 단어).
+        같은 위치에서 시작하는 더 짧은 패턴은 반드시 가장 긴 문자열의 접두어이므로 접두어만 확인.
+        """
+        lowered = matched.lower()
+        hits = []
+        for term, rule, ignore_case in self._patterns:
+            if (lowered.startswith(term.lower()) if ignore_case else matched.startswith(term)):
+                hits.append((len(term), rule, term))
+        return tuple(hits)
+
+    def find_terms(self, title, source=""):
+        """제목과 source를 한 번 훑어 {규칙: 처음 걸린 단어} 반환 (우선순위 적용 전 원본 결과)."""
+        found = {}
+        if self._regex is None:
+            return found
+        title_len = len(title)
+        for match in self._regex.finditer(title + source):
+            pos = match.start()
+            for length, rule, term in self._expand(match.group(1)):
+                # 해외 매체 외 규칙은 제목 안에서 완결되는 경우만 인정
+                if rule != RULE_OVERSEAS and pos + length > title_len:
+                    continue
+                found.setdefault(rule, term)
+        return found
+
+    def scan(self, title, source=""):
+        """제목과 source를 한 번 훑어 우선순위를 적용한 Verdict 반환."""
+        found = self.find_terms(title, source)
+        company = found.get(RULE_COMPANY)
+        if RULE_SPAM in found:
+            return Verdict(RULE_SPAM, found[RULE_SPAM], company, None)
+        if RULE_VIDEO in found:
+            return Verdict(RULE_VIDEO, found[RULE_VIDEO], company, None)
+        if RULE_OVERSEAS in found:
+            if company:
+                return Verdict(None, None, company, found[RULE_OVERSEAS])
+            return Verdict(RULE_OVERSEAS, found[RULE_OVERSEAS], None, None)
+        return Verdict(None, None, company, None)
+
+    def record(self, rule):
+        """탈락 사유 집계."""
+        self.rejections[rule] += 1
+
+    def reset_stats(self):
+        self.rejections.clear()
+
+    def print_stats(self):
+        if not self.rejections:
+            return
+        summary = ", ".join(f"{rule} {count}" for rule, count in self.rejections.most_common())
+        print(f"🧹 필터 탈락 현황: {summary}")
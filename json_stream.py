@@ -0,0 +1,134 @@
+"""
+Gemini 스트리밍 응답용 증분 JSON 파서.
+
+응답 조각(chunk)을 받을 때마다 이어 붙이며 문자열/이스케이프/괄호 깊이를 추적하고,
+- 최상위 "weather_summary" 문자열이 닫히는 즉시
+- "selected_cards" 배열의 원소(객체)가 닫히는 즉시
+해당 값을 꺼내 개별 검증합니다. 응답 뒤쪽이 깨지거나 스트림이 중간에 끊겨도
+그때까지 완성된 유효한 카드는 보존됩니다. JSON 앞뒤의 설명 문구/마크다운 태그는 무시합니다.
+"""
+import json
+
+RISK_LEVELS = ("Critical", "Warning", "Info")
+
+
+def validate_card(card, valid_ids):
+    """카드 하나 검증. 유효하면 정리된 카드, 아니면 (None, 사유)."""
+    if not isinstance(card, dict):
+        return None, "객체가 아님"
+    card_id = card.get("id")
+    if isinstance(card_id, str) and card_id.strip().isdigit():
+        card_id = int(card_id.strip())
+    if not isinstance(card_id, int) or isinstance(card_id, bool) or card_id not in valid_ids:
+        return None, f"존재하지 않는 ID: {card.get('id')!r}"
+    if card.get("risk_level") not in RISK_LEVELS:
+        return None, f"허용되지 않는 risk_level: {card.get('risk_level')!r}"
+    for field in ("summary", "insight"):
+        if not isinstance(card.get(field), str) or not card[field].strip():
+            return None, f"{field} 누락"
+    return dict(card, id=card_id), None
+
+
+class AnalysisStreamParser:
+    def __init__(self, valid_ids):
+        self.valid_ids = set(valid_ids)
+        self.weather_summary = None
+        self.cards = []
+        self.rejected = []   # (카드 원문 또는 값, 사유)
+        self.done = False    # 최상위 객체가 정상적으로 닫혔는지
+
+        self._buf = ""
+        self._pos = 0
+        self._started = False
+        self._stack = []          # 열린 컨테이너 ('{' 또는 '[')
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._expect_key = False  # 최상위 객체에서 다음 문자열이 키인지
+        self._top_key = None      # 최상위 객체에서 현재 값의 키
+        self._card_start = None
+        self._seen_ids = set()
+
+    def feed(self, chunk):
+        """응답 조각을 추가하고, 이번 조각으로 새로 완성된 이벤트 [(종류, 값)] 반환."""
+        self._buf += chunk
+        events = []
+        buf = self._buf
+        i = self._pos
+        while i < len(buf) and not self.done:
+            c = buf[i]
+            if not self._started:
+                if c == "{":
+                    self._started = True
+                    self._stack.append("{")
+                    self._expect_key = True
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif c == "\\":
+                    self._escaped = True
+                elif c == '"':
+                    self._in_string = False
+                    self._on_string(buf[self._string_start:i + 1], events)
+            elif c == '"':
+                self._in_string = True
+                self._string_start = i
+            elif c in "{[":
+                self._stack.append(c)
+                if c == "{" and self._stack == ["{", "[", "{"] and self._top_key == "selected_cards":
+                    self._card_start = i
+            elif c in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if self._card_start is not None and self._stack == ["{", "["]:
+                    self._on_card(buf[self._card_start:i + 1], events)
+                    self._card_start = None
+                if not self._stack:
+                    self.done = True
+            elif len(self._stack) == 1:
+                if c == ":":
+                    self._expect_key = False
+                elif c == ",":
+                    self._expect_key = True
+            i += 1
+        self._pos = i
+        return events
+
+    def _on_string(self, raw, events):
+        if len(self._stack) != 1:
+            return
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            return
+        if self._expect_key:
+            self._top_key = value
+        elif self._top_key == "weather_summary" and self.weather_summary is None:
+            self.weather_summary = value
+            events.append(("weather_summary", value))
+
+    def _on_card(self, raw, events):
+        try:
+            card = json.loads(raw)
+        except ValueError as e:
+            self.rejected.append((raw, f"JSON 오류: {e}"))
+            return
+        card, reason = validate_card(card, self.valid_ids)
+        if card is None:
+            self.rejected.append((raw, reason))
+            return
+        if card["id"] in self._seen_ids:
+            self.rejected.append((raw, f"중복 ID: {card['id']}"))
+            return
+        self._seen_ids.add(card["id"])
+        self.cards.append(card)
+        events.append(("card", card))
+
+    def result(self):
+        """지금까지 완성된 유효 결과 (기존 분석 결과 스키마). 아무것도 없으면 None."""
+        if self.weather_summary is None and not self.cards:
+            return None
+        data = {"selected_cards": list(self.cards)}
+        if self.weather_summary is not None:
+            data["weather_summary"] = self.weather_summary
+        return data
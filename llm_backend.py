@@ -0,0 +1,217 @@
+"""
+LLM 백엔드와 응답 캐시.
+
+- GeminiBackend: google.generativeai 호출 (운영)
+- StubBackend: 프롬프트의 "ID:n | [카테고리] ..." 목록만 보고 결정적인 JSON을 만드는 로컬 스텁
+  (API 키·네트워크 없이 분석/렌더링 경로를 테스트하고 벤치마크할 때 사용)
+- 두 백엔드 모두 generate_stream()으로 응답을 조각 단위로 받을 수 있음 (json_stream 증분 파서와 함께 사용)
+- timeout(초)을 주면 그 시간 안에 응답이 없을 때 예외 (실행 예산의 LLM 단계 마감까지 남은 시간)
+- LLMCache: (모델명, 프롬프트, safety settings) 해시를 키로 응답 원문을 디스크에 저장.
+  SMTP 실패 후 재실행처럼 같은 프롬프트가 다시 들어오면 Gemini를 호출하지 않고 즉시 반환
+"""
+import hashlib
+import json
+import os
+import re
+import time
+
+
+def is_transient_error(error):
+    """
+    재시도할 만한 LLM 호출 실패: 시간 초과/연결 오류, 5xx, 429.
+    google.api_core 예외는 code 속성에 HTTP 상태 코드가 있음. 안전 설정 차단 등으로 응답 텍스트가 없는 경우(ValueError)는 제외.
+    """
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return code >= 500 or code == 429
+    return isinstance(error, (TimeoutError, OSError))
+
+
+class GeminiBackend:
+    def __init__(self, api_key, model_name="gemini-2.5-flash"):
+        # SDK(gRPC/protobuf 포함) import가 무거우므로 실제로 Gemini를 쓸 때만 로드
+        import google.generativeai as genai
+
+        self.model_name = model_name
+        genai.configure(api_key=api_key)
+        self._model = genai.GenerativeModel(model_name)
+
+    @staticmethod
+    def _request_options(timeout):
+        return {"timeout": timeout} if timeout else None
+
+    def generate(self, prompt, safety_settings=None, timeout=None):
+        """프롬프트를 보내고 응답 텍스트 반환."""
+        response = self._model.generate_content(
+            prompt, safety_settings=safety_settings, request_options=self._request_options(timeout))
+        return response.text
+
+    def generate_stream(self, prompt, safety_settings=None, timeout=None):
+        """스트리밍 응답: 텍스트 조각을 도착하는 대로 반환."""
+        response = self._model.generate_content(
+            prompt, safety_settings=safety_settings, stream=True, request_options=self._request_options(timeout))
+        for chunk in response:
+            text = getattr(chunk, "text", "")
+            if text:
+                yield text
+
+
+class StubBackend:
+    """결정적 로컬 스텁: 같은 프롬프트에는 항상 같은 응답."""
+
+    model_name = "stub"
+    NEWS_LINE = re.compile(r"ID:(\d+) \| \[([^\]]*)\][^\n]*?\] (.*)")
+    INSIGHT_LABEL = re.compile(r'"insight": "([^"\n]*?) \(2문장\)"')  # 프롬프트 출력 형식의 프로필별 insight 문구
+    RISK_LEVELS = ["Critical", "Warning", "Info"]
+
+    def __init__(self, max_cards=5, stream_chunk_size=64, latency=0.0, team=None):
+        self.max_cards = max_cards
+        self.stream_chunk_size = stream_chunk_size
+        self.latency = latency  # 응답 전체에 걸리는 시간(초): 벤치마크에서 Gemini 응답 지연을 흉내
+        self.team = team  # 프롬프트에 insight 문구가 없을 때 쓰는 부서명
+
+    def _check_timeout(self, timeout):
+        """응답 지연(latency)이 timeout보다 길면 timeout만큼 기다린 뒤 시간 초과 (실제 API의 timeout을 흉내)."""
+        if timeout and self.latency > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"stub 응답 시간 초과 ({timeout:.1f}초)")
+
+    def generate_stream(self, prompt, safety_settings=None, timeout=None):
+        """generate() 결과를 일정 크기로 잘라 스트리밍처럼 반환 (latency를 조각마다 나눠 대기)."""
+        self._check_timeout(timeout)
+        text = self._respond(prompt)
+        pieces = [text[start:start + self.stream_chunk_size] for start in range(0, len(text), self.stream_chunk_size)]
+        for piece in pieces:
+            if self.latency:
+                time.sleep(self.latency / len(pieces))
+            yield piece
+
+    def generate(self, prompt, safety_settings=None, timeout=None):
+        self._check_timeout(timeout)
+        if self.latency:
+            time.sleep(self.latency)
+        return self._respond(prompt)
+
+    def _respond(self, prompt):
+        items = [(int(m.group(1)), m.group(2), m.group(3).strip()) for m in self.NEWS_LINE.finditer(prompt)]
+
+        # 분할 분석의 후보 선정(map) 프롬프트면 후보 목록 형식으로 응답
+        if '"candidates"' in prompt:
+            limit = re.search(r"최대 (\d+)개", prompt)
+            picked = self._pick(items, int(limit.group(1)) if limit else 3)
+            data = {"candidates": [{"id": news_id, "reason": f"[stub] {title}"} for news_id, title in picked]}
+            return json.dumps(data, ensure_ascii=False)
+
+        # 여러 프로필이 백엔드 하나를 공유하므로 부서는 프롬프트(프로필의 insight_label)에서 읽음
+        label = self.INSIGHT_LABEL.search(prompt)
+        label = label.group(1) if label else " ".join(filter(None, [self.team, "대응 방안"]))
+        cards = [
+            {
+                "id": news_id,
+                "summary": f"[stub] {title}",
+                "insight": f"[stub] {label} 검토 필요.",
+                "risk_level": self.RISK_LEVELS[min(rank, len(self.RISK_LEVELS) - 1)],
+            }
+            for rank, (news_id, title) in enumerate(self._pick(items, self.max_cards))
+        ]
+        data = {
+            "weather_summary": f"🌤️ [stub] {len(items)}건의 뉴스 중 {len(cards)}건을 선정했습니다.",
+            "selected_cards": cards,
+        }
+        return json.dumps(data, ensure_ascii=False)
+
+    @staticmethod
+    def _pick(items, limit):
+        """카테고리마다 첫 기사를 먼저 고르고, 모자라면 나머지를 목록 순서대로 채움."""
+        picked, seen_categories = [], set()
+        for news_id, category, title in items:
+            if category not in seen_categories:
+                seen_categories.add(category)
+                picked.append((news_id, title))
+        for news_id, _, title in items:
+            if len(picked) >= limit:
+                break
+            if all(news_id != pid for pid, _ in picked):
+                picked.append((news_id, title))
+        return picked[:limit]
+
+
+class LLMCache:
+    def __init__(self, cache_dir, ttl_hours=24, max_entries=200):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model_name, prompt, safety_settings=None):
+        payload = json.dumps([model_name, prompt, safety_settings], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def get(self, key):
+        """저장된 응답 원문 반환. 없거나 만료되었으면 None."""
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) < self.ttl_seconds:
+                with open(path, encoding="utf-8") as f:
+                    text = json.load(f)["text"]
+                self.hits += 1
+                return text
+        except (OSError, ValueError, KeyError):
+            pass
+        self.misses += 1
+        return None
+
+    def put(self, key, text, model_name=""):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self._path(key) + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"model": model_name, "created_at": time.time(), "text": text}, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+            self._evict()
+        except Exception as e:
+            print(f"⚠️ LLM 캐시 저장 실패: {e}")
+
+    def _evict(self):
+        """만료된 항목 삭제 후, 최대 개수를 넘으면 오래된 것부터 삭제."""
+        entries = []
+        now = time.time()
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                mtime = os.path.getmtime(path)
+                if now - mtime >= self.ttl_seconds:
+                    os.remove(path)
+                else:
+                    entries.append((mtime, path))
+            except OSError:
+                continue  # 동시 요청(분할 분석)이 먼저 지운 경우
+        entries.sort(reverse=True)
+        for _, path in entries[self.max_entries:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def create_backend(name, api_key=None, model_name="gemini-2.5-flash", team=None):
+    """
+    이름으로 백엔드 생성 ("gemini" 또는 "stub"). 스텁 응답 지연은 STUB_LLM_LATENCY(초)로 지정.
+    team: 스텁 응답의 기본 부서명 (프롬프트에서 프로필 문구를 찾지 못할 때)
+    """
+    if name == "stub":
+        return StubBackend(latency=float(os.environ.get("STUB_LLM_LATENCY", "0")), team=team)
+    if name == "gemini":
+        return GeminiBackend(api_key, model_name)
+    raise ValueError(f"알 수 없는 LLM 백엔드: {name}")
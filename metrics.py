@@ -0,0 +1,126 @@
+"""
+실행 단위 계측 (단계별 소요 시간, 필터 탈락 사유, 네트워크 호출).
+
+- span(stage, keyword): 단계별 / 키워드별 경과 시간 누적 (횟수, 합계, 최대)
+- reject(rule, keyword): 규칙별 / 키워드별 탈락 건수
+- count_network(kind, calls, nbytes): RSS / 리다이렉트 / LLM / SMTP 호출 수와 전송량
+- add_section(name, data): 각 구성 요소의 stats() 결과를 그대로 첨부
+- write(path): 실행마다 JSON 파일 하나로 저장 (실행 간 비교, 대시보드 적재용)
+
+스레드 풀(RSS 동시 수집, 리다이렉트 해석, 분할 분석)에서 동시에 기록해도 안전합니다.
+"""
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+
+class RunMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.spans = {}                               # stage → {count, total_seconds, max_seconds}
+        self.keyword_spans = defaultdict(dict)        # keyword → stage → {count, total_seconds, max_seconds}
+        self.rejections = Counter()                   # rule → 건수
+        self.keyword_rejections = defaultdict(Counter)  # keyword → rule → 건수
+        self.network = {}                             # kind → {calls, bytes}
+        self.counters = Counter()
+        self.sections = {}
+
+    @staticmethod
+    def _add_span(table, stage, seconds):
+        span = table.setdefault(stage, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+        span["count"] += 1
+        span["total_seconds"] += seconds
+        span["max_seconds"] = max(span["max_seconds"], seconds)
+
+    def record_span(self, stage, seconds, keyword=None):
+        with self._lock:
+            self._add_span(self.spans, stage, seconds)
+            if keyword is not None:
+                self._add_span(self.keyword_spans[keyword], stage, seconds)
+
+    @contextmanager
+    def span(self, stage, keyword=None):
+        """with 블록의 경과 시간을 stage(및 keyword)에 누적. 예외가 나도 기록."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_span(stage, time.perf_counter() - started, keyword)
+
+    def reject(self, rule, keyword=None):
+        with self._lock:
+            self.rejections[rule] += 1
+            if keyword is not None:
+                self.keyword_rejections[keyword][rule] += 1
+
+    def count_network(self, kind, calls=1, nbytes=0):
+        with self._lock:
+            entry = self.network.setdefault(kind, {"calls": 0, "bytes": 0})
+            entry["calls"] += calls
+            entry["bytes"] += nbytes
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def add_section(self, name, data):
+        with self._lock:
+            self.sections[name] = data
+
+    @staticmethod
+    def _round_spans(table):
+        return {
+            stage: {
+                "count": span["count"],
+                "total_seconds": round(span["total_seconds"], 4),
+                "max_seconds": round(span["max_seconds"], 4),
+            }
+            for stage, span in table.items()
+        }
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "started_at": datetime.fromtimestamp(self.started_at, tz=timezone.utc).isoformat(),
+                "wall_seconds": round(time.time() - self.started_at, 3),
+                "spans": self._round_spans(self.spans),
+                "keywords": {
+                    keyword: {
+                        "spans": self._round_spans(self.keyword_spans.get(keyword, {})),
+                        "rejections": dict(self.keyword_rejections.get(keyword, {})),
+                    }
+                    for keyword in sorted(set(self.keyword_spans) | set(self.keyword_rejections))
+                },
+                "rejections": dict(self.rejections.most_common()),
+                "network": {kind: dict(entry) for kind, entry in self.network.items()},
+                "counters": dict(self.counters),
+                "sections": dict(self.sections),
+            }
+
+    def write(self, path, keep=60):
+        """메트릭 JSON 저장. 같은 디렉터리의 오래된 실행 기록은 최근 keep개만 남김."""
+        try:
+            directory = os.path.dirname(path) or "."
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, path)
+            runs = sorted(name for name in os.listdir(directory) if name.startswith("run-") and name.endswith(".json"))
+            for name in runs[:-keep] if keep else []:
+                os.remove(os.path.join(directory, name))
+            print(f"📊 실행 메트릭 저장: {path}")
+        except Exception as e:
+            print(f"⚠️ 메트릭 저장 실패: {e}")
+
+    def print_summary(self):
+        """단계별 소요 시간 요약 한 줄."""
+        with self._lock:
+            parts = [f"{stage} {span['total_seconds']:.2f}s" for stage, span in self.spans.items()]
+        if parts:
+            print(f"⏱️ 단계별 소요 시간: {', '.join(parts)}")
@@ -1,19 +1,39 @@
 import os
-import smtplib
-import feedparser
 import time
 import urllib.parse
 import json
-import random
 import difflib 
 import re 
-import html  # [수정 1] HTML escape를 위해 추가
-import requests  # [수정 10] 도메인 차단을 위한 리다이렉트 추적
+import argparse
+import threading
+from collections import Counter
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
-import google.generativeai as genai
+from domain_resolver import DomainResolver
+from feed_cache import FeedCache
+from article_store import ArticleStore, VERDICT_ACCEPTED, canonical_link
+from llm_backend import LLMCache, create_backend, is_transient_error as is_transient_llm_error
+from json_stream import AnalysisStreamParser
+from report_renderer import render_exec_summary, render_report
+from delivery import DeliveryLog, DeliveryScheduler
+from metrics import RunMetrics
+from trend_index import TrendIndex
+from output_sinks import FileArchiveSink, FunctionSink, ReportContext, WebhookSink, dispatch as dispatch_sinks
+from deadline import BreakerBoard, RunBudget, call_with_retry, parse_stage_shares
+from dedup_index import TitleIndex
+from article_collection import ArticleCollection
+from query_planner import PlannedFeed, plan_queries
+from profiles import DEFAULT_PROFILE_NAME, Profile, filter_signature, load_profiles, parse_receivers
+from pipeline import Candidate, KeywordContext, annotate, lookahead, reject_by, reject_if, window
+from pipeline import run as run_pipeline
+from filter_engine import (
+    FilterEngine, Verdict, RULE_SPAM, RULE_VIDEO, RULE_OVERSEAS, RULE_COMPANY,
+    RULE_STALE, RULE_DUP_LINK, RULE_DUP_TOPIC, RULE_BLOCKED_DOMAIN,
+)
 
 # --- 환경 변수 ---
 GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY")
@@ -41,6 +61,15 @@ CATEGORY_MAP = {
 
 KEYWORDS = [k for category in CATEGORY_MAP.values() for k in category]
 
+# --- [수정 26] 부서별 프로필 (profiles.py) ---
+# 아래 부서명/프롬프트 문구와 이 파일의 카테고리/필터 목록이 기본 프로필이며,
+# PROFILES_FILE(또는 --profiles)을 지정하면 파일의 프로필마다 다른 범위의 브리핑을 한 번의 실행으로 발송
+REPORT_TEAM = "구매계약실"
+PROMPT_PERSONA = "포스코이앤씨 구매계약실의 수석 애널리스트"
+PROMPT_FOCUS = "구매 업무"
+PROMPT_INSIGHT_LABEL = "구매계약실 대응 방안"
+PROFILES_FILE = os.environ.get("PROFILES_FILE", "")
+
 EXCLUDE_KEYWORDS = [
     "특징주", "테마주", "관련주", "주가", "급등", "급락", "상한가", "하한가",
     "거래량", "매수", "매도", "목표가", "체결", "증시", "종목", "투자자",
@@ -77,30 +106,142 @@ BLOCKED_DOMAINS = [
     "cafef.vn",
 ]
 
+# --- [수정 11] RSS 동시 수집 설정 ---
+# 키워드별 RSS 요청은 동시에 보내고, 결과 처리(필터/중복 제거/ID 부여)는 KEYWORDS 순서대로 진행
+# → 순차 실행과 완전히 동일한 결과를 보장하면서 전체 대기 시간은 가장 느린 요청 수준으로 단축
+FETCH_MAX_WORKERS = int(os.environ.get("FETCH_MAX_WORKERS", "8"))       # 동시에 진행할 최대 요청 수 (1이면 한 번에 하나씩)
+FETCH_PER_HOST_LIMIT = int(os.environ.get("FETCH_PER_HOST_LIMIT", "4"))  # 같은 호스트(news.google.com)에 대한 동시 연결 상한
+
+_host_semaphores = {}
+_host_semaphores_lock = threading.Lock()
+
+def _get_host_semaphore(url):
+    """호스트별 동시 연결 수를 제한하는 세마포어 반환 (호스트당 하나씩 생성)."""
+    host = urllib.parse.urlparse(url).netloc.lower()
+    with _host_semaphores_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(max(1, FETCH_PER_HOST_LIMIT))
+        return _host_semaphores[host]
+
+# Google News RSS 주소 (벤치마크/로컬 시험에서는 로컬 HTTP 서버로 지정)
+GOOGLE_NEWS_BASE_URL = os.environ.get("GOOGLE_NEWS_BASE_URL", "https://news.google.com").rstrip("/")
+
+NEGATIVE_QUERY = " -주식 -종목 -테마 -특징주"
+
+# --- [수정 27] 검색어 묶음 요청 (query_planner.py) ---
+# QUERY_BATCH_SIZE가 2 이상이면 검색어 여러 개를 "(A) OR (B)" 쿼리 하나로 묶어 요청하고,
+# 결과 기사는 제목으로 원래 검색어에 배정하여 검색어별로 기존과 같이 처리 (기본 1: 검색어마다 요청)
+QUERY_BATCH_SIZE = int(os.environ.get("QUERY_BATCH_SIZE", "1"))
+QUERY_MAX_URL_LENGTH = int(os.environ.get("QUERY_MAX_URL_LENGTH", "2000"))
+QUERY_MAX_WORDS = int(os.environ.get("QUERY_MAX_WORDS", "32"))  # Google 검색어 단어 수 상한
+
+def build_feed_url(keyword, time_window_days=1):
+    """키워드에 대한 Google News RSS 검색 URL 생성."""
+    negative_query = NEGATIVE_QUERY
+    # 월요일이면 when:3d, 평일이면 when:1d로 구글 뉴스 검색 인자 변경
+    # URL 띄어쓰기 에러를 방지하기 위해 urllib.parse.quote 사용
+    encoded_query = urllib.parse.quote(f"{keyword}{negative_query} when:{time_window_days}d")
+    return f"{GOOGLE_NEWS_BASE_URL}/rss/search?q={encoded_query}&hl=ko&gl=KR&ceid=KR:ko"
+
+def fetch_feed(url, keyword=None):
+    """호스트별 연결 상한을 지키며 RSS 피드 하나를 받아 파싱 (feed_cache: 조건부 GET / 오프라인 재생)."""
+    with _get_host_semaphore(url), metrics.span("rss_fetch", keyword):
+        return feed_cache.fetch(url, deadline=run_budget.deadline("rss"))
+
+# --- [수정 12] 리다이렉트 해석 캐시 설정 ---
+# 실행 간 유지되는 캐시 디렉터리 (GitHub Actions에서는 actions/cache로 보존)
+CACHE_DIR = os.environ.get("NEWS_CACHE_DIR", ".news_cache")
+REDIRECT_CACHE_TTL_DAYS = int(os.environ.get("REDIRECT_CACHE_TTL_DAYS", "30"))
+REDIRECT_CACHE_MAX_ENTRIES = int(os.environ.get("REDIRECT_CACHE_MAX_ENTRIES", "20000"))
+REDIRECT_MAX_WORKERS = int(os.environ.get("REDIRECT_MAX_WORKERS", "8"))
+
+# --- [수정 22] 실행 메트릭 ---
+# 단계별/키워드별 소요 시간, 규칙별/키워드별 탈락 건수, 네트워크 호출 수와 전송량을 실행마다 JSON으로 저장
+METRICS_DIR = os.environ.get("METRICS_DIR", os.path.join(CACHE_DIR, "metrics"))
+METRICS_KEEP_RUNS = int(os.environ.get("METRICS_KEEP_RUNS", "60"))
+
+metrics = RunMetrics()
+
+# --- [수정 30] 실행 시간 예산 / 재시도 / 회로 차단기 (deadline.py) ---
+# 실행 전체 예산(RUN_BUDGET_SECONDS)을 단계별 비율(RUN_BUDGET_SHARES)로 나눠 RSS/리다이렉트/LLM/SMTP 요청의
+# timeout을 단계 마감까지 남은 시간 이내로 제한하고, 마감이 지나면 요청 대신 대체 경로 사용
+# (RSS: 캐시된 피드, 리다이렉트: RSS의 매체 주소로 판정, LLM: 헤드라인만 담은 보고서 발송)
+# 같은 호스트에 연속 BREAKER_FAILURE_THRESHOLD번 실패(시간 초과/연결 오류)하면 BREAKER_RESET_SECONDS 동안 요청 중단
+RUN_BUDGET_SECONDS = float(os.environ.get("RUN_BUDGET_SECONDS", "900"))  # 0이면 제한 없음
+RUN_BUDGET_SHARES = parse_stage_shares(os.environ.get("RUN_BUDGET_SHARES", "rss=0.25,redirect=0.2,llm=0.4,smtp=0.15"))
+RETRY_ATTEMPTS = int(os.environ.get("RETRY_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = float(os.environ.get("RETRY_BASE_DELAY", "1"))
+RETRY_MAX_DELAY = float(os.environ.get("RETRY_MAX_DELAY", "10"))
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_SECONDS = float(os.environ.get("BREAKER_RESET_SECONDS", "60"))
+LLM_TIMEOUT = float(os.environ.get("LLM_TIMEOUT", "120"))
+DEGRADED_REPORT = os.environ.get("DEGRADED_REPORT", "1") == "1"  # AI 분석 실패 시 헤드라인만이라도 발송
+
+run_budget = RunBudget(RUN_BUDGET_SECONDS, RUN_BUDGET_SHARES)
+redirect_breakers = BreakerBoard(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS)
+feed_breakers = BreakerBoard(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS)
+
+domain_resolver = DomainResolver(
+    cache_path=os.path.join(CACHE_DIR, "redirect_domains.json"),
+    ttl_days=REDIRECT_CACHE_TTL_DAYS,
+    max_entries=REDIRECT_CACHE_MAX_ENTRIES,
+    max_workers=REDIRECT_MAX_WORKERS,
+    timeout=3,
+    breakers=redirect_breakers,
+    deadline=lambda: run_budget.deadline("redirect"),
+)
+
+# --- [수정 15] RSS 피드 캐시 설정 ---
+# 검색 URL별로 원본 피드와 ETag/Last-Modified를 저장하고 조건부 GET으로 재요청 (304면 캐시 파싱)
+# --offline 실행 시 네트워크 없이 캐시된 피드만으로 전체 파이프라인을 재현
+FEED_TIMEOUT = int(os.environ.get("FEED_TIMEOUT", "10"))
+
+feed_cache = FeedCache(
+    cache_dir=os.path.join(CACHE_DIR, "feeds"),
+    timeout=FEED_TIMEOUT,
+    pool_size=max(1, FETCH_MAX_WORKERS),
+    breakers=feed_breakers,
+    retry_attempts=RETRY_ATTEMPTS,
+    retry_base_delay=RETRY_BASE_DELAY,
+    retry_max_delay=RETRY_MAX_DELAY,
+)
+
 def get_real_domain(google_redirect_url):
-    """Google News 리다이렉트 URL을 따라가 실제 도메인 반환. 실패 시 빈 문자열."""
-    try:
-        res = requests.head(google_redirect_url, allow_redirects=True, timeout=3)
-        from urllib.parse import urlparse
-        return urlparse(res.url).netloc.lower()
-    except Exception:
-        return ""
+    """Google News 리다이렉트 URL을 따라가 실제 도메인 반환. 실패 시 빈 문자열. (세션 재사용 + 디스크 캐시)"""
+    return domain_resolver.resolve(google_redirect_url)
+
+def get_entry_source(entry):
+    """RSS 항목의 매체명(source.title). 없으면 빈 문자열."""
+    return getattr(getattr(entry, 'source', None), 'title', '') or ''
 
-def is_blocked_domain(entry):
+def get_entry_source_domain(entry):
+    """[수정 30] RSS 항목의 매체 주소(source url) 도메인. 리다이렉트를 해석하지 못했을 때 차단 판정에 사용."""
+    href = getattr(getattr(entry, 'source', None), 'href', '') or ''
+    return urllib.parse.urlparse(href).netloc.lower()
+
+def is_blocked_domain(entry, verdict=None, blocked_domains=None):
     """
     실제 기사 도메인이 BLOCKED_DOMAINS에 포함되는지 확인.
     - 한국 건설사가 제목에 있으면 차단 대상 도메인이더라도 통과
     - 리다이렉트 실패 시 차단하지 않음 (안전한 방향으로 통과)
+    verdict: 이미 filter_engine.scan()으로 얻은 판정이 있으면 재사용
+    blocked_domains: 프로필별 차단 도메인 목록 (기본값 BLOCKED_DOMAINS)
     """
+    if verdict is None:
+        verdict = filter_engine.scan(entry.title, get_entry_source(entry))
+
     # 한국 건설사 포함 시 무조건 통과
-    if any(company in entry.title for company in KOREAN_COMPANIES):
+    if verdict.company:
         return False
 
-    domain = get_real_domain(entry.link)
+    # [수정 30] 리다이렉트 해석 실패(마감 초과/회로 차단 포함) 시 RSS의 매체 주소로 판정, 그것도 없으면 통과
+    domain = get_real_domain(entry.link) or get_entry_source_domain(entry)
     if not domain:
         return False  # 도메인 확인 실패 시 통과 (차단하지 않음)
 
-    return any(blocked in domain for blocked in BLOCKED_DOMAINS)
+    if blocked_domains is None:
+        blocked_domains = BLOCKED_DOMAINS
+    return any(blocked in domain for blocked in blocked_domains)
 
 def is_overseas_local_news(entry):
     """
@@ -109,19 +250,9 @@ def is_overseas_local_news(entry):
     - 확인된 해외 현지 매체명이 제목 또는 source에 있으면 차단 (True)
     - 그 외는 통과 (False)
     """
-    title = entry.title
-    source = getattr(getattr(entry, 'source', None), 'title', '') or ''
-
-    # 한국 건설사가 주어면 어느 나라 뉴스든 통과
-    if any(company in title for company in KOREAN_COMPANIES):
-        return False
-
-    # 확인된 해외 현지 매체 → 차단
-    combined = title + source
-    if any(src.lower() in combined.lower() for src in OVERSEAS_LOCAL_SOURCES):
-        return True
-
-    return False
+    # 한국 건설사가 주어면 어느 나라 뉴스든 통과, 확인된 해외 현지 매체 → 차단 (filter_engine에서 한 번에 판정)
+    found = filter_engine.find_terms(entry.title, get_entry_source(entry))
+    return RULE_OVERSEAS in found and RULE_COMPANY not in found
 
 def get_korea_time():
     utc_now = datetime.now(timezone.utc)
@@ -129,9 +260,7 @@ def get_korea_time():
     return kst_now
 
 def is_spam_news(title):
-    for bad_word in EXCLUDE_KEYWORDS:
-        if bad_word in title: return True
-    return False
+    return RULE_SPAM in filter_engine.find_terms(title)
 
 # [수정 8] 영상/사진 콘텐츠 필터: VOD·포토 기사는 날짜 재색인 오류의 주원인이므로 제외
 VIDEO_KEYWORDS = [
@@ -141,33 +270,75 @@ VIDEO_KEYWORDS = [
 
 def is_video_content(title):
     """영상/VOD 콘텐츠 여부 판단. 제목에 영상 관련 태그가 포함된 경우 차단."""
-    return any(kw in title for kw in VIDEO_KEYWORDS)
+    return RULE_VIDEO in filter_engine.find_terms(title)
 
-def is_recent(entry, time_window_hours=24):
-    """
-    time_window_hours: 평일은 24시간, 월요일은 72시간(주말 포함)으로 유동적으로 작동합니다.
-    """
+# [수정 14] 스팸/영상/해외 매체/건설사 목록을 하나의 정규식으로 컴파일한 필터 엔진
+# 제목+source를 한 번만 훑어 어떤 규칙에 걸렸는지(Verdict) 반환하고 규칙별 탈락 건수를 집계
+filter_engine = FilterEngine(EXCLUDE_KEYWORDS, VIDEO_KEYWORDS, KOREAN_COMPANIES, OVERSEAS_LOCAL_SOURCES)
+
+def get_published_datetime(entry):
+    """피드 항목의 발행 시각을 UTC datetime으로 (없거나 해석 불가면 None)."""
     try:
-        published_dt = None
         if hasattr(entry, 'published_parsed') and entry.published_parsed:
-            published_dt = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
-        elif hasattr(entry, 'published') and entry.published:
+            return datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
+        if hasattr(entry, 'published') and entry.published:
             published_dt = parsedate_to_datetime(entry.published)
             if published_dt.tzinfo:
-                published_dt = published_dt.astimezone(timezone.utc)
-            else:
-                published_dt = published_dt.replace(tzinfo=timezone.utc)
-        
-        if not published_dt: return False
+                return published_dt.astimezone(timezone.utc)
+            return published_dt.replace(tzinfo=timezone.utc)
+    except Exception:
+        pass
+    return None
+
+def is_recent_datetime(published_dt, time_window_hours=24, now_utc=None):
+    """[수정 25] 이미 파싱한 발행 시각으로 기간 판정 (기사당 한 번만 파싱)."""
+    if not published_dt: return False
 
+    if now_utc is None:
         now_utc = datetime.now(timezone.utc)
-        if published_dt > now_utc + timedelta(minutes=10): return False
+    if published_dt > now_utc + timedelta(minutes=10): return False
 
-        # 동적으로 설정된 시간(24h or 72h) 기준으로 컷오프
-        cutoff_time = now_utc - timedelta(hours=time_window_hours)
-        return published_dt > cutoff_time
-    except Exception:
-        return False
+    # 동적으로 설정된 시간(24h or 72h) 기준으로 컷오프
+    cutoff_time = now_utc - timedelta(hours=time_window_hours)
+    return published_dt > cutoff_time
+
+def is_recent(entry, time_window_hours=24, now_utc=None):
+    """
+    time_window_hours: 평일은 24시간, 월요일은 72시간(주말 포함)으로 유동적으로 작동합니다.
+    now_utc: 기준 시각 (오프라인 재실행 시 피드 수집 당시 시각, 기본값은 현재 시각)
+    """
+    return is_recent_datetime(get_published_datetime(entry), time_window_hours, now_utc)
+
+# --- [수정 16] 실행 간 기사 저장소 (SQLite) ---
+# 이미 보고된 기사와 이미 차단 판정을 받은 기사는 비싼 검사 전에 건너뛰어 매 실행을 증분 수집으로 처리
+ARTICLE_STORE_ENABLED = os.environ.get("ARTICLE_STORE_ENABLED", "1") == "1"
+ARTICLE_STORE_RETENTION_DAYS = int(os.environ.get("ARTICLE_STORE_RETENTION_DAYS", "30"))
+
+article_store = ArticleStore(
+    path=os.path.join(CACHE_DIR, "articles.db"),
+    retention_days=ARTICLE_STORE_RETENTION_DAYS,
+) if ARTICLE_STORE_ENABLED else None
+
+# 필터 목록 서명: 목록이 바뀌면 저장된 차단 판정을 재사용하지 않고 다시 판정
+FILTER_SIGNATURE = filter_signature(
+    EXCLUDE_KEYWORDS, VIDEO_KEYWORDS, KOREAN_COMPANIES, OVERSEAS_LOCAL_SOURCES, BLOCKED_DOMAINS)
+
+# 기간/중복 판정은 실행 시점과 수집 순서에 따라 달라지므로 저장하지 않음
+PERSISTED_VERDICTS = {RULE_SPAM, RULE_VIDEO, RULE_OVERSEAS, RULE_BLOCKED_DOMAIN, VERDICT_ACCEPTED}
+
+def remember_verdict(entry, verdict, profile=None):
+    """기사 판정 결과를 저장소에 기록 (저장 대상 판정만). profile이 있으면 프로필별 저장소에 기록."""
+    store = article_store if profile is None else profile.article_store
+    if store is None or verdict not in PERSISTED_VERDICTS:
+        return
+    signature = FILTER_SIGNATURE if profile is None else profile.filter_signature
+    store.record(entry.link, entry.title, verdict, signature,
+                 domain=domain_resolver.cached_domain(entry.link))
+
+def record_rejection(rule, keyword, profile=None):
+    """탈락 사유 집계 (필터 요약 출력용 + 키워드별 메트릭)."""
+    (filter_engine if profile is None else profile.filter_engine).record(rule)
+    metrics.reject(rule, keyword)
 
 def get_category(keyword):
     for cat, keywords in CATEGORY_MAP.items():
@@ -175,27 +346,181 @@ def get_category(keyword):
             return cat
     return "기타"
 
+def default_profile():
+    """이 파일의 설정(CATEGORY_MAP, 필터 목록, EMAIL_RECEIVERS 등)으로 만든 기본 프로필."""
+    return Profile(
+        DEFAULT_PROFILE_NAME,
+        team=REPORT_TEAM,
+        persona=PROMPT_PERSONA,
+        focus=PROMPT_FOCUS,
+        insight_label=PROMPT_INSIGHT_LABEL,
+        category_map=CATEGORY_MAP,
+        exclude_keywords=EXCLUDE_KEYWORDS,
+        video_keywords=VIDEO_KEYWORDS,
+        korean_companies=KOREAN_COMPANIES,
+        overseas_sources=OVERSEAS_LOCAL_SOURCES,
+        blocked_domains=BLOCKED_DOMAINS,
+        # [수정 4] 빈 문자열 수신자 필터링: 환경변수 끝 쉼표 등으로 인한 SMTP 오류 방지
+        receivers=parse_receivers(EMAIL_RECEIVERS),
+        keywords=KEYWORDS,
+        filter_engine=filter_engine,
+        article_store=article_store,
+    )
+
+def load_run_profiles(path):
+    """
+    프로필 파일의 프로필 목록. 생략한 설정은 기본 프로필을 상속하고,
+    보고 이력은 프로필마다 따로 저장 (articles-<name>.db, 이름이 default면 기존 articles.db).
+    """
+    base = default_profile()
+    profiles = load_profiles(path, base)
+    for profile in profiles:
+        if article_store is None:
+            profile.article_store = None  # 저장소 비활성화 또는 오프라인 재실행
+        elif profile.is_default:
+            profile.article_store = article_store
+        else:
+            # 파일명에 쓸 수 없는 글자(/, \ 등)는 _로 바꿔 CACHE_DIR 밖을 가리키지 않도록 (FileArchiveSink와 같은 규칙)
+            safe_name = re.sub(r"[^\w.-]+", "_", profile.name)
+            profile.article_store = ArticleStore(
+                path=os.path.join(CACHE_DIR, f"articles-{safe_name}.db"),
+                retention_days=ARTICLE_STORE_RETENTION_DAYS,
+            )
+    return profiles
+
 def is_duplicate_topic(new_title, existing_items):
+    """전수 비교 기준 구현. fetch_news는 동일한 판정을 내리는 TitleIndex(dedup_index.py)를 사용."""
     for item in existing_items:
-        similarity = difflib.SequenceMatcher(None, new_title, item['title']).ratio()
+        similarity = difflib.SequenceMatcher(None, new_title, item.title).ratio()
         # [수정 3] 임계값 0.5 → 0.7: 0.5는 너무 낮아 서로 다른 기사도 중복 처리될 수 있음
         if similarity > 0.7: 
             return True
     return False
 
-def fetch_news(time_window_days=1, time_window_hours=24):
-    news_items = []
-    print(f"🔍 뉴스 수집 시작... (검색 기간: 최근 {time_window_hours}시간)")
-    
-    for keyword in KEYWORDS:
-        negative_query = " -주식 -종목 -테마 -특징주"
-        # 월요일이면 when:3d, 평일이면 when:1d로 구글 뉴스 검색 인자 변경
-        # URL 띄어쓰기 에러를 방지하기 위해 urllib.parse.quote 사용
-        encoded_query = urllib.parse.quote(f"{keyword}{negative_query} when:{time_window_days}d")
-        url = f"https://news.google.com/rss/search?q={encoded_query}&hl=ko&gl=KR&ceid=KR:ko"
-        
+def prefetch_real_domains(ctx, batch):
+    """
+    [수정 12] 후보 기사 리다이렉트를 한 번에 동시 해석하여 캐시에 적재.
+    - 저렴한 필터(기간/스팸/영상/해외 매체)를 통과하고 한국 건설사가 없으며 아직 수집되지 않은 링크만 대상
+    - 이후 is_blocked_domain은 캐시에서 즉시 결과를 얻음 (판정 결과는 기존과 동일)
+    """
+    articles = ctx.options['articles']
+    links = [c.entry.link for c in batch if not c.verdict.company and not articles.has_link(c.entry.link)]
+    if links:
+        with metrics.span("redirect_resolve", ctx.keyword):
+            domain_resolver.resolve_many(links)
+
+# --- [수정 24] 키워드별 수집 파이프라인 (pipeline.py) ---
+# 저렴한 검사 → 리다이렉트 일괄 해석 → 상태가 필요한 검사(링크/주제 중복) → 네트워크 검사 순으로 지연 평가하고,
+# 키워드당 10건이 채워지면 나머지 기사는 어떤 검사도 거치지 않음
+def skip_known_article(ctx, candidate):
+    """[수정 16] 이미 보고되었거나 같은 필터 목록으로 차단된 기사는 모든 검사 전에 제외."""
+    profile = ctx.options['profile']
+    if profile.article_store is None:
+        return None
+    reason = profile.article_store.should_skip(candidate.entry.link, candidate.entry.title, profile.filter_signature)
+    if reason:
+        return "already_reported" if reason == "already_reported" else "known_rejected"
+    return None
+
+def scan_filters(ctx, candidate):
+    """[수정 14] 스팸/영상/해외 매체/건설사 판정은 기사당 한 번의 스캔으로 처리."""
+    return ctx.options['profile'].filter_engine.scan(candidate.entry.title, get_entry_source(candidate.entry))
+
+def filter_rule(ctx, candidate):
+    """[수정 6][수정 8] 스팸/영상/해외 현지 로컬 뉴스 차단."""
+    return candidate.verdict.rule
+
+def is_duplicate_link(ctx, candidate):
+    """[수정 25] 정규화한 링크 해시 색인으로 판정 (추적용 쿼리 인자만 다른 같은 기사도 중복 처리)."""
+    return ctx.options['articles'].has_link(candidate.entry.link)
+
+def is_duplicate_title(ctx, candidate):
+    with metrics.span("dedup", ctx.keyword):
+        return ctx.options['title_index'].is_duplicate(candidate.entry.title)
+
+def is_blocked_candidate(ctx, candidate):
+    """[수정 10] 실제 도메인 확인 후 차단 (리다이렉트 추적)."""
+    with metrics.span("redirect_resolve", ctx.keyword):
+        return is_blocked_domain(candidate.entry, candidate.verdict, ctx.options['profile'].blocked_domains)
+
+# [수정 33] 기사 하나만 보고 판정하는 단계(ENTRY_STAGES)와 앞선 검색어의 수집 결과가 필요한 단계를 나눠 두고
+# 샤드 수집은 앞쪽만, 병합은 뒤쪽만 적용 (순차 수집과 같은 결과).
+# 리다이렉트 해석(HEAD 요청)은 중복 제거/건수 제한을 거치며 필요한 만큼만 하도록 뒤쪽에 둠
+ENTRY_STAGES = [
+    reject_by(skip_known_article),
+    annotate("verdict", scan_filters),
+    annotate("published", lambda ctx, c: get_published_datetime(c.entry)),
+    reject_if(RULE_STALE, lambda ctx, c: not is_recent_datetime(c.published, ctx.options['time_window_hours'], ctx.options['now_utc'])),
+    reject_by(filter_rule),
+]
+CROSS_KEYWORD_STAGES = [
+    lookahead(lambda ctx: ctx.remaining, prefetch_real_domains),
+    reject_if(RULE_DUP_LINK, is_duplicate_link),
+    reject_if(RULE_DUP_TOPIC, is_duplicate_title),
+    reject_if(RULE_BLOCKED_DOMAIN, is_blocked_candidate),
+]
+
+COLLECT_STAGES = ENTRY_STAGES + CROSS_KEYWORD_STAGES
+
+def on_candidate_rejected(rule, candidate, ctx):
+    profile = ctx.options['profile']
+    record_rejection(rule, ctx.keyword, profile)
+    remember_verdict(candidate.entry, rule, profile)  # 저장 대상 판정(스팸/영상/해외 매체/차단 도메인)만 기록됨
+
+def submit_feeds(pool, keywords, time_window_days=1):
+    """
+    [수정 11] 검색어별 RSS 요청을 스레드 풀에 제출하고 {검색어: future} 반환.
+    [수정 26] 같은 검색어는 한 번만 요청 (여러 프로필이 같은 검색어를 쓰면 결과를 공유).
+    [수정 27] QUERY_BATCH_SIZE > 1이면 묶음 요청 결과를 검색어별로 나눠 주는 future 반환.
+    """
+    if QUERY_BATCH_SIZE > 1:
+        return submit_planned_feeds(pool, keywords, time_window_days)
+    futures = {}
+    for keyword in keywords:
+        if keyword not in futures:
+            futures[keyword] = pool.submit(fetch_feed, build_feed_url(keyword, time_window_days), keyword)
+    return futures
+
+query_match_stats = Counter()  # 묶음 결과 기사의 검색어 배정 방식별 건수 (full/partial/fallback)
+
+def submit_planned_feeds(pool, keywords, time_window_days=1):
+    keywords = list(dict.fromkeys(keywords))
+    query_match_stats.clear()
+    reserved_words = len(NEGATIVE_QUERY.split()) + 1  # 제외어 + when:Nd
+    groups = plan_queries(
+        keywords, QUERY_BATCH_SIZE,
+        build_url=lambda query: build_feed_url(query, time_window_days),
+        max_url_length=QUERY_MAX_URL_LENGTH, max_words=QUERY_MAX_WORDS, reserved_words=reserved_words,
+    )
+    print(f"🧮 검색어 묶음: 검색어 {len(keywords)}개 → 요청 {len(groups)}건 ({len(keywords) - len(groups)}건 절약)")
+    metrics.add_section("query_plan", {
+        "keywords": len(keywords), "requests": len(groups), "saved": len(keywords) - len(groups),
+        "batch_size": QUERY_BATCH_SIZE, "match": query_match_stats,
+    })
+    futures = {}
+    for group in groups:
+        label = group.keywords[0] if len(group.keywords) == 1 else f"{group.keywords[0]} 외 {len(group.keywords) - 1}개"
+        planned = PlannedFeed(group, pool.submit(fetch_feed, build_feed_url(group.query, time_window_days), label),
+                              query_match_stats)
+        for keyword in group.keywords:
+            futures[keyword] = planned.for_keyword(keyword)
+    return futures
+
+FEED_WINDOW = 30  # 검색어마다 피드 앞쪽 30건만 후보 (Google News 상위 기사)
+KEYWORD_LIMIT = 10  # 검색어당 최대 수집 건수
+
+def collect_articles(profile, feeds, time_window_hours=24):
+    """
+    프로필 하나의 기사 수집: 프로필 검색어 순서대로 피드 결과를 소비하며 파이프라인 적용.
+    리다이렉트 해석 결과는 domain_resolver 캐시를 공유하므로 다른 프로필이 이미 해석한 링크는 다시 요청하지 않음.
+    """
+    # [수정 25] 수집 결과는 ArticleCollection (링크 색인 + 카테고리 버킷 + ID 조회)
+    articles = ArticleCollection(profile.category_map.keys())
+    title_index = TitleIndex(threshold=0.7)  # [수정 13] 유사 제목 색인: 후보만 difflib 비교 (판정은 is_duplicate_topic과 동일)
+
+    for keyword in profile.keywords:
         try:
-            feed = feedparser.parse(url)
+            feed = feeds[keyword].result()
 
             # [수정 2] RSS 파싱 실패 시 로그 출력 후 다음 키워드로 진행
             if not feed.entries:
@@ -203,61 +528,244 @@ def fetch_news(time_window_days=1, time_window_hours=24):
                     print(f"⚠️ RSS 파싱 오류 [{keyword}]: {feed.bozo_exception}")
                 continue
 
-            valid_count = 0
-            for entry in feed.entries[:30]: 
-                if valid_count >= 10: break 
-
-                if is_recent(entry, time_window_hours):
-                    if is_spam_news(entry.title): continue
-                    if is_video_content(entry.title): continue          # [수정 8] 영상/VOD 콘텐츠 차단
-                    if is_overseas_local_news(entry): continue          # [수정 6] 해외 현지 로컬 뉴스 차단 (제목/source 기반)
-                    if any(item['link'] == entry.link for item in news_items): continue
-                    if is_duplicate_topic(entry.title, news_items): continue
-                    if is_blocked_domain(entry): continue               # [수정 10] 실제 도메인 확인 후 차단 (리다이렉트 추적)
-
-                    news_items.append({
-                        "id": len(news_items),
-                        "title": entry.title,
-                        "link": entry.link,
-                        "keyword": keyword,
-                        "category": get_category(keyword),
-                        "date": getattr(entry, 'published', '')  # published_parsed만 있는 경우 AttributeError 방어
-                    })
-                    valid_count += 1
+            ctx = KeywordContext(
+                keyword, limit=KEYWORD_LIMIT, on_reject=on_candidate_rejected,
+                time_window_hours=time_window_hours,
+                now_utc=feed.get('fetched_at'),  # [수정 15] 오프라인 재생이면 수집 당시 시각 기준으로 기간 필터
+                profile=profile,
+                articles=articles,
+                title_index=title_index,
+            )
+            accept_candidates(ctx, run_pipeline(ctx, window(feed.entries, FEED_WINDOW), COLLECT_STAGES))
         except Exception as e:
             print(f"⚠️ '{keyword}' 오류: {e}")
             continue
-            
-    print(f"✅ 총 {len(news_items)}개의 뉴스 수집 완료.")
-    return news_items
 
-def generate_analysis_data(news_items, is_monday=False):
-    if not news_items: return None
-    
+    finish_collection(profile, articles)
+    return articles
+
+def accept_candidates(ctx, candidates):
+    """파이프라인을 통과한 후보를 검색어당 ctx.limit건까지 수집 (순차 수집과 샤드 병합 공용)."""
+    profile, articles = ctx.options['profile'], ctx.options['articles']
+    for candidate in candidates:
+        entry = candidate.entry
+        articles.add(
+            entry.title, entry.link, ctx.keyword, profile.get_category(ctx.keyword),
+            date=getattr(entry, 'published', ''),  # published_parsed만 있는 경우 AttributeError 방어
+            published=candidate.published,
+        )
+        ctx.options['title_index'].add(entry.title)
+        remember_verdict(entry, VERDICT_ACCEPTED, profile)
+        ctx.accepted += 1
+        if ctx.accepted >= ctx.limit: break
+
+def finish_collection(profile, articles):
+    """프로필 수집 후 필터 현황 출력, 저장소 반영, 메트릭 기록."""
+    if not profile.is_default:
+        print(f"📂 [{profile.name}] 필터 현황")
+    profile.filter_engine.print_stats()
+    if profile.article_store is not None:
+        profile.article_store.flush()
+        profile.article_store.print_stats()
+        metrics.add_section(profile.scoped("article_store"), profile.article_store.stats())
+    metrics.count(profile.scoped("news_items"), len(articles))
+
+def report_fetch_stats():
+    """모든 프로필이 공유하는 RSS/리다이렉트 캐시 현황 출력 및 메트릭 기록."""
+    if query_match_stats:
+        print("🧮 묶음 결과 검색어 배정: " + ", ".join(f"{kind} {count}" for kind, count in query_match_stats.most_common()))
+    feed_cache.print_stats()
+    domain_resolver.save()
+    domain_resolver.print_stats()
+
+    feed_stats = feed_cache.stats()
+    redirect_stats = domain_resolver.stats()
+    metrics.count_network("rss", feed_stats["requests"], feed_stats["bytes_downloaded"])
+    metrics.count_network("redirect", redirect_stats["network_requests"])
+    metrics.add_section("feed_cache", feed_stats)
+    metrics.add_section("redirect", redirect_stats)
+    breakers = {"rss": feed_breakers.stats(), "redirect": redirect_breakers.stats()}
+    if any(breakers.values()):
+        print("🔌 회로 차단: " + ", ".join(
+            f"{kind} {host}({b['trips']}회, 요청 {b['rejected']}건 생략)"
+            for kind, hosts in breakers.items() for host, b in hosts.items()))
+    metrics.add_section("breakers", breakers)
+
+def fetch_news(time_window_days=1, time_window_hours=24, profile=None):
+    profile = profile or default_profile()
+    print(f"🔍 뉴스 수집 시작... (검색 기간: 최근 {time_window_hours}시간)")
+
+    # [수정 11] 요청은 스레드 풀에서 동시에 진행, 결과는 KEYWORDS 순서대로 소비
+    with ThreadPoolExecutor(max_workers=max(1, FETCH_MAX_WORKERS)) as pool:
+        feeds = submit_feeds(pool, profile.keywords, time_window_days)
+        articles = collect_articles(profile, feeds, time_window_hours)
+
+    report_fetch_stats()
+    print(f"✅ 총 {len(articles)}개의 뉴스 수집 완료.")
+    return articles
+
+# --- [수정 17] LLM 백엔드 및 응답 캐시 설정 ---
+# LLM_BACKEND=stub 이면 API 키 없이 결정적 로컬 스텁으로 분석 (테스트/벤치마크용)
+# 같은 (모델, 프롬프트, safety settings) 요청은 디스크 캐시에서 즉시 반환 (발송 실패 후 재실행 등)
+LLM_BACKEND = os.environ.get("LLM_BACKEND", "gemini")
+GEMINI_MODEL = os.environ.get("GEMINI_MODEL", "gemini-2.5-flash")
+LLM_CACHE_TTL_HOURS = int(os.environ.get("LLM_CACHE_TTL_HOURS", "24"))
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "200"))
+
+SAFETY_SETTINGS = [
+    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
+]
+
+llm_cache = LLMCache(
+    cache_dir=os.path.join(CACHE_DIR, "llm"),
+    ttl_hours=LLM_CACHE_TTL_HOURS,
+    max_entries=LLM_CACHE_MAX_ENTRIES,
+)
+_llm_backend = None
+
+def get_llm_backend():
+    """설정된 LLM 백엔드 (첫 호출 시 생성)."""
+    global _llm_backend
+    if _llm_backend is None:
+        _llm_backend = create_backend(LLM_BACKEND, api_key=GOOGLE_API_KEY, model_name=GEMINI_MODEL,
+                                      team=REPORT_TEAM)
+    return _llm_backend
+
+def _on_llm_retry(attempt, delay, error):
+    metrics.count("llm_retries")
+    print(f"⚠️ LLM 호출 실패, {delay:.1f}초 후 재시도 ({attempt}/{RETRY_ATTEMPTS - 1}): {error}")
+
+def call_llm(request):
+    """
+    [수정 30] request(timeout)을 LLM 단계 마감 안에서 호출. 일시적인 실패는 백오프 후 재시도,
+    마감이 지났으면 호출하지 않고 DeadlineExceeded.
+    """
+    return call_with_retry(
+        lambda: request(run_budget.timeout("llm", LLM_TIMEOUT)),
+        attempts=RETRY_ATTEMPTS,
+        base_delay=RETRY_BASE_DELAY,
+        max_delay=RETRY_MAX_DELAY,
+        deadline=run_budget.deadline("llm"),
+        retryable=is_transient_llm_error,
+        on_retry=_on_llm_retry,
+    )
+
+def generate_cached(prompt, parse):
+    """
+    캐시를 거쳐 LLM 응답을 받아 parse(text)로 해석한 결과 반환.
+    해석에 성공한 응답만 캐시에 저장 (깨진 응답이 재실행 때 재사용되지 않도록).
+    """
+    backend = get_llm_backend()
+    key = llm_cache.make_key(backend.model_name, prompt, SAFETY_SETTINGS)
+    cached_text = llm_cache.get(key)
+    if cached_text is not None:
+        print("⚡ LLM 캐시 적중: 동일한 프롬프트의 이전 응답을 재사용합니다.")
+        return parse(cached_text)
+
+    with metrics.span("llm_call"):
+        text = call_llm(lambda timeout: backend.generate(prompt, safety_settings=SAFETY_SETTINGS, timeout=timeout))
+    metrics.count_network("llm", 1, len(prompt.encode("utf-8")) + len(text.encode("utf-8")))
+    data = parse(text)
+    if data is not None:
+        llm_cache.put(key, text, backend.model_name)
+    return data
+
+# [수정 19] 스트리밍 응답 + 증분 JSON 파싱: weather_summary와 카드가 완성되는 즉시 꺼내 개별 검증,
+# 응답 뒤쪽이 깨지거나 스트림이 끊겨도 그때까지의 유효한 카드는 보존
+LLM_STREAMING = os.environ.get("LLM_STREAMING", "1") == "1"
+
+def clean_weather_summary(data):
+    """weather_summary에 섞여 나온 (ID:숫자) 참조 번호 제거."""
+    if 'weather_summary' in data:
+        data['weather_summary'] = re.sub(r'\s*\(ID:\s*\d+\)', '', data['weather_summary'], flags=re.IGNORECASE)
+        data['weather_summary'] = re.sub(r'ID:\s*\d+', '', data['weather_summary'], flags=re.IGNORECASE)
+    return data
+
+class PartialStream(Exception):
+    """[수정 30] 조각을 일부 받은 뒤 끊긴 스트림 (재시도하지 않음)."""
+
+    def __init__(self, error):
+        super().__init__(str(error))
+        self.error = error
+
+def generate_streamed(prompt, valid_ids):
+    """
+    분석 결과(weather_summary + selected_cards)를 스트리밍으로 받아 증분 파싱.
+    - 카드마다 ID 존재 여부·risk_level 등을 개별 검증하여 유효한 카드만 채택
+    - 스트림 도중 오류가 나도 그때까지 완성된 결과 반환 (아무것도 없으면 None)
+    - 끝까지 정상적으로 받은 응답만 캐시에 저장
+    """
+    backend = get_llm_backend()
+    key = llm_cache.make_key(backend.model_name, prompt, SAFETY_SETTINGS)
+    parser = AnalysisStreamParser(valid_ids)
+
+    cached_text = llm_cache.get(key) if LLM_STREAMING else None
+
+    if not LLM_STREAMING:
+        data = generate_cached(prompt, parse_analysis_response)
+        if data is not None:
+            parser.feed(json.dumps(data, ensure_ascii=False))  # 비스트리밍 응답도 동일하게 카드별 검증
+    elif cached_text is not None:
+        print("⚡ LLM 캐시 적중: 동일한 프롬프트의 이전 응답을 재사용합니다.")
+        parser.feed(cached_text)
+    else:
+        started = time.perf_counter()
+        chunks = []
+
+        def receive(timeout):
+            # 재시도는 아직 아무 조각도 받지 못한 경우만 (받은 조각이 있으면 그때까지의 결과 사용)
+            try:
+                for chunk in backend.generate_stream(prompt, safety_settings=SAFETY_SETTINGS, timeout=timeout):
+                    chunks.append(chunk)
+                    for kind, value in parser.feed(chunk):
+                        elapsed = time.perf_counter() - started
+                        if kind == "weather_summary":
+                            print(f"🌤️ 시장 날씨 요약 수신 ({elapsed:.1f}초)")
+                        else:
+                            print(f"🃏 카드 수신: ID {value['id']} [{value['risk_level']}] ({elapsed:.1f}초)")
+            except Exception as e:
+                if chunks:
+                    raise PartialStream(e) from e
+                raise
+
+        try:
+            with metrics.span("llm_call"):
+                call_llm(receive)
+        except Exception as e:
+            print(f"⚠️ 스트리밍 중단, 수신된 결과까지만 사용: {getattr(e, 'error', e)}")
+        else:
+            if parser.done:
+                llm_cache.put(key, "".join(chunks), backend.model_name)
+        finally:
+            received = sum(len(chunk.encode("utf-8")) for chunk in chunks)
+            metrics.count_network("llm", 1, len(prompt.encode("utf-8")) + received)
+
+    for raw, reason in parser.rejected:
+        print(f"⚠️ 카드 제외 ({reason}): {raw[:80]}")
+    data = parser.result()
+    return clean_weather_summary(data) if data is not None else None
+
+def build_analysis_prompt(news_items, is_monday=False, profile=None):
+    profile = profile or default_profile()
     kst_now = get_korea_time()
     today_formatted = kst_now.strftime("%Y년 %m월 %d일") 
     period_text = "지난 주말부터 오늘까지의" if is_monday else "오늘 하루 동안의"
-    
-    print("🧠 AI 분석 시작 (JSON 모드)...")
-    try:
-        genai.configure(api_key=GOOGLE_API_KEY)
-        model = genai.GenerativeModel('gemini-2.5-flash')
 
-        news_text = ""
-        for item in news_items:
-            # [수정 9] 날짜 정보 추가: AI가 과거 기사를 직접 판별할 수 있도록
-            news_text += f"ID:{item['id']} | [{item['category']}] [날짜:{item['date']}] {item['title']}\n"
+    news_text = "".join(format_news_line(item) for item in news_items)
 
-        prompt = f"""
+    return f"""
         오늘은 {today_formatted}입니다.
-        당신은 포스코이앤씨 구매계약실의 수석 애널리스트입니다.
+        당신은 {profile.persona}입니다.
         
         [뉴스 목록] ({period_text} 수집된 데이터입니다)
         {news_text}
 
         [임무]
         1. 전체적인 **시장 날씨 요약** (1~2문장).
-        2. 위 목록에서 구매 업무에 가장 중요한 **핵심 기사 3~5개**를 선정하여 심층 분석(Deep Dive).
+        2. 위 목록에서 {profile.focus}에 가장 중요한 **핵심 기사 3~5개**를 선정하여 심층 분석(Deep Dive).
         
         [🚨 중요: 과거 기사 필터링 (Sanity Check)]
         - 제목과 문맥을 분석하여, 오늘({today_formatted}) 기준으로 시의성이 떨어지거나 이미 종료된 과거 사건(예: 2023년 행사, 작년 실적 등)은 절대 선정하지 마세요.
@@ -271,297 +779,896 @@ def generate_analysis_data(news_items, is_monday=False):
                 {{
                     "id": 뉴스ID(숫자),
                     "summary": "핵심 내용 요약 (3문장 내외, 수치 포함)",
-                    "insight": "구매계약실 대응 방안 (2문장)",
+                    "insight": "{profile.insight_label} (2문장)",
+                    "risk_level": "Critical" 또는 "Warning" 또는 "Info"
+                }}
+            ]
+        }}
+        """
+
+def parse_analysis_response(text):
+    """응답 텍스트에서 JSON 부분만 잘라 해석. 실패 시 None."""
+    start_idx = text.find('{')
+    end_idx = text.rfind('}')
+    
+    if start_idx != -1 and end_idx != -1:
+        clean_json = text[start_idx:end_idx+1]
+        data = json.loads(clean_json)
+        return clean_weather_summary(data)
+    else:
+        return None
+
+# --- [수정 18] 대량 뉴스 분할(map-reduce) 분석 설정 ---
+# 뉴스가 많으면(월요일 72시간, 키워드 추가 등) 카테고리/분량 단위로 나눠 후보 선정(map)을 동시에 요청하고,
+# 후보만 모아 작은 요청(reduce)으로 최종 3~5개 카드와 weather_summary를 작성 (출력 스키마는 동일)
+ANALYSIS_MODE = os.environ.get("ANALYSIS_MODE", "auto")                          # auto | single | chunked
+ANALYSIS_CHUNK_THRESHOLD = int(os.environ.get("ANALYSIS_CHUNK_THRESHOLD", "80"))  # auto 모드에서 분할을 시작하는 뉴스 수
+ANALYSIS_CHUNK_CHAR_BUDGET = int(os.environ.get("ANALYSIS_CHUNK_CHAR_BUDGET", "4000"))  # 청크 하나의 뉴스 목록 최대 글자 수
+ANALYSIS_CANDIDATES_PER_CHUNK = int(os.environ.get("ANALYSIS_CANDIDATES_PER_CHUNK", "3"))
+ANALYSIS_MAX_WORKERS = int(os.environ.get("ANALYSIS_MAX_WORKERS", "4"))
+
+def format_news_line(item):
+    # [수정 9] 날짜 정보 추가: AI가 과거 기사를 직접 판별할 수 있도록
+    return f"ID:{item.id} | [{item.category}] [날짜:{item.date}] {item.title}\n"
+
+def split_into_chunks(news_items, char_budget=ANALYSIS_CHUNK_CHAR_BUDGET):
+    """카테고리 버킷별로, 뉴스 목록 글자 수가 char_budget을 넘는 카테고리는 다시 나눔."""
+    chunks = []
+    for items in news_items.by_category().values():
+        chunk, size = [], 0
+        for item in items:
+            line_len = len(format_news_line(item))
+            if chunk and size + line_len > char_budget:
+                chunks.append(chunk)
+                chunk, size = [], 0
+            chunk.append(item)
+            size += line_len
+        if chunk:
+            chunks.append(chunk)
+    return chunks
+
+def build_candidate_prompt(chunk, is_monday=False, profile=None):
+    """map 단계: 청크 하나에서 (프로필의) 업무에 중요한 후보 기사 선정."""
+    profile = profile or default_profile()
+    kst_now = get_korea_time()
+    today_formatted = kst_now.strftime("%Y년 %m월 %d일")
+    period_text = "지난 주말부터 오늘까지의" if is_monday else "오늘 하루 동안의"
+    news_text = "".join(format_news_line(item) for item in chunk)
+
+    return f"""
+        오늘은 {today_formatted}입니다.
+        당신은 {profile.persona}입니다.
+
+        [뉴스 목록] ({period_text} 수집된 데이터 중 일부입니다)
+        {news_text}
+
+        [임무]
+        위 목록에서 {profile.focus}에 가장 중요한 **후보 기사 최대 {ANALYSIS_CANDIDATES_PER_CHUNK}개**를 고르고, 각각 선정 이유를 한 문장으로 적으세요.
+
+        [🚨 중요: 과거 기사 필터링 (Sanity Check)]
+        - 오늘({today_formatted}) 기준으로 시의성이 떨어지거나 이미 종료된 과거 사건은 절대 선정하지 마세요.
+
+        [필수 출력 형식 (JSON Only)]
+        반드시 아래 JSON 포맷으로만 응답하세요. 서론이나 마크다운 태그를 붙이지 마세요.
+        {{
+            "candidates": [
+                {{"id": 뉴스ID(숫자), "reason": "선정 이유 (1문장)"}}
+            ]
+        }}
+        """
+
+def build_reduce_prompt(candidates, news_items, is_monday=False, profile=None):
+    """reduce 단계: 후보만 모아 최종 카드 3~5개와 시장 날씨 요약 작성 (기존 출력 스키마)."""
+    profile = profile or default_profile()
+    kst_now = get_korea_time()
+    today_formatted = kst_now.strftime("%Y년 %m월 %d일")
+    period_text = "지난 주말부터 오늘까지의" if is_monday else "오늘 하루 동안의"
+
+    overview = ", ".join(f"{cat} {len(items)}건" for cat, items in news_items.by_category().items())
+    candidate_text = "".join(
+        format_news_line(item).rstrip("\n") + f" (선정 이유: {reason})\n" for item, reason in candidates
+    )
+
+    return f"""
+        오늘은 {today_formatted}입니다.
+        당신은 {profile.persona}입니다.
+
+        [수집 현황] {period_text} 뉴스 총 {len(news_items)}건 ({overview})
+        [1차 선정 후보]
+        {candidate_text}
+
+        [임무]
+        1. 전체적인 **시장 날씨 요약** (1~2문장).
+        2. 위 후보 중 {profile.focus}에 가장 중요한 **핵심 기사 3~5개**를 최종 선정하여 심층 분석(Deep Dive).
+
+        [🚨 중요: 과거 기사 필터링 (Sanity Check)]
+        - 제목과 문맥을 분석하여, 오늘({today_formatted}) 기준으로 시의성이 떨어지거나 이미 종료된 과거 사건(예: 2023년 행사, 작년 실적 등)은 절대 선정하지 마세요.
+        - **weather_summary 작성 시 (ID:숫자) 같은 참조 번호를 절대 포함하지 마세요.**
+
+        [필수 출력 형식 (JSON Only)]
+        반드시 아래 JSON 포맷으로만 응답하세요. 서론이나 마크다운 태그를 붙이지 마세요.
+        {{
+            "weather_summary": "시장 날씨 요약 문구 (날씨 아이콘 포함)",
+            "selected_cards": [
+                {{
+                    "id": 뉴스ID(숫자),
+                    "summary": "핵심 내용 요약 (3문장 내외, 수치 포함)",
+                    "insight": "{profile.insight_label} (2문장)",
                     "risk_level": "Critical" 또는 "Warning" 또는 "Info"
                 }}
             ]
         }}
         """
-        
-        safety_settings = [
-            {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
-            {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
-            {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
-            {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
-        ]
-
-        response = model.generate_content(prompt, safety_settings=safety_settings)
-        
-        text = response.text
-        start_idx = text.find('{')
-        end_idx = text.rfind('}')
-        
-        if start_idx != -1 and end_idx != -1:
-            clean_json = text[start_idx:end_idx+1]
-            data = json.loads(clean_json)
-            
-            if 'weather_summary' in data:
-                data['weather_summary'] = re.sub(r'\s*\(ID:\s*\d+\)', '', data['weather_summary'], flags=re.IGNORECASE)
-                data['weather_summary'] = re.sub(r'ID:\s*\d+', '', data['weather_summary'], flags=re.IGNORECASE)
-            
-            return data
-        else:
-            return None
+
+def select_chunk_candidates(chunk, is_monday=False, profile=None):
+    """map 단계 한 건: 청크의 후보 [(item, reason)] 반환. 실패 시 빈 목록 (다른 청크는 계속 진행)."""
+    chunk_map = {item.id: item for item in chunk}
+    try:
+        data = generate_cached(build_candidate_prompt(chunk, is_monday, profile), parse_analysis_response)
+    except Exception as e:
+        print(f"⚠️ 후보 선정 실패 [{chunk[0].category}]: {e}")
+        return []
+    candidates = []
+    for cand in (data or {}).get('candidates', [])[:ANALYSIS_CANDIDATES_PER_CHUNK]:
+        item = chunk_map.get(cand.get('id'))  # 청크에 없는 ID는 무시
+        if item is not None:
+            candidates.append((item, cand.get('reason', '')))
+    return candidates
+
+def generate_analysis_chunked(news_items, is_monday=False, profile=None):
+    chunks = split_into_chunks(news_items)
+    print(f"🧩 분할 분석: {len(news_items)}건 → {len(chunks)}개 청크 (동시 {ANALYSIS_MAX_WORKERS}건)")
+
+    with ThreadPoolExecutor(max_workers=max(1, ANALYSIS_MAX_WORKERS)) as pool:
+        results = list(pool.map(lambda chunk: select_chunk_candidates(chunk, is_monday, profile), chunks))
+    candidates = [cand for chunk_candidates in results for cand in chunk_candidates]  # 청크 순서(카테고리 순) 유지
+
+    if not candidates:
+        print("❌ 후보 기사 선정 결과가 없습니다.")
+        return None
+    print(f"🧩 후보 {len(candidates)}건으로 최종 선정 요청")
+    # 최종 카드는 후보 안에서만 허용 (존재하지 않는 ID로 렌더링이 깨지지 않도록)
+    candidate_ids = {item.id for item, _ in candidates}
+    return generate_streamed(build_reduce_prompt(candidates, news_items, is_monday, profile), candidate_ids)
+
+# --- [수정 29] AI 분석 전 로컬 관련도 순위 (relevance.py) ---
+# 카테고리 씨앗 어휘(카테고리명 + 검색어)와의 문자 n-gram TF-IDF 유사도 + 국내 건설사 언급 + 최신성으로 점수를 매겨
+# 카테고리별 상위 RANK_TOP_K건만 AI 분석에 사용 (보고서 헤드라인 목록에는 전체 기사 표시). 0이면 순위 없이 전체 사용
+RANK_TOP_K = int(os.environ.get("RANK_TOP_K", "15"))
+RANK_WEIGHT_SIMILARITY = float(os.environ.get("RANK_WEIGHT_SIMILARITY", "1.0"))
+RANK_WEIGHT_COMPANY = float(os.environ.get("RANK_WEIGHT_COMPANY", "0.3"))
+RANK_WEIGHT_RECENCY = float(os.environ.get("RANK_WEIGHT_RECENCY", "0.2"))
+RANK_RECENCY_HALF_LIFE_HOURS = float(os.environ.get("RANK_RECENCY_HALF_LIFE_HOURS", "12"))
+
+def rank_for_analysis(news_items, profile=None):
+    """카테고리별 관련도 상위 RANK_TOP_K건만 담은 보기 반환 (ID는 그대로라 보고서에서 전체 목록과 함께 사용)."""
+    profile = profile or default_profile()
+    if RANK_TOP_K <= 0 or all(len(items) <= RANK_TOP_K for items in news_items.by_category().values()):
+        return news_items
+    try:
+        from relevance import RelevanceRanker  # NumPy는 순위가 필요할 때만 로드
+
+        with metrics.span("rank"):
+            ranker = RelevanceRanker(
+                profile.category_map, profile.korean_companies,
+                similarity_weight=RANK_WEIGHT_SIMILARITY,
+                company_weight=RANK_WEIGHT_COMPANY,
+                recency_weight=RANK_WEIGHT_RECENCY,
+                recency_half_life_hours=RANK_RECENCY_HALF_LIFE_HOURS,
+            )
+            ranked = news_items.select(ranker.top_k(news_items, RANK_TOP_K))
+    except Exception as e:
+        print(f"⚠️ 관련도 순위 실패, 전체 기사로 분석합니다: {e}")
+        return news_items
+    print(f"🎯 관련도 순위: {len(news_items)}건 중 카테고리별 상위 {RANK_TOP_K}건씩 {len(ranked)}건을 AI 분석에 사용")
+    metrics.count(profile.scoped("ranked_out"), len(news_items) - len(ranked))
+    return ranked
+
+def generate_analysis_data(news_items, is_monday=False, profile=None):
+    if not news_items: return None
+    profile = profile or default_profile()
+    news_items = rank_for_analysis(news_items, profile)
+    
+    print(f"🧠 AI 분석 시작 (JSON 모드, backend={LLM_BACKEND})...")
+    try:
+        chunked = ANALYSIS_MODE == "chunked" or (ANALYSIS_MODE == "auto" and len(news_items) > ANALYSIS_CHUNK_THRESHOLD)
+        if chunked:
+            return generate_analysis_chunked(news_items, is_monday, profile)
+
+        prompt = build_analysis_prompt(news_items, is_monday, profile)
+        return generate_streamed(prompt, news_items.ids())
 
     except Exception as e:
         print(f"❌ AI 분석 중 오류: {e}")
         return None
 
+# [수정 20] 보고서 렌더링은 report_renderer의 미리 컴파일한 템플릿으로 처리
+# 정적 CSS/헤더는 import 시 한 번만 생성하고, 분류된 기사를 한 번 순회해 전체/요약/텍스트 버전을 함께 생성
+# [수정 25] ID 조회와 카테고리 분류는 ArticleCollection의 색인/버킷을 그대로 사용
 def build_exec_summary(ai_data, news_items):
     """
     AI가 선정한 카드 중 상위 3개를 risk_level 우선순위(Critical→Warning→Info) 순으로
     정렬하여 Executive Summary 블록을 생성합니다.
     """
-    RISK_ORDER = {"Critical": 0, "Warning": 1, "Info": 2}
-    news_map = {item['id']: item for item in news_items}
-
-    sorted_cards = sorted(
-        ai_data.get('selected_cards', []),
-        key=lambda c: RISK_ORDER.get(c.get('risk_level', 'Info'), 2)
-    )[:3]
-
-    if not sorted_cards:
-        return ''
-
-    rows_html = ''
-    for idx, card in enumerate(sorted_cards, start=1):
-        news = news_map.get(card['id'], {})
-        title = html.escape(news.get('title', '제목 없음'))
-        risk = card.get('risk_level', 'Info')
-        rows_html += f"""
-        <div class="exec-row">
-            <div class="exec-num">{idx}</div>
-            <div>
-                <span class="exec-badge exec-badge-{risk}">{risk}</span>
-                <div class="exec-text" style="margin-top:4px;">{title}</div>
-            </div>
-        </div>"""
+    return render_exec_summary(ai_data, news_items)
 
-    return f"""
-    <div class="exec-summary">
-        <div class="exec-summary-title">📋 Executive Summary — 오늘의 핵심 3가지</div>
-        {rows_html}
-    </div>"""
+def build_report_variants(ai_data, news_items, profile=None):
+    """전체 HTML / Executive Summary 전용 HTML / 텍스트 버전을 한 번에 생성 (RenderedReport)."""
+    today_str = get_korea_time().strftime("%Y년 %m월 %d일")
+    team = REPORT_TEAM if profile is None else profile.team
+    return render_report(ai_data, news_items, today_str, team=team)
 
 def build_html_report(ai_data, news_items, is_monday=False):
-    kst_now = get_korea_time()
-    today_str = kst_now.strftime("%Y년 %m월 %d일")
+    return build_report_variants(ai_data, news_items).html
 
-    selected_map = {item['id']: item for item in ai_data['selected_cards']}
-    
-    grouped_news = {cat: [] for cat in CATEGORY_MAP.keys()}
-    grouped_news["기타"] = []
+# --- [수정 21] SMTP 발송 스케줄러 설정 ---
+# 메시지는 한 번만 직렬화, 고정 60초 대기 대신 토큰 버킷으로 속도 제한, 연결이 끊기면 재연결,
+# 수신자별 발송 기록을 남겨 재실행 시 실패한 수신자에게만 재발송
+# SMTP_HOST/SMTP_PORT/SMTP_STARTTLS로 로컬 SMTP 서버를 지정해 시험 가능
+SMTP_HOST = os.environ.get("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.environ.get("SMTP_PORT", "587"))
+SMTP_STARTTLS = os.environ.get("SMTP_STARTTLS", "1") != "0"
+SMTP_BATCH_SIZE = int(os.environ.get("SMTP_BATCH_SIZE", "15"))
+# 기본값은 기존 발송 속도와 같게 (15명 배치 하나를 보내고 60초 대기 = 분당 1통)
+SMTP_MESSAGES_PER_MINUTE = float(os.environ.get("SMTP_MESSAGES_PER_MINUTE", "1"))
+SMTP_BURST = int(os.environ.get("SMTP_BURST", "1"))
+SMTP_MAX_RETRIES = int(os.environ.get("SMTP_MAX_RETRIES", "2"))
+
+delivery_log = DeliveryLog(os.path.join(CACHE_DIR, "deliveries.db"))
+
+# [수정 26] 여러 프로필의 발송은 같은 발신 계정의 속도 제한을 공유하므로 한 번에 하나씩 진행
+# (분석/렌더링은 프로필별로 동시에 진행되고, 먼저 끝난 프로필부터 발송)
+_smtp_lock = threading.Lock()
+
+def build_message(html_body, subject, text_body=None, team=REPORT_TEAM):
+    """보고서 메일 생성. 텍스트 버전이 있으면 multipart/alternative로 함께 첨부."""
+    msg = MIMEMultipart('alternative' if text_body else 'mixed')
+    msg['From'] = EMAIL_SENDER
+    msg['To'] = f"{team} 여러분 <{EMAIL_SENDER}>"
+    msg['Subject'] = subject
+    if text_body:
+        msg.attach(MIMEText(text_body, 'plain'))
+    msg.attach(MIMEText(html_body, 'html'))
+    return msg
+
+def report_subject(profile):
+    today_str = get_korea_time().strftime("%Y년 %m월 %d일")
+    return f"[Daily] {today_str} {profile.team} 시장 동향 보고"
+
+def exec_report_subject(profile):
+    today_str = get_korea_time().strftime("%Y년 %m월 %d일")
+    return f"[Executive] {today_str} {profile.team} 시장 동향 요약"
+
+def send_email(html_body, is_monday=False, text_body=None, profile=None, deadline=None, receivers=None, subject=None):
+    """
+    보고서 발송. 모든 수신자에게 발송(또는 이전 실행에서 발송 완료)되면 True.
+    deadline: 발송 마감(time.monotonic 기준). 실행 예산의 SMTP 단계 마감과 둘 중 이른 쪽 사용.
+    receivers/subject: 지정하지 않으면 프로필 수신자와 일일 보고 제목 (요약본 발송 등에 사용)
+    """
+    if not html_body: return False
+    profile = profile or default_profile()
     
-    for item in news_items:
-        cat = item['category']
-        if cat in grouped_news:
-            grouped_news[cat].append(item)
+    subject = subject or report_subject(profile)
+    receivers = profile.receivers if receivers is None else receivers
+    label = "" if profile.is_default else f"[{profile.name}] "
+
+    with _smtp_lock:
+        try:
+            message_bytes = build_message(html_body, subject, text_body, profile.team).as_bytes()
+            scheduler = DeliveryScheduler(
+                SMTP_HOST, SMTP_PORT, EMAIL_SENDER, EMAIL_PASSWORD,
+                starttls=SMTP_STARTTLS,
+                batch_size=SMTP_BATCH_SIZE,
+                messages_per_minute=SMTP_MESSAGES_PER_MINUTE,
+                burst=SMTP_BURST,
+                max_retries=SMTP_MAX_RETRIES,
+                log=delivery_log,
+                deadline=min((d for d in (run_budget.deadline("smtp"), deadline) if d is not None), default=None),
+            )
+            # 같은 날 보고서는 제목이 같으므로 제목을 키로 수신자별 발송 여부를 판단 (기본 프로필 외에는 프로필 이름 포함)
+            result = scheduler.deliver(message_bytes, receivers, message_key=profile.scoped(subject))
+        except Exception as e:
+            print(f"❌ {label}발송 실패: {e}")
+            return False
+        finally:
+            delivery_log.close()
+    metrics.count_network("smtp", scheduler.messages_sent, scheduler.bytes_sent)
+    metrics.add_section(profile.scoped("smtp"), {
+        "sent": len(result.sent), "failed": len(result.failed), "skipped": len(result.skipped),
+        "connects": scheduler.connects, "reconnects": scheduler.reconnects,
+        "rate_limit_wait_seconds": round(scheduler.waited_seconds, 3),
+    })
+
+    if result.failed:
+        print(f"❌ {label}{len(result.failed)}명 발송 실패 (재실행 시 실패한 수신자에게만 재발송): {', '.join(result.failed)}")
+        return False
+    print(f"✅ {label}총 {len(result.sent)}명에게 발송 완료." + (f" (이전 발송 {len(result.skipped)}명 제외)" if result.skipped else ""))
+    return True
+
+DEGRADED_SUMMARY = "⚠️ AI 분석을 완료하지 못해 오늘은 헤드라인만 보내드립니다."
+
+# --- [수정 31] 보고 이력 / 추세 집계 (trend_index.py) ---
+# 발송한 보고서의 기사·카테고리·검색어·risk_level 판정을 날짜별로 쌓고 일별 집계를 함께 갱신
+# --trend-report week|month 로 집계만 읽어 주간/월간 추세 보고서 출력
+TREND_INDEX_ENABLED = os.environ.get("TREND_INDEX_ENABLED", "1") == "1"
+TREND_REPORT_DAYS = {"week": 7, "month": 30}
+
+trend_index = TrendIndex(os.path.join(CACHE_DIR, "trends.db")) if TREND_INDEX_ENABLED else None
+_trend_lock = threading.Lock()  # 프로필별 보고가 동시에 끝나도 기록은 한 번에 하나씩 (연결은 기록한 스레드에서 닫음)
+
+def record_trends(profile, items, ai_data):
+    """발송한 보고서의 기사와 카드 판정을 추세 색인에 기록 (실패해도 발송 결과에는 영향 없음)."""
+    if trend_index is None:
+        return
+    try:
+        with _trend_lock:
+            try:
+                added, changed = trend_index.record(get_korea_time().date(), profile.name, items, ai_data)
+            finally:
+                trend_index.close()
+    except Exception as e:
+        print(f"⚠️ 추세 색인 기록 실패: {e}")
+        return
+    metrics.add_section(profile.scoped("trend_index"), {"added": added, "risk_changed": changed})
+
+def print_trend_reports(profiles, period):
+    """프로필별 최근 일주일/한 달 추세 보고서 출력 (오늘까지, 직전 같은 기간과 비교)."""
+    if trend_index is None:
+        print("⚠️ 추세 색인이 비활성화되어 있습니다 (TREND_INDEX_ENABLED=0).")
+        return
+    today = get_korea_time().date()
+    try:
+        for profile in profiles:
+            print(trend_index.trend_report(profile.name, today, days=TREND_REPORT_DAYS[period]))
+            print()
+    finally:
+        trend_index.close()
+
+# --- [수정 32] 보고서 출력 대상 (output_sinks.py) ---
+# 한 번 렌더링한 보고서를 OUTPUT_SINKS(쉼표 구분: email, archive, webhook)에 동시에 내보냄
+# 대상마다 제한 시간/재시도를 따로 두고, 필수 대상(OUTPUT_SINKS_REQUIRED, 기본 email)이 모두 성공해야 "발송 완료"
+# (보고 이력/추세 기록 기준). archive는 ARCHIVE_DIR에 날짜별 정적 HTML 보관, webhook은 WEBHOOK_URL로 JSON POST
+OUTPUT_SINKS = [name.strip() for name in os.environ.get("OUTPUT_SINKS", "email").split(",") if name.strip()]
+OUTPUT_SINKS_REQUIRED = {name.strip() for name in os.environ.get("OUTPUT_SINKS_REQUIRED", "email").split(",") if name.strip()}
+# exec_email: 시장 날씨 요약 + Executive Summary만 담은 짧은 보고서(exec_html)를 EXEC_RECEIVERS에게 별도 발송
+EXEC_RECEIVERS = os.environ.get("EXEC_RECEIVERS", "")
+ARCHIVE_DIR = os.environ.get("ARCHIVE_DIR", os.path.join(CACHE_DIR, "archive"))  # 기본은 캐시 디렉터리 안 (저장소에 섞이지 않도록)
+WEBHOOK_URL = os.environ.get("WEBHOOK_URL", "")
+WEBHOOK_TOKEN = os.environ.get("WEBHOOK_TOKEN", "")  # 있으면 Authorization: Bearer 헤더로 전송
+WEBHOOK_TIMEOUT = float(os.environ.get("WEBHOOK_TIMEOUT", "10"))  # POST 한 건의 제한 시간 (재시도마다 새로 적용)
+WEBHOOK_INCLUDE_HTML = os.environ.get("WEBHOOK_INCLUDE_HTML", "0") == "1"
+SINK_TIMEOUT_SECONDS = float(os.environ.get("SINK_TIMEOUT_SECONDS", "60"))  # archive/webhook 대상별 제한 시간 (재시도 포함)
+
+def build_output_sinks(profile, names=None):
+    """프로필의 출력 대상 이름 목록 → sink 객체 목록. 알 수 없는 이름이나 설정 누락은 ValueError."""
+    def email(report, context, deadline):
+        with metrics.span("smtp"):
+            return send_email(report.html, context.is_monday, report.text, profile, deadline)
+
+    def exec_email(report, context, deadline):
+        with metrics.span("smtp"):
+            return send_email(report.exec_html, context.is_monday, None, profile, deadline,
+                              receivers=parse_receivers(EXEC_RECEIVERS), subject=exec_report_subject(profile))
+
+    sinks = []
+    for name in (OUTPUT_SINKS if names is None else names):
+        required = name in OUTPUT_SINKS_REQUIRED
+        if name == "email":
+            # 메일은 DeliveryScheduler가 자체적으로 재연결/재시도하고, 제한 시간은 실행 예산의 SMTP 단계 마감을 따름
+            sinks.append(FunctionSink("email", email, required=required))
+        elif name == "exec_email":
+            if not parse_receivers(EXEC_RECEIVERS):
+                raise ValueError("exec_email 출력에는 EXEC_RECEIVERS가 필요합니다")
+            sinks.append(FunctionSink("exec_email", exec_email, required=required))
+        elif name == "archive":
+            sinks.append(FileArchiveSink(ARCHIVE_DIR, timeout=SINK_TIMEOUT_SECONDS, required=required))
+        elif name == "webhook":
+            if not WEBHOOK_URL:
+                raise ValueError("webhook 출력에는 WEBHOOK_URL이 필요합니다")
+            headers = {"Authorization": f"Bearer {WEBHOOK_TOKEN}"} if WEBHOOK_TOKEN else None
+            sinks.append(WebhookSink(WEBHOOK_URL, timeout=SINK_TIMEOUT_SECONDS, request_timeout=WEBHOOK_TIMEOUT,
+                                     retry_attempts=RETRY_ATTEMPTS, headers=headers,
+                                     include_html=WEBHOOK_INCLUDE_HTML, required=required))
         else:
-            grouped_news["기타"].append(item)
-
-    html_head = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-    <style>
-        body {{ font-family: 'Pretendard', 'Malgun Gothic', sans-serif; line-height: 1.6; color: #333; background-color: #f2f4f7; margin: 0; padding: 0; }}
-        .email-container {{ max-width: 850px; margin: 0 auto; background-color: #ffffff; border-radius: 16px; overflow: hidden; box-shadow: 0 4px 15px rgba(0,0,0,0.05); }}
-        .header {{ background-color: #0054a6; color: #ffffff; padding: 40px 50px; }}
-        .content {{ padding: 50px; }}
-        
-        .weather-box {{ background-color: #eaf4fc; padding: 25px; border-radius: 12px; margin-bottom: 50px; border: 1px solid #dbeafe; }}
-        .weather-title {{ margin: 0 0 10px 0; color: #0054a6; font-size: 20px; font-weight: 700; }}
-        
-        .cat-title {{ font-size: 22px; color: #111; margin: 60px 0 20px 0; border-left: 5px solid #0054a6; padding-left: 15px; font-weight: 700; }}
-        
-        .card {{ background-color: #ffffff; border: 1px solid #eaecf0; border-radius: 16px; padding: 30px; margin-bottom: 20px; box-shadow: 0 4px 6px rgba(0,0,0,0.02); }}
-        .card-title {{ font-size: 20px; font-weight: 700; color: #101828; margin-bottom: 12px; line-height: 1.4; word-break: keep-all; }}
-        .card-body {{ font-size: 16px; color: #475467; line-height: 1.7; margin-bottom: 20px; word-break: keep-all; }}
-        
-        .insight-table {{ width: 100%; border-collapse: separate; border-spacing: 0; margin-bottom: 20px; border-radius: 8px; }}
-        .insight-label {{ padding: 15px; width: 1%; white-space: nowrap; vertical-align: top; font-weight: 700; font-size: 15px; }}
-        .insight-text {{ padding: 15px; font-size: 15px; line-height: 1.6; vertical-align: top; word-break: keep-all; }}
-        
-        .risk-Critical {{ background-color: #fdecea; color: #d32f2f; }}
-        .risk-Warning {{ background-color: #fff4e5; color: #ed6c02; }}
-        .risk-Info {{ background-color: #f0f9ff; color: #0288d1; }}
-        
-        .btn {{ display: inline-block; background-color: #fff; color: #344054; border: 1px solid #d0d5dd; padding: 8px 16px; text-decoration: none; border-radius: 6px; font-size: 13px; font-weight: 600; cursor: pointer; }}
-        
-        .headline-box {{ background-color: #f9fafb; padding: 20px; border-radius: 8px; margin-top: 10px; }}
-        .headline-title {{ font-size: 15px; font-weight: 700; color: #667085; margin-bottom: 10px; }}
-        .headline-item {{ margin-bottom: 8px; font-size: 14px; color: #555; list-style: none; }}
-        .headline-link {{ text-decoration: none; color: #4b5563; transition: color 0.2s; word-break: keep-all; cursor: pointer; }}
-        .headline-link:hover {{ color: #0054a6; text-decoration: underline; }}
-
-        .exec-summary {{ background-color: #f8f9ff; border: 1px solid #c7d2fe; border-radius: 12px; padding: 25px 30px; margin-bottom: 50px; }}
-        .exec-summary-title {{ margin: 0 0 16px 0; color: #3730a3; font-size: 16px; font-weight: 700; letter-spacing: 0.03em; }}
-        .exec-row {{ display: flex; align-items: flex-start; gap: 14px; padding: 10px 0; border-bottom: 1px solid #e0e7ff; }}
-        .exec-row:last-child {{ border-bottom: none; padding-bottom: 0; }}
-        .exec-num {{ font-size: 20px; font-weight: 800; color: #4f46e5; min-width: 28px; line-height: 1.4; }}
-        .exec-badge {{ font-size: 11px; font-weight: 700; padding: 2px 8px; border-radius: 20px; white-space: nowrap; margin-top: 3px; }}
-        .exec-badge-Critical {{ background-color: #fdecea; color: #d32f2f; }}
-        .exec-badge-Warning {{ background-color: #fff4e5; color: #ed6c02; }}
-        .exec-badge-Info {{ background-color: #f0f9ff; color: #0288d1; }}
-        .exec-text {{ font-size: 15px; color: #1e1b4b; font-weight: 600; line-height: 1.5; word-break: keep-all; }}
-
-        .easter-egg-wrapper {{ text-align: center; margin: 30px 0; }}
-        .easter-egg {{
-            display: inline-block;
-            font-size: 12px;
-            color: transparent; 
-            cursor: help;
-            transition: all 0.5s ease;
-            user-select: all;
-        }}
-        .easter-egg:hover {{
-            color: #ff6b6b;
-            transform: scale(1.1) rotate(2deg);
-            font-weight: bold;
-        }}
-    </style>
-    </head>
-    <body>
-        <div class="email-container">
-            <div class="header">
-                <h1 style="margin:0; font-size:28px;">Daily Market & Risk Briefing</h1>
-                <div style="margin-top:10px; opacity:0.9;">POSCO E&C 구매계약실 | {today_str}</div>
-            </div>
-            <div class="content">
-                <div class="weather-box">
-                    <h2 class="weather-title">🌤️ Market Weather Summary</h2>
-                    <div style="font-size: 17px;">{ai_data.get('weather_summary', '시장 분석 데이터 없음')}</div>
-                </div>
-                {build_exec_summary(ai_data, news_items)}
-    """
-
-    content_parts = []
-    
-    for cat_name, items in grouped_news.items():
-        if not items: continue
-        
-        cat_html = f'<div class="cat-title">[{cat_name}]</div>'
-        
-        for item in items:
-            # [수정 5] RSS에서 수집된 뉴스 제목을 HTML에 삽입 전 이스케이프 처리
-            safe_title = html.escape(item['title'])
-
-            if item['id'] in selected_map:
-                ai_info = selected_map[item['id']]
-                risk_level = ai_info.get('risk_level', 'Info')
-                
-                bg_color = "#f0f9ff"
-                text_color = "#0288d1"
-                if risk_level == 'Critical': 
-                    bg_color, text_color = "#fdecea", "#d32f2f"
-                elif risk_level == 'Warning':
-                    bg_color, text_color = "#fff4e5", "#ed6c02"
-
-                cat_html += f"""
-                <div class="card">
-                    <div class="card-title">{safe_title}</div>
-                    <div class="card-body">{ai_info['summary']}</div>
-                    
-                    <table class="insight-table" style="background-color: {bg_color};">
-                        <tr>
-                            <td class="insight-label" style="color: {text_color};">💡 Insight:</td>
-                            <td class="insight-text" style="color: {text_color};">{ai_info['insight']}</td>
-                        </tr>
-                    </table>
-                    <div style="text-align: right;">
-                        <a href="{item['link']}" class="btn" target="_blank" rel="noopener noreferrer">🔗 원문 기사 보기</a>
-                    </div>
-                </div>
-                """
-        
-        headlines = [item for item in items if item['id'] not in selected_map]
-        if headlines:
-            cat_html += """
-            <div class="headline-box">
-                <div class="headline-title">📌 관련 주요 단신</div>
-                <ul style="padding-left: 20px; margin: 0;">
-            """
-            for h_item in headlines:
-                # [수정 5] 단신 제목도 동일하게 이스케이프 처리
-                safe_h_title = html.escape(h_item['title'])
-                cat_html += f"""
-                <li class="headline-item">
-                    <a href="{h_item['link']}" class="headline-link" target="_blank" rel="noopener noreferrer">{safe_h_title}</a>
-                </li>
-                """
-            cat_html += "</ul></div>"
-            
-        content_parts.append(cat_html)
-
-    egg_html = """
-    <div class="easter-egg-wrapper">
-        <div class="easter-egg">
-            오? 저를 발견하셨군요! 연락주시면 커피 한잔 사드릴께요
-        </div>
-    </div>
+            raise ValueError(f"알 수 없는 출력 대상: {name} (email, exec_email, archive, webhook 중 선택)")
+    return sinks
+
+def publish_report(profile, report, ai_data, is_monday=False):
+    """[수정 32] 렌더링한 보고서를 모든 출력 대상에 동시에 내보내고, 필수 대상이 모두 성공하면 True."""
+    output_sinks = build_output_sinks(profile)
+    context = ReportContext(
+        day=get_korea_time().date().isoformat(),
+        subject=report_subject(profile),
+        team=profile.team,
+        profile=None if profile.is_default else profile.name,
+        is_monday=is_monday,
+        weather_summary=ai_data.get("weather_summary", ""),
+    )
+    results = dispatch_sinks(output_sinks, report, context, RETRY_BASE_DELAY, RETRY_MAX_DELAY)
+
+    label = "" if profile.is_default else f"[{profile.name}] "
+    for result in results:
+        if result.name != "email":  # 메일 결과는 send_email이 출력
+            status = "✅" if result.ok else "❌"
+            print(f"{status} {label}{result.name} 출력 {'완료' if result.ok else '실패'} ({result.seconds:.1f}초"
+                  + (f", {result.attempts}회 시도" if result.attempts > 1 else "") + ")"
+                  + (f": {result.error}" if result.error else ""))
+    metrics.add_section(profile.scoped("sinks"), {
+        result.name: {"ok": result.ok, "attempts": result.attempts, "seconds": round(result.seconds, 3),
+                      "error": result.error}
+        for result in results
+    })
+    required = [result for result, sink in zip(results, output_sinks) if sink.required]
+    return all(result.ok for result in required) if required else any(result.ok for result in results)
+
+def report_profile(profile, items, is_monday=False):
+    """
+    프로필 하나의 AI 분석 → 렌더링 → 발송. 발송에 성공하면 True.
+    보고 이력 기록(mark_reported)은 저장소 연결을 연 스레드에서 하도록 호출한 쪽에서 처리.
+    """
+    if not items:
+        print("수집된 뉴스가 없습니다." if profile.is_default else f"[{profile.name}] 수집된 뉴스가 없습니다.")
+        return False
+    with metrics.span("analysis"):
+        ai_data = generate_analysis_data(items, is_monday, profile)
+    if not ai_data:
+        print("❌ AI 분석 데이터 생성 실패" if profile.is_default else f"❌ [{profile.name}] AI 분석 데이터 생성 실패")
+        if not DEGRADED_REPORT:
+            return False
+        # [수정 30] AI 분석 없이 헤드라인 목록만이라도 발송 (시간 초과/API 장애로 브리핑 전체가 빠지지 않도록)
+        print("📰 헤드라인만 담은 보고서로 발송합니다." if profile.is_default else f"📰 [{profile.name}] 헤드라인만 담은 보고서로 발송합니다.")
+        metrics.count(profile.scoped("degraded_report"))
+        ai_data = {"weather_summary": DEGRADED_SUMMARY, "selected_cards": []}
+    with metrics.span("render"):
+        report = build_report_variants(ai_data, items, profile)
+    with metrics.span("publish"):
+        sent = publish_report(profile, report, ai_data, is_monday)
+    if sent:
+        record_trends(profile, items, ai_data)
+    return sent
+
+def mark_profile_reported(profile, items):
     """
+    [수정 16] 발송에 성공한 기사만 "보고됨"으로 표시 (실패 후 재실행 시 다시 포함되도록).
+    이미 발송이 끝난 뒤의 기록이므로 실패해도 발송 실패로 바꾸지 않음 (재시도 시 메일/웹훅이 중복 발송되지 않도록).
+    """
+    if profile.article_store is None:
+        return
+    try:
+        profile.article_store.mark_reported(item.link for item in items)
+    except Exception as e:
+        print(f"⚠️ 보고 이력 기록 실패 (발송은 완료): {e}")
+
+def run_daily_report(is_monday=False):
+    """수집 → AI 분석 → 렌더링 → 발송. 단계별 소요 시간은 metrics에 기록하고 수집된 기사 목록 반환."""
+    # 월요일이면 3일(72시간), 그 외 평일이면 1일(24시간)
+    time_window_days = 3 if is_monday else 1
+    time_window_hours = 72 if is_monday else 24
+    profile = default_profile()
     
-    if len(content_parts) > 1:
-        insert_pos = random.randint(1, len(content_parts))
-        content_parts.insert(insert_pos, egg_html)
-    else:
-        content_parts.append(egg_html)
+    with metrics.span("fetch_news"):
+        items = fetch_news(time_window_days, time_window_hours, profile)
+    if report_profile(profile, items, is_monday):
+        mark_profile_reported(profile, items)
+    return items
 
-    main_content = "".join(content_parts)
+def collect_profiles(profiles, is_monday=False):
+    """
+    [수정 26] 여러 프로필의 기사 수집. {프로필 이름: 수집된 기사} 반환.
+    모든 프로필의 검색어를 합쳐 검색어마다 RSS를 한 번만 받고, 리다이렉트 해석 캐시도 공유.
+    수집(필터/중복 제거)은 프로필마다 따로, 프로필 순서대로 진행.
+    """
+    time_window_days = 3 if is_monday else 1
+    time_window_hours = 72 if is_monday else 24
+    keywords = list(dict.fromkeys(k for profile in profiles for k in profile.keywords))
+    requested = sum(len(profile.keywords) for profile in profiles)
+    print(f"🔍 {len(profiles)}개 프로필 뉴스 수집 시작... (검색 기간: 최근 {time_window_hours}시간, "
+          f"검색어 {requested}개 중 중복 제외 {len(keywords)}개 요청)")
+    metrics.count("shared_queries_saved", requested - len(keywords))
+
+    collected = {}
+    with metrics.span("fetch_news"):
+        with ThreadPoolExecutor(max_workers=max(1, FETCH_MAX_WORKERS)) as pool:
+            feeds = submit_feeds(pool, keywords, time_window_days)
+            for profile in profiles:
+                collected[profile.name] = collect_articles(profile, feeds, time_window_hours)
+                print(f"✅ [{profile.name}] {len(collected[profile.name])}개의 뉴스 수집 완료.")
+        report_fetch_stats()
+    return collected
 
-    final_html = f"""
-                {main_content}
-                <div style="margin-top: 60px; text-align: center; color: #98a2b3; font-size: 13px; border-top: 1px solid #eee; padding-top: 20px;">
-                    <p>본 리포트는 AI Agent 시스템에 의해 실시간으로 생성되었습니다.</p>
-                    <p>문의: 구매계약기획그룹 송승호 프로 | © POSCO E&C</p>
-                </div>
-            </div>
-        </div>
-    </body>
-    </html>
+def deliver_profiles(profiles, collected, is_monday=False):
     """
-    return html_head + final_html
+    수집된 기사로 프로필별 AI 분석 → 렌더링 → 발송. 발송하지 못한 프로필 이름 목록 반환.
+    AI 분석과 렌더링은 프로필별로 동시에 진행 (발송은 발신 계정 속도 제한 때문에 한 번에 하나씩).
+    """
+    with ThreadPoolExecutor(max_workers=len(profiles)) as pool:
+        futures = {
+            profile.name: pool.submit(report_profile, profile, collected[profile.name], is_monday)
+            for profile in profiles
+        }
+    failed = []
+    for profile in profiles:
+        try:
+            sent = futures[profile.name].result()
+        except Exception as e:
+            print(f"❌ [{profile.name}] 처리 중 오류: {e}")
+            sent = False
+        if sent:
+            mark_profile_reported(profile, collected[profile.name])
+        else:
+            failed.append(profile.name)
+    if failed:
+        print(f"⚠️ 발송하지 못한 프로필: {', '.join(failed)}")
+    return failed
 
-def send_email(html_body, is_monday=False):
-    if not html_body: return
-    
-    kst_now = get_korea_time()
-    today_str = kst_now.strftime("%Y년 %m월 %d일")
-    
-    msg = MIMEMultipart()
-    msg['From'] = EMAIL_SENDER
-    msg['To'] = f"구매계약실 여러분 <{EMAIL_SENDER}>"
-    msg['Subject'] = f"[Daily] {today_str} 구매계약실 시장 동향 보고"
-    msg.attach(MIMEText(html_body, 'html'))
+def run_profiles(profiles, is_monday=False):
+    """[수정 26] 여러 프로필을 한 번의 실행으로 처리하고 {프로필 이름: 수집된 기사} 반환."""
+    collected = collect_profiles(profiles, is_monday)
+    deliver_profiles(profiles, collected, is_monday)
+    return collected
 
-    try:
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(EMAIL_SENDER, EMAIL_PASSWORD)
-        
-        # [수정 4] 빈 문자열 수신자 필터링: 환경변수 끝 쉼표 등으로 인한 SMTP 오류 방지
-        receivers = [r.strip() for r in EMAIL_RECEIVERS.split(',') if r.strip()]
-        
-        batch_size = 15
-        total_sent = 0
-        
-        for i in range(0, len(receivers), batch_size):
-            batch = receivers[i:i + batch_size]
-            server.sendmail(EMAIL_SENDER, batch, msg.as_string())
-            total_sent += len(batch)
-            print(f"📧 Batch {i//batch_size + 1} 발송 완료 ({len(batch)}명).")
-            
-            if i + batch_size < len(receivers):
-                print("⏳ 보안 쿨타임 60초 대기 중...")
-                time.sleep(60) 
-            
-        server.quit()
-        print(f"✅ 총 {total_sent}명에게 발송 완료.")
-        
-    except Exception as e:
-        print(f"❌ 발송 실패: {e}")
+# --- [수정 33] 검색어 샤드 수집 / 병합 ---
+# --shard i/N: 전체 검색어(프로필 검색어 합집합, 순서 유지)의 i번째 조각(위치 % N == i-1)만 받아
+#   기사 하나만 보고 판정하는 필터(기간/스팸/영상/해외 매체)를 통과한 후보를 피드 순서대로 JSON에 저장
+# --merge 파일...: 조각을 모아 검색어 순서대로 링크/유사 제목 중복 제거, 차단 도메인 확인, 검색어당 10건 제한을
+#   다시 적용 (순차 수집과 같은 기사·같은 ID, 리다이렉트도 순차 수집처럼 남는 후보만 해석) 후 AI 분석/발송
+# --shards N: 이 컴퓨터에서 N개 프로세스로 샤드 수집 후 바로 병합
+SHARD_DIR = os.environ.get("SHARD_DIR", os.path.join(CACHE_DIR, "shards"))
+SHARD_FORMAT = 2  # 2: 차단 도메인 판정을 병합으로 옮기며 후보에 매체 정보/건설사 추가
+
+SHARD_STAGES = ENTRY_STAGES
+
+def parse_shard(value):
+    """"i/N" → (i, N). i는 1부터 N까지."""
+    index, _, count = value.partition("/")
+    index, count = int(index), int(count)
+    if not 1 <= index <= count:
+        raise ValueError(f"샤드 번호는 1/N ~ N/N 형식이어야 합니다: {value}")
+    return index, count
+
+def shard_keywords(keywords, index, count):
+    """검색어 목록(중복 제거, 순서 유지)에서 위치 % count == index-1 인 검색어 (실행마다 같은 조각)."""
+    return [keyword for position, keyword in enumerate(dict.fromkeys(keywords)) if position % count == index - 1]
+
+def shard_path(index, count):
+    return os.path.join(SHARD_DIR, f"shard-{index}-of-{count}.json")
+
+def collect_shard_candidates(profile, feeds, keywords, time_window_hours=24):
+    """프로필 검색어 중 이 샤드의 검색어만: {검색어: [후보]}와 저장소에 남길 차단 판정 목록."""
+    candidates, verdicts = {}, []
+
+    def on_reject(rule, candidate, ctx):
+        record_rejection(rule, ctx.keyword, profile)
+        if rule in PERSISTED_VERDICTS:
+            verdicts.append([candidate.entry.link, candidate.entry.title, rule])
+
+    for keyword in profile.keywords:
+        if keyword not in keywords or keyword in candidates:
+            continue
+        candidates[keyword] = []
+        try:
+            feed = feeds[keyword].result()
+            if not feed.entries:
+                if hasattr(feed, 'bozo_exception') and feed.bozo_exception:
+                    print(f"⚠️ RSS 파싱 오류 [{keyword}]: {feed.bozo_exception}")
+                continue
+            # 중복 판정은 병합에서 하므로 창(FEED_WINDOW) 안의 후보를 모두 남김
+            ctx = KeywordContext(
+                keyword, limit=FEED_WINDOW, on_reject=on_reject,
+                time_window_hours=time_window_hours,
+                now_utc=feed.get('fetched_at'),
+                profile=profile,
+                articles=ArticleCollection(),
+            )
+            for candidate in run_pipeline(ctx, window(feed.entries, FEED_WINDOW), SHARD_STAGES):
+                entry = candidate.entry
+                candidates[keyword].append({
+                    "title": entry.title, "link": entry.link, "date": getattr(entry, 'published', ''),
+                    "published": candidate.published.timestamp() if candidate.published else None,
+                    # 병합의 차단 도메인 판정용 (리다이렉트 해석 실패 시 RSS 매체 주소, 건설사 포함 기사는 통과)
+                    "source": [get_entry_source(entry), getattr(getattr(entry, 'source', None), 'href', '') or ''],
+                    "company": candidate.verdict.company,
+                })
+        except Exception as e:
+            print(f"⚠️ '{keyword}' 오류: {e}")
+            candidates.pop(keyword)  # 병합 때 빠진 검색어로 표시
+    return candidates, verdicts
+
+def run_shard(profiles, index, count, output_path, is_monday=False):
+    """샤드 하나의 수집 결과를 output_path(JSON)에 저장."""
+    time_window_days = 3 if is_monday else 1
+    time_window_hours = 72 if is_monday else 24
+    keywords = shard_keywords([k for profile in profiles for k in profile.keywords], index, count)
+    print(f"🧱 샤드 {index}/{count}: 검색어 {len(keywords)}개 수집 (검색 기간: 최근 {time_window_hours}시간)")
+
+    result = {
+        "format": SHARD_FORMAT,
+        "shard": [index, count],
+        "day": get_korea_time().date().isoformat(),
+        "is_monday": is_monday,
+        "keywords": keywords,
+        "profiles": {},
+        "domains": {},
+    }
+    with metrics.span("fetch_news"):
+        with ThreadPoolExecutor(max_workers=max(1, FETCH_MAX_WORKERS)) as pool:
+            feeds = submit_feeds(pool, keywords, time_window_days)
+            for profile in profiles:
+                candidates, verdicts = collect_shard_candidates(profile, feeds, set(keywords), time_window_hours)
+                result["profiles"][profile.name] = {"candidates": candidates, "verdicts": verdicts}
+                for link in [c["link"] for items in candidates.values() for c in items] + [v[0] for v in verdicts]:
+                    domain = domain_resolver.cached_domain(link)
+                    if domain:
+                        result["domains"][link] = domain
+                if not profile.is_default:
+                    print(f"📂 [{profile.name}] 필터 현황")
+                profile.filter_engine.print_stats()
+                total = sum(len(items) for items in candidates.values())
+                metrics.count(profile.scoped("shard_candidates"), total)
+        report_fetch_stats()
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False)
+    os.replace(tmp_path, output_path)
+    print(f"💾 샤드 {index}/{count} 저장: {output_path}")
+
+def load_shards(paths):
+    """조각 파일(또는 조각이 든 디렉터리) 목록을 읽어 검증. 같은 실행(같은 N, 같은 날짜)의 조각만 허용."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(os.path.join(path, name) for name in os.listdir(path)
+                            if name.startswith("shard-") and name.endswith(".json"))
+        elif path.endswith(("/", os.sep)) and not os.path.exists(path):
+            continue  # 조각이 하나도 업로드되지 않으면 내려받을 디렉터리도 없음 → 아래에서 "샤드 파일 없음"으로 처리
+        else:
+            files.append(path)
+    shards = {}
+    for path in files:
+        with open(path, encoding="utf-8") as f:
+            shard = json.load(f)
+        if shard.get("format") != SHARD_FORMAT:
+            raise ValueError(f"지원하지 않는 샤드 형식: {path}")
+        index, count = shard["shard"]
+        if shards and (count, shard["day"]) != next((s["shard"][1], s["day"]) for s in shards.values()):
+            raise ValueError(f"다른 실행의 샤드가 섞여 있습니다: {path}")
+        shards[index] = shard
+    if not shards:
+        raise ValueError("병합할 샤드 파일이 없습니다")
+    count = next(iter(shards.values()))["shard"][1]
+    missing = sorted(set(range(1, count + 1)) - set(shards))
+    if missing:
+        print(f"⚠️ 샤드 {count}개 중 {', '.join(map(str, missing))}번이 없어 해당 검색어 없이 병합합니다.")
+    return [shards[index] for index in sorted(shards)]
+
+def merge_profile(profile, shards):
+    """샤드 후보를 프로필 검색어 순서대로 순차 수집과 같은 중복 제거/건수 제한으로 합친 ArticleCollection."""
+    candidates = {}
+    for shard in shards:
+        part = shard["profiles"].get(profile.name, {"candidates": {}, "verdicts": []})
+        candidates.update(part["candidates"])
+        if profile.article_store is not None:
+            for link, title, verdict in part["verdicts"]:
+                remember_verdict(SimpleNamespace(link=link, title=title), verdict, profile)
+
+    articles = ArticleCollection(profile.category_map.keys())
+    title_index = TitleIndex(threshold=0.7)
+    missing = []
+    for keyword in profile.keywords:
+        if keyword not in candidates:
+            missing.append(keyword)
+            continue
+        ctx = KeywordContext(
+            keyword, limit=KEYWORD_LIMIT, on_reject=on_candidate_rejected,
+            profile=profile, articles=articles, title_index=title_index,
+        )
+        accept_candidates(ctx, run_pipeline(ctx, (restore_candidate(c) for c in candidates[keyword]), CROSS_KEYWORD_STAGES))
+    if missing:
+        print(f"⚠️ 수집 결과가 없는 검색어 {len(missing)}개: {', '.join(missing)}")
+
+    finish_collection(profile, articles)
+    return articles
+
+def restore_candidate(row):
+    source_title, source_href = row["source"]
+    candidate = Candidate(SimpleNamespace(title=row["title"], link=row["link"], published=row["date"],
+                                          source=SimpleNamespace(title=source_title, href=source_href)))
+    candidate.verdict = Verdict(None, None, row["company"], None)
+    if row["published"] is not None:
+        candidate.published = datetime.fromtimestamp(row["published"], timezone.utc)
+    return candidate
+
+def merge_shards(profiles, paths):
+    """조각을 병합해 프로필별 수집 결과 {프로필 이름: ArticleCollection}과 월요일 여부 반환."""
+    shards = load_shards(paths)
+    is_monday = shards[0]["is_monday"]
+    for shard in shards:
+        domain_resolver.remember(shard["domains"])
+    print(f"🧩 샤드 {len(shards)}개 병합 (검색어 {sum(len(s['keywords']) for s in shards)}개)")
+
+    collected = {}
+    with metrics.span("merge_shards"):
+        for profile in profiles:
+            collected[profile.name] = merge_profile(profile, shards)
+            label = "" if profile.is_default else f"[{profile.name}] "
+            print(f"✅ {label}총 {len(collected[profile.name])}개의 뉴스 수집 완료.")
+        report_fetch_stats()  # 병합에서 해석한 리다이렉트 캐시 저장/집계
+    return collected, is_monday
+
+def run_local_shards(count, profiles_path=None, extra_args=()):
+    """이 컴퓨터에서 샤드 count개를 동시에 실행하고 조각 파일 경로 목록 반환 (실패한 샤드는 병합에서 빠짐)."""
+    import subprocess
+    import sys
+
+    processes = []
+    for index in range(1, count + 1):
+        command = [sys.executable, os.path.abspath(__file__), "--shard", f"{index}/{count}",
+                   "--shard-output", shard_path(index, count), *extra_args]
+        if profiles_path:
+            command += ["--profiles", profiles_path]
+        processes.append((index, subprocess.Popen(command)))
+    paths = []
+    for index, process in processes:
+        if process.wait() == 0:
+            paths.append(shard_path(index, count))
+        else:
+            print(f"⚠️ 샤드 {index}/{count} 실패 (종료 코드 {process.returncode})")
+    return paths
+
+def finish_run_metrics(run_id):
+    """[수정 22] 실행 메트릭 요약 출력 및 JSON 저장."""
+    metrics.add_section("llm_cache", {"hits": llm_cache.hits, "misses": llm_cache.misses})
+    metrics.add_section("budget", run_budget.stats())
+    metrics.print_summary()
+    metrics.write(os.path.join(METRICS_DIR, run_id + ".json"), keep=METRICS_KEEP_RUNS)
+
+# --- [수정 28] 상주(daemon) 모드 (daemon.py) ---
+# 하루 동안 주기적으로 수집해 발송 후보를 미리 만들어 두고, 발송 시각에는 AI 최종 선정/렌더링/발송만 진행
+# (RSS 조건부 GET, 리다이렉트 캐시, 기사 저장소의 차단 판정 덕분에 반복 수집은 새 기사만 실제로 처리)
+DAEMON_SEND_TIME = os.environ.get("DAEMON_SEND_TIME", "07:00")  # KST
+DAEMON_POLL_MINUTES = int(os.environ.get("DAEMON_POLL_MINUTES", "30"))
+DAEMON_POLL_JITTER = float(os.environ.get("DAEMON_POLL_JITTER", "0.2"))
+DAEMON_PRESEND_MINUTES = int(os.environ.get("DAEMON_PRESEND_MINUTES", "10"))
+DAEMON_SEND_GRACE_MINUTES = int(os.environ.get("DAEMON_SEND_GRACE_MINUTES", "120"))
+DAEMON_STATE_PATH = os.path.join(CACHE_DIR, "daemon_state.json")
+
+def snapshot_collection(articles):
+    """수집된 기사 → 상태 파일에 저장할 수 있는 목록 (발행 시각은 epoch 초)."""
+    return [
+        {
+            "title": item.title, "link": item.link, "keyword": item.keyword, "category": item.category,
+            "date": item.date, "published": item.published.timestamp() if item.published else None,
+        }
+        for item in articles
+    ]
+
+def merge_snapshots(saved, snapshot):
+    """
+    같은 발송일의 저장된 후보에 이번 수집 결과를 누적 (프로필별, 저장된 후보 먼저).
+    같은 링크(정규화)나 유사 제목(TitleIndex)은 한 번만 남겨, 피드 창에서 밀려난 기사도 발송 후보에 유지.
+    """
+    merged = {}
+    for name in dict.fromkeys([*(saved or {}), *snapshot]):
+        links, title_index, rows = set(), TitleIndex(threshold=0.7), []
+        for row in ((saved or {}).get(name) or []) + (snapshot.get(name) or []):
+            link = canonical_link(row["link"])
+            if link in links or title_index.is_duplicate(row["title"]):
+                continue
+            links.add(link)
+            title_index.add(row["title"])
+            rows.append(row)
+        merged[name] = rows
+    return merged
+
+def restore_collection(rows, profile, time_window_hours=24, now_utc=None):
+    """저장된 후보 → ArticleCollection. 발송 시각 기준으로 기간이 지난 기사는 제외."""
+    articles = ArticleCollection(profile.category_map.keys())
+    for row in rows or []:
+        published = datetime.fromtimestamp(row["published"], timezone.utc) if row["published"] is not None else None
+        if not is_recent_datetime(published, time_window_hours, now_utc):
+            continue
+        articles.add(row["title"], row["link"], row["keyword"], row["category"],
+                     date=row["date"], published=published)
+    return articles
+
+def run_daemon(profiles):
+    """발송일마다 profiles를 미리 수집해 두었다가 DAEMON_SEND_TIME에 발송 (종료 신호까지 계속 실행)."""
+    from daemon import BriefingDaemon, parse_send_time
+
+    def finish_cycle(kind):
+        global metrics
+        finish_run_metrics(datetime.now(timezone.utc).strftime(f"run-%Y%m%dT%H%M%SZ-{kind}"))
+        metrics = RunMetrics()  # 수집/발송 주기마다 메트릭을 따로 기록
+
+    def start_cycle():
+        run_budget.start()  # [수정 30] 수집/발송 주기마다 실행 예산을 새로 시작
+        # 공유 캐시/차단기 카운터는 프로세스 전체 누적이므로 주기마다 초기화 (주기별 메트릭에 이전 주기가 섞이지 않도록)
+        for counters in (feed_cache, domain_resolver, feed_breakers, redirect_breakers, llm_cache):
+            counters.reset_stats()
+        for profile in profiles:
+            profile.filter_engine.reset_stats()
+            if profile.article_store is not None:
+                profile.article_store.reset_stats()
+
+    def poll(send_day):
+        start_cycle()
+        domain_resolver.reset_run_state()  # 이전 주기에 해석하지 못한 링크는 이번 주기에 다시 시도
+        try:
+            collected = collect_profiles(profiles, is_monday=(send_day.weekday() == 0))
+            return {name: snapshot_collection(articles) for name, articles in collected.items()}
+        finally:
+            finish_cycle("poll")
+
+    def send(send_day, snapshot):
+        is_monday = send_day.weekday() == 0
+        now_utc = datetime.now(timezone.utc)
+        start_cycle()
+        try:
+            collected = {
+                profile.name: restore_collection((snapshot or {}).get(profile.name), profile,
+                                                 72 if is_monday else 24, now_utc)
+                for profile in profiles
+            }
+            return not deliver_profiles(profiles, collected, is_monday)
+        finally:
+            finish_cycle("send")
+
+    BriefingDaemon(
+        poll, send, DAEMON_STATE_PATH,
+        merge=merge_snapshots,
+        send_time=parse_send_time(DAEMON_SEND_TIME),
+        poll_minutes=DAEMON_POLL_MINUTES,
+        jitter=DAEMON_POLL_JITTER,
+        presend_minutes=DAEMON_PRESEND_MINUTES,
+        grace_minutes=DAEMON_SEND_GRACE_MINUTES,
+    ).run()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="POSCO E&C 구매계약실 Daily 시장 동향 브리핑")
+    parser.add_argument("--offline", action="store_true",
+                        help="네트워크 없이 캐시된 RSS 피드와 리다이렉트 결과만으로 실행 (수동 재실행/로컬 프로파일링용)")
+    parser.add_argument("--llm", choices=["gemini", "stub"], default=LLM_BACKEND,
+                        help="분석 백엔드 (stub: API 키 없이 결정적 로컬 응답)")
+    parser.add_argument("--profile", action="store_true",
+                        help="cProfile로 실행 전체를 프로파일링하여 메트릭 디렉터리에 .prof 저장")
+    parser.add_argument("--profiles", default=PROFILES_FILE, metavar="PATH",
+                        help="부서별 프로필 파일(JSON, profiles.py 참고). 지정하면 프로필마다 브리핑을 발송")
+    parser.add_argument("--daemon", action="store_true",
+                        help="상주 모드: 하루 동안 주기적으로 수집해 두고 DAEMON_SEND_TIME(KST)에 발송 (daemon.py 참고)")
+    parser.add_argument("--shard", type=parse_shard, metavar="I/N",
+                        help="검색어 N개 조각 중 I번째만 수집해 조각 파일(JSON)로 저장 (분석/발송 없음)")
+    parser.add_argument("--shard-output", metavar="PATH", help="--shard 결과 파일 경로 (기본: SHARD_DIR/shard-I-of-N.json)")
+    parser.add_argument("--merge", nargs="+", metavar="PATH",
+                        help="조각 파일(또는 디렉터리)을 병합해 중복 제거 후 분석/발송")
+    parser.add_argument("--shards", type=int, metavar="N",
+                        help="이 컴퓨터에서 샤드 N개를 동시에 수집한 뒤 병합해 분석/발송")
+    parser.add_argument("--trend-report", choices=sorted(TREND_REPORT_DAYS),
+                        help="발송 이력의 일별 집계로 최근 일주일(week)/한 달(month) 추세 보고서를 출력하고 종료")
+    args = parser.parse_args()
+    LLM_BACKEND = args.llm
+
+    # [수정 31] 추세 보고서는 저장된 집계만 읽으므로 환경변수 검증 없이 바로 실행
+    if args.trend_report:
+        try:
+            trend_profiles = load_run_profiles(args.profiles) if args.profiles else [default_profile()]
+        except (OSError, ValueError) as e:
+            print(f"❌ 프로필 파일 오류: {e}")
+            exit(1)
+        print_trend_reports(trend_profiles, args.trend_report)
+        exit(0)
+
+    # [수정 15] 오프라인 재생: RSS와 리다이렉트 해석을 캐시에서만 읽음
+    if args.offline:
+        feed_cache.offline = True
+        domain_resolver.offline = True
+        article_store = None  # 재실행은 그날의 수집을 그대로 재현해야 하므로 보고 이력으로 건너뛰지 않음
+        print("📴 오프라인 모드: 캐시된 RSS 피드로 실행합니다.")
+
+    # [수정 23] Gemini SDK/requests/feedparser는 첫 사용 시점에 로드되므로(llm_backend, feed_cache, domain_resolver)
+    # 아래 환경변수 검증과 주말 차단으로 끝나는 실행은 무거운 import 비용 없이 바로 종료
+
     # [수정 1] 4개 환경변수 사전 검증: 하나라도 누락 시 명확한 오류 메시지 후 종료
     required_env = {
         "GOOGLE_API_KEY": GOOGLE_API_KEY,
@@ -569,11 +1676,42 @@ if __name__ == "__main__":
         "EMAIL_PASSWORD": EMAIL_PASSWORD,
         "EMAIL_RECEIVERS": EMAIL_RECEIVERS
     }
+    if LLM_BACKEND == "stub":
+        required_env.pop("GOOGLE_API_KEY")  # [수정 17] 로컬 스텁은 API 키 불필요
+    if args.profiles:
+        required_env.pop("EMAIL_RECEIVERS")  # [수정 26] 수신자는 프로필별로 지정
+    if "email" not in OUTPUT_SINKS:
+        required_env.pop("EMAIL_RECEIVERS", None)  # [수정 32] 일일 보고 메일 없이 요약본/보관/웹훅으로만 내보내는 경우
+        if "exec_email" not in OUTPUT_SINKS:
+            required_env.pop("EMAIL_SENDER")
+            required_env.pop("EMAIL_PASSWORD")
     missing_vars = [key for key, val in required_env.items() if not val]
     if missing_vars:
         print(f"❌ 필수 환경변수가 설정되지 않았습니다: {', '.join(missing_vars)}")
         exit(1)
 
+    run_profile_list = None
+    if args.profiles:
+        try:
+            run_profile_list = load_run_profiles(args.profiles)
+        except (OSError, ValueError) as e:  # json.JSONDecodeError도 ValueError
+            print(f"❌ 프로필 파일 오류: {e}")
+            exit(1)
+        print(f"👥 프로필 {len(run_profile_list)}개: {', '.join(p.name for p in run_profile_list)}")
+
+    # [수정 32] 출력 대상 설정 오류는 수집을 시작하기 전에 확인
+    try:
+        build_output_sinks(default_profile())
+    except ValueError as e:
+        print(f"❌ 출력 대상 설정 오류: {e}")
+        exit(1)
+    print(f"📤 출력 대상: {', '.join(OUTPUT_SINKS)}")
+
+    # [수정 28] 상주 모드는 발송일/주말 판단을 스케줄러가 직접 처리
+    if args.daemon:
+        run_daemon(run_profile_list or [default_profile()])
+        exit(0)
+
     kst_now = get_korea_time()
     weekday = kst_now.weekday()  # 0:월요일 ~ 6:일요일
 
@@ -581,21 +1719,43 @@ if __name__ == "__main__":
     if weekday in [5, 6]:  # 5=토요일, 6=일요일
         print("오늘은 주말(토/일)이므로 뉴스 브리핑을 발송하지 않습니다. (월요일에 통합 발송 예정)")
     else:
-        # 2. 월요일 통합 크롤링 로직 판단
-        is_monday = (weekday == 0)
-        
-        # 월요일이면 3일(72시간), 그 외 평일이면 1일(24시간)
-        time_window_days = 3 if is_monday else 1
-        time_window_hours = 72 if is_monday else 24
-        
-        items = fetch_news(time_window_days, time_window_hours)
-        
-        if items:
-            ai_data = generate_analysis_data(items, is_monday)
-            if ai_data:
-                final_html = build_html_report(ai_data, items, is_monday)
-                send_email(final_html, is_monday)
+        # [수정 22] --profile: 전체 실행을 cProfile로 감싸 함수별 누적 시간 저장/출력
+        run_id = datetime.now(timezone.utc).strftime("run-%Y%m%dT%H%M%SZ")
+        if args.shard:
+            run_id += f"-shard-{args.shard[0]}-of-{args.shard[1]}"
+        profiler = None
+        if args.profile:
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+        run_budget.start()  # [수정 30] RUN_BUDGET_SECONDS 실행 예산 시작
+        try:
+            # [수정 33] 샤드 수집 / 병합
+            if args.shard:
+                run_shard(run_profile_list or [default_profile()], *args.shard,
+                          args.shard_output or shard_path(*args.shard), is_monday=(weekday == 0))
+            elif args.merge or args.shards:
+                shard_files = args.merge or run_local_shards(
+                    args.shards, args.profiles, ["--offline"] if args.offline else [])
+                merge_profiles = run_profile_list or [default_profile()]
+                try:
+                    collected, merged_monday = merge_shards(merge_profiles, shard_files)
+                except (OSError, ValueError, KeyError) as e:  # json.JSONDecodeError도 ValueError
+                    print(f"❌ 샤드 병합 실패: {e}")
+                    exit(1)
+                deliver_profiles(merge_profiles, collected, merged_monday)
+            # 2. 월요일 통합 크롤링 로직 판단
+            elif run_profile_list:
+                run_profiles(run_profile_list, is_monday=(weekday == 0))
             else:
-                print("❌ AI 분석 데이터 생성 실패")
-        else:
-            print("수집된 뉴스가 없습니다.")
+                run_daily_report(is_monday=(weekday == 0))
+        finally:
+            if profiler is not None:
+                import pstats
+                profiler.disable()
+                os.makedirs(METRICS_DIR, exist_ok=True)
+                profile_path = os.path.join(METRICS_DIR, run_id + ".prof")
+                profiler.dump_stats(profile_path)
+                print(f"🔬 프로파일 저장: {profile_path} (상위 25개 함수, 누적 시간 기준)")
+                pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+            finish_run_metrics(run_id)
@@ -0,0 +1,169 @@
+"""
+보고서 출력 대상(sink): 한 번 렌더링한 보고서를 여러 곳에 동시에 내보냅니다.
+
+- FunctionSink: 함수 하나로 내보내는 대상 (news_bot의 메일 발송)
+- FileArchiveSink: 날짜별 정적 HTML/텍스트 파일과 목록(index.html)을 디렉터리에 저장
+- WebhookSink: 요약(제목, 날짜, 시장 날씨, 텍스트 본문)을 JSON으로 HTTP POST
+
+dispatch()는 대상마다 스레드 하나로 동시에 실행하므로 전체 소요 시간은 가장 느린 대상 하나 수준입니다.
+대상마다 timeout(초, 재시도 포함 전체 시간)과 재시도 횟수를 따로 두고, 대상별 성공 여부를 SinkResult로 돌려줍니다.
+(WebhookSink의 request_timeout은 요청 한 건의 제한 시간으로, 느린 요청 하나가 timeout을 다 써서 재시도 기회가 없어지지 않도록
+timeout보다 짧게 둡니다.)
+publish(report, context, deadline)는 실패하면 예외를 던지고, deadline(time.monotonic 기준)은 넘지 않도록 씁니다.
+"""
+import html
+import json
+import os
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from deadline import DeadlineExceeded, call_with_retry, is_transient_error
+
+# day: 보고 날짜(YYYY-MM-DD), profile: 프로필 이름 (기본 프로필이면 None)
+ReportContext = namedtuple("ReportContext", ["day", "subject", "team", "profile", "is_monday", "weather_summary"])
+SinkResult = namedtuple("SinkResult", ["name", "ok", "attempts", "seconds", "error"])
+
+
+class SinkFailed(Exception):
+    """대상이 실패를 알려 온 경우 (재시도하지 않음: 대상이 자체적으로 재시도를 마친 결과)."""
+
+
+def _remaining(deadline, default):
+    if deadline is None:
+        return default
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise DeadlineExceeded("출력 대상 제한 시간 초과")
+    return min(default, remaining) if default else remaining
+
+
+class FunctionSink:
+    def __init__(self, name, publish, timeout=None, retry_attempts=1, required=True):
+        """publish(report, context, deadline) → 성공 여부(bool)."""
+        self.name = name
+        self._publish = publish
+        self.timeout = timeout
+        self.retry_attempts = retry_attempts
+        self.required = required
+
+    def publish(self, report, context, deadline=None):
+        if not self._publish(report, context, deadline):
+            raise SinkFailed(f"{self.name} 실패")
+
+
+class FileArchiveSink:
+    def __init__(self, directory, name="archive", timeout=30, retry_attempts=1, required=False):
+        self.directory = directory
+        self.name = name
+        self.timeout = timeout
+        self.retry_attempts = retry_attempts
+        self.required = required
+
+    def _folder(self, context):
+        if not context.profile:
+            return self.directory
+        return os.path.join(self.directory, re.sub(r"[^\w.-]+", "_", context.profile))
+
+    def publish(self, report, context, deadline=None):
+        """<디렉터리>[/프로필]/<날짜>.html, .txt 저장 후 index.html 갱신 (같은 날 다시 실행하면 덮어씀)."""
+        folder = self._folder(context)
+        os.makedirs(folder, exist_ok=True)
+        _atomic_write(os.path.join(folder, f"{context.day}.html"), report.html)
+        _atomic_write(os.path.join(folder, f"{context.day}.txt"), report.text)
+
+        days = sorted((name[:-5] for name in os.listdir(folder) if re.fullmatch(r"\d{4}-\d{2}-\d{2}\.html", name)),
+                      reverse=True)
+        links = "".join(f'<li><a href="{day}.html">{day}</a></li>' for day in days)
+        title = html.escape(f"{context.team} 시장 동향 보고 보관함")
+        _atomic_write(os.path.join(folder, "index.html"),
+                      f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title}</title></head>'
+                      f"<body><h1>{title}</h1><ul>{links}</ul></body></html>")
+
+
+class WebhookSink:
+    def __init__(self, url, name="webhook", timeout=60, request_timeout=10, retry_attempts=3, headers=None,
+                 include_html=False, required=False):
+        """
+        timeout: 재시도를 포함한 전체 제한 시간, request_timeout: POST 한 건의 제한 시간
+        include_html: 페이로드에 전체 HTML 보고서 포함 (기본은 텍스트 본문만)
+        """
+        self.url = url
+        self.name = name
+        self.timeout = timeout
+        self.request_timeout = request_timeout
+        self.retry_attempts = retry_attempts
+        self.headers = dict(headers or {})
+        self.include_html = include_html
+        self.required = required
+        self._session = None
+
+    def payload(self, report, context):
+        data = {
+            "date": context.day,
+            "subject": context.subject,
+            "team": context.team,
+            "profile": context.profile,
+            "weather_summary": context.weather_summary,
+            "text": report.text,
+        }
+        if self.include_html:
+            data["html"] = report.html
+        return data
+
+    def publish(self, report, context, deadline=None):
+        if self._session is None:
+            import requests  # 웹훅을 쓰지 않으면 로드하지 않음
+
+            self._session = requests.Session()
+        res = self._session.post(
+            self.url,
+            data=json.dumps(self.payload(report, context), ensure_ascii=False).encode("utf-8"),
+            headers={"Content-Type": "application/json; charset=utf-8", **self.headers},
+            timeout=_remaining(deadline, self.request_timeout),
+        )
+        res.raise_for_status()
+
+
+def _atomic_write(path, text):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def _run(sink, report, context, retry_base_delay, retry_max_delay):
+    started = time.monotonic()
+    deadline = started + sink.timeout if sink.timeout else None
+    attempts = [0]
+
+    def attempt():
+        attempts[0] += 1
+        return sink.publish(report, context, deadline)
+
+    def on_retry(attempt_no, delay, error):
+        print(f"⚠️ [{sink.name}] 실패, {delay:.1f}초 후 재시도 ({attempt_no}/{sink.retry_attempts - 1}): {error}")
+
+    try:
+        call_with_retry(
+            attempt,
+            attempts=sink.retry_attempts,
+            base_delay=retry_base_delay,
+            max_delay=retry_max_delay,
+            deadline=deadline,
+            retryable=is_transient_error,  # 연결/시간 초과, 5xx, 429만 (SinkFailed와 그 외 4xx는 그대로 실패)
+            on_retry=on_retry,
+        )
+    except Exception as e:
+        return SinkResult(sink.name, False, attempts[0], time.monotonic() - started, str(e) or type(e).__name__)
+    return SinkResult(sink.name, True, attempts[0], time.monotonic() - started, None)
+
+
+def dispatch(sinks, report, context, retry_base_delay=1.0, retry_max_delay=10.0):
+    """모든 대상에 동시에 내보내고 대상 순서대로 SinkResult 목록 반환 (한 대상의 실패가 다른 대상을 막지 않음)."""
+    if not sinks:
+        return []
+    with ThreadPoolExecutor(max_workers=len(sinks)) as pool:
+        futures = [pool.submit(_run, sink, report, context, retry_base_delay, retry_max_delay) for sink in sinks]
+        return [future.result() for future in futures]
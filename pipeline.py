@@ -0,0 +1,106 @@
+"""
+키워드 하나의 기사 수집 파이프라인 (지연 generator 단계).
+
+fetch_news의 중첩 루프를 "후보 스트림 → 단계 → 단계 → …" 형태로 나눈 것입니다.
+- 각 단계는 stage(ctx, candidates) → candidates 형태의 generator 함수이므로 따로 떼어 시험하거나
+  순서를 바꾸거나 교체할 수 있습니다.
+- 모든 단계가 지연 평가되므로, 소비 측이 필요한 건수(ctx.limit)를 채우고 멈추면
+  뒤쪽 기사는 어떤 검사(리다이렉트 해석 포함)도 거치지 않습니다.
+- 탈락은 ctx.reject(rule, candidate)로 한곳에서 기록합니다 (집계/저장소 기록은 on_reject 콜백).
+
+단계 구성 도구:
+- window(entries, size): 피드 앞쪽 size건만 후보로 만듦 (Google News 상위 30건)
+- reject_if(rule, predicate) / reject_by(rule_of): 조건에 맞는 후보를 탈락시키는 단계 생성
+- annotate(name, fn): 후보에 값을 계산해 붙이는 단계 생성 (예: 필터 판정)
+- lookahead(size_of, action): 뒤 단계가 필요로 하는 만큼 미리 모아 한 번에 처리 (예: 리다이렉트 동시 해석)
+"""
+from itertools import islice
+
+
+class Candidate:
+    """파이프라인을 흐르는 후보 기사. 단계들이 계산한 값(verdict 등)을 속성으로 붙여 나감."""
+
+    __slots__ = ("entry", "verdict", "published")
+
+    def __init__(self, entry):
+        self.entry = entry
+        self.verdict = None
+        self.published = None
+
+
+class KeywordContext:
+    """키워드 하나의 수집 상태 (단계들이 공유)."""
+
+    def __init__(self, keyword, limit=10, on_reject=None, **options):
+        self.keyword = keyword
+        self.limit = limit
+        self.accepted = 0
+        self.on_reject = on_reject
+        self.options = options  # 단계별 설정 (time_window_hours, now_utc 등)
+
+    @property
+    def remaining(self):
+        return max(0, self.limit - self.accepted)
+
+    def reject(self, rule, candidate):
+        if self.on_reject is not None:
+            self.on_reject(rule, candidate, self)
+
+
+def window(entries, size):
+    """피드 항목 앞쪽 size건을 후보로 변환 (목록 전체를 복사하지 않음)."""
+    return (Candidate(entry) for entry in islice(entries, size))
+
+
+def reject_by(rule_of):
+    """rule_of(ctx, candidate)가 규칙 이름을 반환하면 탈락시키는 단계."""
+    def stage(ctx, candidates):
+        for candidate in candidates:
+            rule = rule_of(ctx, candidate)
+            if rule:
+                ctx.reject(rule, candidate)
+                continue
+            yield candidate
+    stage.__name__ = getattr(rule_of, "__name__", "reject_by")
+    return stage
+
+
+def reject_if(rule, predicate):
+    """predicate(ctx, candidate)가 참이면 rule로 탈락시키는 단계."""
+    stage = reject_by(lambda ctx, candidate: rule if predicate(ctx, candidate) else None)
+    stage.__name__ = f"reject_{rule}"
+    return stage
+
+
+def annotate(name, fn):
+    """후보의 name 속성에 fn(ctx, candidate) 결과를 저장하는 단계."""
+    def stage(ctx, candidates):
+        for candidate in candidates:
+            setattr(candidate, name, fn(ctx, candidate))
+            yield candidate
+    stage.__name__ = f"annotate_{name}"
+    return stage
+
+
+def lookahead(size_of, action):
+    """
+    size_of(ctx)건씩 앞 단계에서 미리 꺼내 action(ctx, batch)을 한 번 호출한 뒤 하나씩 내보내는 단계.
+    뒤 단계가 아직 필요로 하는 건수만큼만 당겨 오므로 조기 종료 시 불필요한 일괄 작업이 생기지 않음.
+    """
+    def stage(ctx, candidates):
+        iterator = iter(candidates)
+        while True:
+            batch = list(islice(iterator, max(1, size_of(ctx))))
+            if not batch:
+                return
+            action(ctx, batch)
+            yield from batch
+    stage.__name__ = getattr(action, "__name__", "lookahead")
+    return stage
+
+
+def run(ctx, candidates, stages):
+    """단계들을 순서대로 연결한 후보 generator 반환 (소비하는 만큼만 평가)."""
+    for stage in stages:
+        candidates = stage(ctx, candidates)
+    return candidates
@@ -0,0 +1,132 @@
+"""
+부서별 브리핑 프로필.
+
+한 번의 실행으로 여러 부서(구매계약실, 안전, 해외사업 등)에 서로 다른 범위의 브리핑을 보낼 때
+부서마다 달라지는 설정(카테고리/검색어, 제외 목록, 프롬프트 페르소나, 수신자)을 묶어 둔 것입니다.
+
+프로필 파일(JSON) 형식:
+    {
+      "profiles": [
+        {
+          "name": "safety",                       # 필수, 영문/숫자 권장 (보고 이력 파일명/발송 기록 키에 사용)
+          "team": "안전보건실",                     # 메일 제목/머리말에 표시되는 부서명
+          "persona": "포스코이앤씨 안전보건실의 수석 애널리스트",
+          "focus": "현장 안전 업무",                 # 프롬프트의 "…에 가장 중요한 핵심 기사"
+          "insight_label": "안전보건실 대응 방안",
+          "category_map": {"중대재해": ["건설 중대재해처벌법", ...], ...},
+          "exclude_keywords": [...],              # 생략한 목록은 기본 설정(news_bot.py)을 그대로 사용
+          "receivers_env": "SAFETY_EMAIL_RECEIVERS" # 또는 "receivers": ["a@example.com", ...]
+        }
+      ]
+    }
+
+이름이 "default"인 프로필은 단일 실행과 같은 보고 이력/발송 기록을 이어서 사용합니다.
+예시는 profiles.example.json 참고.
+"""
+import hashlib
+import json
+import os
+
+from filter_engine import FilterEngine
+
+# 프로필 파일에서 덮어쓸 수 있는 설정 (생략하면 기본 프로필 값을 상속)
+PROFILE_FIELDS = (
+    "team", "persona", "focus", "insight_label", "category_map",
+    "exclude_keywords", "video_keywords", "korean_companies", "overseas_sources", "blocked_domains",
+)
+DEFAULT_PROFILE_NAME = "default"
+
+
+def parse_receivers(value):
+    """쉼표로 구분된 수신자 문자열 → 목록 (끝 쉼표 등으로 생긴 빈 항목 제외)."""
+    return [r.strip() for r in (value or "").split(",") if r.strip()]
+
+
+def filter_signature(exclude_keywords, video_keywords, korean_companies, overseas_sources, blocked_domains):
+    """필터 목록 서명: 목록이 바뀌면 저장된 차단 판정을 재사용하지 않고 다시 판정."""
+    return hashlib.sha1(json.dumps(
+        [exclude_keywords, video_keywords, korean_companies, overseas_sources, blocked_domains],
+        ensure_ascii=False,
+    ).encode("utf-8")).hexdigest()[:12]
+
+
+class Profile:
+    def __init__(self, name, team, persona, focus, insight_label, category_map,
+                 exclude_keywords, video_keywords, korean_companies, overseas_sources, blocked_domains,
+                 receivers=(), keywords=None, filter_engine=None, article_store=None):
+        self.name = name
+        self.team = team
+        self.persona = persona
+        self.focus = focus
+        self.insight_label = insight_label
+        self.category_map = category_map
+        self.exclude_keywords = exclude_keywords
+        self.video_keywords = video_keywords
+        self.korean_companies = korean_companies
+        self.overseas_sources = overseas_sources
+        self.blocked_domains = blocked_domains
+        self.receivers = list(receivers)
+        self.keywords = list(keywords) if keywords is not None else [k for ks in category_map.values() for k in ks]
+        self.filter_engine = filter_engine or FilterEngine(
+            exclude_keywords, video_keywords, korean_companies, overseas_sources)
+        self.filter_signature = filter_signature(
+            exclude_keywords, video_keywords, korean_companies, overseas_sources, blocked_domains)
+        self.article_store = article_store  # 프로필별 보고 이력 (None이면 사용 안 함)
+
+        self._category_of = {}
+        for category, keywords_in_category in category_map.items():
+            for keyword in keywords_in_category:
+                self._category_of.setdefault(keyword, category)  # 여러 카테고리에 있으면 먼저 나온 카테고리
+
+    @property
+    def is_default(self):
+        return self.name == DEFAULT_PROFILE_NAME
+
+    def get_category(self, keyword):
+        return self._category_of.get(keyword, "기타")
+
+    def scoped(self, key):
+        """메트릭 섹션/발송 기록 키에 프로필 이름을 붙임 (기본 프로필은 기존 키 그대로)."""
+        return key if self.is_default else f"{key}[{self.name}]"
+
+    def derive(self, name, receivers, **overrides):
+        """이 프로필을 기본값으로 삼아 일부 설정만 바꾼 새 프로필 (필터 엔진/저장소는 새로 만듦)."""
+        settings = {field: getattr(self, field) for field in PROFILE_FIELDS}
+        settings.update(overrides)
+        keywords = None if "category_map" in overrides else self.keywords
+        return Profile(name, receivers=receivers, keywords=keywords, **settings)
+
+
+def load_profiles(path, base):
+    """
+    프로필 파일을 읽어 Profile 목록 반환. 생략한 설정은 base(기본 프로필)에서 상속.
+    형식 오류, 중복 이름, 수신자 누락은 ValueError.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    entries = data.get("profiles") if isinstance(data, dict) else data
+    if not entries:
+        raise ValueError(f"{path}: profiles 목록이 비어 있습니다")
+
+    profiles = []
+    for entry in entries:
+        name = entry.get("name")
+        if not name:
+            raise ValueError(f"{path}: name이 없는 프로필이 있습니다")
+        if any(p.name == name for p in profiles):
+            raise ValueError(f"{path}: 프로필 이름 중복 '{name}'")
+        unknown = set(entry) - set(PROFILE_FIELDS) - {"name", "receivers", "receivers_env"}
+        if unknown:
+            raise ValueError(f"프로필 '{name}': 알 수 없는 설정 {', '.join(sorted(unknown))}")
+
+        receivers = entry.get("receivers")
+        if isinstance(receivers, str):
+            receivers = parse_receivers(receivers)
+        if not receivers and entry.get("receivers_env"):
+            receivers = parse_receivers(os.environ.get(entry["receivers_env"]))
+        if not receivers:
+            raise ValueError(f"프로필 '{name}': 수신자가 없습니다 (receivers 또는 receivers_env 확인)")
+
+        overrides = {field: entry[field] for field in PROFILE_FIELDS if field in entry}
+        profiles.append(base.derive(name, receivers, **overrides))
+    return profiles
@@ -0,0 +1,147 @@
+"""
+검색어 묶음(OR 쿼리) 계획과 결과 배정.
+
+검색어마다 RSS를 따로 요청하면 요청 수가 검색어 수만큼 늘어납니다.
+- plan_queries: 검색어 여러 개를 "(A) OR (B) OR (C)" 쿼리 하나로 묶음
+  (묶음당 검색어 수, URL 길이, Google 검색 단어 수 상한 이내)
+- assign_entries: 묶음 결과의 각 기사를 제목 기준으로 원래 검색어에 배정
+  1) 검색어의 단어가 모두 제목에 있으면 그 검색어(여러 개면 모두)
+  2) 일부만 있으면 묶음 안에서 흔하지 않은 단어에 가중치를 둔 점수가 가장 높은 검색어 하나
+  3) 하나도 없으면(본문에서 일치한 기사) 묶음 검색어에 차례로 나눠 배정
+- PlannedFeed: 묶음 요청 하나의 future를 감싸 검색어별 피드(KeywordFeed)를 돌려줌.
+  fetch_news는 검색어별 피드를 기존과 같은 방식(키워드당 상위 30건, 10건 상한)으로 처리합니다.
+"""
+import threading
+from collections import Counter, namedtuple
+
+QueryGroup = namedtuple("QueryGroup", ["keywords", "query"])
+
+MATCH_FULL = "full"
+MATCH_PARTIAL = "partial"
+MATCH_FALLBACK = "fallback"
+
+
+def combine_keywords(keywords):
+    """검색어 목록 → Google News OR 쿼리 (검색어 하나면 그대로 두어 묶지 않은 요청과 같은 URL)."""
+    if len(keywords) == 1:
+        return keywords[0]
+    return " OR ".join(f"({keyword})" for keyword in keywords)
+
+
+def plan_queries(keywords, batch_size, build_url=None, max_url_length=2000, max_words=32, reserved_words=0):
+    """
+    검색어를 순서대로 묶어 QueryGroup 목록 반환.
+    build_url(query): 실제 요청 URL (길이 검사용), reserved_words: 쿼리에 항상 붙는 단어 수 (제외어, when: 등).
+    한 검색어만으로 상한을 넘으면 그 검색어는 단독 요청.
+    """
+    groups = []
+    current = []
+    for keyword in dict.fromkeys(keywords):  # 순서 유지 중복 제거
+        candidate = current + [keyword]
+        query = combine_keywords(candidate)
+        words = len(query.split()) + reserved_words
+        too_long = build_url is not None and len(build_url(query)) > max_url_length
+        if current and (len(candidate) > batch_size or words > max_words or too_long):
+            groups.append(QueryGroup(tuple(current), combine_keywords(current)))
+            candidate = [keyword]
+        current = candidate
+    if current:
+        groups.append(QueryGroup(tuple(current), combine_keywords(current)))
+    return groups
+
+
+class EntryMatcher:
+    """묶음 하나의 검색어 단어 색인 (묶음 안에서 흔한 단어일수록 부분 일치 점수가 낮음)."""
+
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+        self.terms = {keyword: keyword.lower().split() for keyword in self.keywords}
+        doc_freq = Counter(term for terms in self.terms.values() for term in set(terms))
+        self.weight = {term: 1.0 / count for term, count in doc_freq.items()}
+
+    def match(self, title):
+        """제목 → (배정할 검색어 목록, 일치 종류). 아무 단어도 없으면 ([], MATCH_FALLBACK)."""
+        text = title.lower()
+        full = []
+        best, best_score = None, 0.0
+        for keyword in self.keywords:
+            terms = self.terms[keyword]
+            found = [term for term in terms if term in text]
+            if len(found) == len(terms):
+                full.append(keyword)
+                continue
+            score = sum(self.weight[term] for term in found) / len(terms)
+            if score > best_score:
+                best, best_score = keyword, score
+        if full:
+            return full, MATCH_FULL
+        if best is not None:
+            return [best], MATCH_PARTIAL
+        return [], MATCH_FALLBACK
+
+
+def assign_entries(entries, keywords, stats=None):
+    """
+    묶음 결과 항목을 검색어별 목록으로 나눠 {검색어: [entry, ...]} 반환 (피드 순서 유지).
+    stats(Counter)가 있으면 일치 종류별 건수를 누적.
+    """
+    matcher = EntryMatcher(keywords)
+    assigned = {keyword: [] for keyword in keywords}
+    fallback_turn = 0
+    for entry in entries:
+        matched, kind = matcher.match(getattr(entry, "title", "") or "")
+        if not matched:
+            matched = [keywords[fallback_turn % len(keywords)]]
+            fallback_turn += 1
+        for keyword in matched:
+            assigned[keyword].append(entry)
+        if stats is not None:
+            stats[kind] += 1
+    return assigned
+
+
+class KeywordFeed:
+    """묶음 피드에서 검색어 하나에 배정된 항목만 담은 피드 (feedparser 결과처럼 entries/get 사용)."""
+
+    def __init__(self, entries, source):
+        self.entries = entries
+        self.bozo_exception = getattr(source, "bozo_exception", None)
+        self._source = source
+
+    def get(self, key, default=None):
+        return self._source.get(key, default)
+
+
+class PlannedFeed:
+    """묶음 요청 하나의 future. 결과는 처음 필요할 때 한 번만 검색어별로 나눔."""
+
+    def __init__(self, group, future, stats=None):
+        self.group = group
+        self.future = future
+        self.stats = stats
+        self._lock = threading.Lock()
+        self._feeds = None
+
+    def feed_for(self, keyword):
+        with self._lock:
+            if self._feeds is None:
+                feed = self.future.result()
+                if len(self.group.keywords) == 1:
+                    self._feeds = {self.group.keywords[0]: feed}
+                else:
+                    assigned = assign_entries(feed.entries, self.group.keywords, self.stats)
+                    self._feeds = {k: KeywordFeed(entries, feed) for k, entries in assigned.items()}
+        return self._feeds[keyword]
+
+    def for_keyword(self, keyword):
+        """검색어 하나의 결과를 future처럼 꺼내는 객체 (result())."""
+        return _KeywordResult(self, keyword)
+
+
+class _KeywordResult:
+    def __init__(self, planned, keyword):
+        self._planned = planned
+        self._keyword = keyword
+
+    def result(self):
+        return self._planned.feed_for(self._keyword)
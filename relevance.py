@@ -0,0 +1,190 @@
+"""
+AI 분석 전 로컬 관련도 순위.
+
+필터를 통과한 기사를 모두 프롬프트에 넣으면 관련성이 낮은 제목에도 토큰과 시간이 들고,
+중요한 기사가 묻힐 수 있습니다. 여기서는 LLM 호출 전에 제목만으로 점수를 매겨
+카테고리별 상위 K건만 AI 분석에 넘깁니다 (보고서의 헤드라인 목록에는 전체 기사가 그대로 나감).
+
+점수 = similarity_weight × 카테고리 유사도 + company_weight × 국내 건설사 언급 + recency_weight × 최신성
+- 카테고리 유사도: 문자 n-gram(기본 2~3글자) TF-IDF 코사인 유사도.
+  카테고리마다 카테고리명 + 검색어를 씨앗 문서로 삼고, IDF는 이번 실행의 제목들로 계산
+  (모든 제목에 흔한 n-gram일수록 가중치가 낮음). 어휘는 씨앗 n-gram으로 한정하므로 행렬은 기사 수 × 수백 열.
+- 국내 건설사 언급: KOREAN_COMPANIES 중 하나라도 제목에 있으면 1
+- 최신성: 0.5 ** (경과 시간 / 반감기), 발행 시각이 없으면 0
+
+n-gram 추출(코드포인트 배열 → 정수 해시 → 정렬 어휘 검색)부터 가중치/정규화/유사도/순위까지 모두 NumPy 배열 연산으로
+제목 전체를 한 번에 처리합니다.
+"""
+import re
+from datetime import datetime, timezone
+
+import numpy as np
+
+_SPACES = re.compile(r"\s+")
+_CODE_BITS = 21  # 유니코드 코드포인트 비트 수: n-gram 해시 = 코드포인트를 21비트씩 이어 붙인 정수 (3글자까지 int64)
+_OOV_HASH_BITS = 43  # 어휘 밖 n-gram 빈도 집계용 키: 상위 21비트 제목 번호 + 하위 43비트 섞은 해시
+_MIX = np.uint64(0x9E3779B97F4A7C15)  # 곱셈 해시 상수 (홀수라 64비트에서 일대일)
+
+
+def _normalize(text):
+    """소문자 + 공백 정규화 (단어 경계를 알 수 있도록 앞뒤에 공백 한 칸). 구분자로 쓰는 \\x00은 제거."""
+    return " " + _SPACES.sub(" ", text.replace("\x00", "").lower()).strip() + " "
+
+
+def _gram_hash(gram):
+    value = 0
+    for ch in gram:
+        value = (value << _CODE_BITS) | ord(ch)
+    return value
+
+
+def char_ngrams(text, ngram_range=(2, 3)):
+    """정규화한 텍스트의 문자 n-gram 목록."""
+    text = _normalize(text)
+    low, high = ngram_range
+    return [text[i:i + n] for n in range(low, high + 1) for i in range(len(text) - n + 1)]
+
+
+class RelevanceRanker:
+    def __init__(self, category_map, companies=(), ngram_range=(2, 3), similarity_weight=1.0,
+                 company_weight=0.3, recency_weight=0.2, recency_half_life_hours=12.0):
+        self.categories = list(category_map)
+        self.companies = list(companies)
+        self.ngram_range = ngram_range
+        self.similarity_weight = similarity_weight
+        self.company_weight = company_weight
+        self.recency_weight = recency_weight
+        self.recency_half_life_hours = recency_half_life_hours
+
+        # 씨앗 문서 (카테고리명 + 검색어) → 어휘와 카테고리 × 어휘 빈도 행렬
+        self.vocab = {}
+        seed_rows = []
+        for category, keywords in category_map.items():
+            grams = char_ngrams(" ".join([category.replace("/", " ")] + list(keywords)), ngram_range)
+            seed_rows.append([self.vocab.setdefault(g, len(self.vocab)) for g in grams])
+        self._seed_counts = np.zeros((len(seed_rows), len(self.vocab)), dtype=np.float32)
+        for row, columns in enumerate(seed_rows):
+            np.add.at(self._seed_counts[row], columns, 1.0)
+        if ngram_range[1] * _CODE_BITS > 63:
+            raise ValueError("n-gram 길이는 3글자까지 지원합니다")
+        hashes = np.array([_gram_hash(g) for g in self.vocab], dtype=np.int64)
+        order = np.argsort(hashes)
+        self._vocab_hashes = hashes[order]
+        self._vocab_columns = np.array(list(self.vocab.values()), dtype=np.int64)[order]
+
+    def _title_counts(self, titles):
+        """
+        제목 × 어휘 빈도 행렬과 제목별 어휘 밖 n-gram 빈도 제곱합 (코사인 정규화용).
+        모든 제목을 구분자(\\x00)로 이어 붙인 코드포인트 배열에서 n-gram 해시를 한 번에 계산하고
+        정렬한 어휘 해시에서 searchsorted로 찾음 (제목마다 파이썬으로 n-gram을 만들지 않음).
+        제목 수는 2^21(약 200만)건까지.
+        """
+        n_titles, n_vocab = len(titles), len(self.vocab)
+        # _normalize를 제목마다 적용한 것과 같은 결과를 문자열 하나에 대한 연산으로 (제목 사이는 " \\x00 ")
+        text = " \x00 ".join(title.replace("\x00", "") for title in titles).lower()
+        text = " " + " ".join(text.split()) + " "  # str.split()은 정규식 \\s+와 같은 공백 문자 기준, 더 빠름
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+        is_sep = codes == 0
+        title_of = np.cumsum(is_sep) - is_sep  # 위치별 제목 번호
+        sep_before = np.concatenate([[0], np.cumsum(is_sep)])
+
+        vocab_hits = []
+        oov_sq = np.zeros(n_titles, dtype=np.float64)
+        low, high = self.ngram_range
+        for n in range(low, high + 1):
+            if len(codes) < n:
+                continue
+            starts = np.arange(len(codes) - n + 1)
+            valid = sep_before[starts + n] == sep_before[starts]  # 구분자를 걸치는 n-gram 제외
+            hashes = np.zeros(len(starts), dtype=np.int64)
+            for j in range(n):
+                hashes = (hashes << _CODE_BITS) | codes[j:j + len(starts)]
+            hashes, owners = hashes[valid], title_of[starts[valid]]
+
+            if n_vocab:
+                position = np.minimum(np.searchsorted(self._vocab_hashes, hashes), n_vocab - 1)
+                found = self._vocab_hashes[position] == hashes
+                vocab_hits.append(owners[found] * n_vocab + self._vocab_columns[position[found]])
+            else:
+                found = np.zeros(len(hashes), dtype=bool)
+
+            # 어휘 밖 n-gram: 제목별 (n-gram 빈도)² 합. (제목 번호, 섞은 해시)를 정수 하나로 묶어 한 번 정렬하고
+            # 같은 값이 이어지는 길이를 빈도로 사용 (섞은 해시 43비트: 한 제목 안 충돌 확률은 무시할 수준)
+            keys = (owners[~found].astype(np.uint64) << np.uint64(_OOV_HASH_BITS)) | (
+                (hashes[~found].astype(np.uint64) * _MIX) >> np.uint64(64 - _OOV_HASH_BITS))
+            if len(keys):
+                keys.sort()
+                run_start = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+                run_length = np.diff(np.append(run_start, len(keys))).astype(np.float64)
+                oov_sq += np.bincount((keys[run_start] >> np.uint64(_OOV_HASH_BITS)).astype(np.intp),
+                                      weights=run_length ** 2, minlength=n_titles)
+
+        hits = np.concatenate(vocab_hits) if vocab_hits else np.zeros(0, dtype=np.int64)
+        counts = np.bincount(hits, minlength=n_titles * n_vocab).astype(np.float32)
+        return counts.reshape(n_titles, n_vocab), oov_sq.astype(np.float32)
+
+    def similarity(self, titles):
+        """제목 × 카테고리 TF-IDF 코사인 유사도 행렬 (0~1)."""
+        if not titles or not self.vocab:
+            return np.zeros((len(titles), len(self.categories)), dtype=np.float32)
+        counts, oov_sq = self._title_counts(titles)
+        doc_freq = np.count_nonzero(counts, axis=0)
+        idf = np.log((1.0 + len(titles)) / (1.0 + doc_freq)) + 1.0
+        # 어휘 밖 n-gram은 이번 실행의 어떤 씨앗과도 겹치지 않으므로 내적에는 기여하지 않고,
+        # 제목 벡터 길이에만 (가장 드문 n-gram과 같은 IDF로) 반영
+        oov_idf = np.log(1.0 + len(titles)) + 1.0
+        weighted = counts * idf
+        title_norm = np.sqrt((weighted ** 2).sum(axis=1) + oov_sq * oov_idf ** 2)
+        seeds = self._seed_counts * idf
+        seed_norm = np.linalg.norm(seeds, axis=1)
+        sim = weighted @ seeds.T
+        sim /= np.maximum(title_norm, 1e-9)[:, None]
+        sim /= np.maximum(seed_norm, 1e-9)[None, :]
+        return sim
+
+    def score(self, articles, now_utc=None):
+        """기사(ArticleRecord 목록) 순서대로 점수 배열. 유사도는 기사가 속한 카테고리 기준."""
+        records = list(articles)
+        if not records:
+            return np.zeros(0, dtype=np.float32)
+        now_utc = now_utc or datetime.now(timezone.utc)
+        sim = self.similarity([item.title for item in records])
+
+        category_index = {category: i for i, category in enumerate(self.categories)}
+        columns = np.array([category_index.get(item.category, -1) for item in records])
+        own = np.where(
+            columns >= 0,
+            sim[np.arange(len(records)), np.maximum(columns, 0)],
+            sim.max(axis=1) if sim.shape[1] else 0.0,  # 목록에 없는 카테고리("기타")는 가장 가까운 카테고리 기준
+        )
+
+        company = np.array([any(c in item.title for c in self.companies) for item in records], dtype=np.float32)
+
+        age_hours = np.array([
+            (now_utc - item.published).total_seconds() / 3600.0 if item.published else np.inf
+            for item in records
+        ])
+        recency = np.power(0.5, np.maximum(age_hours, 0.0) / self.recency_half_life_hours)
+
+        return (self.similarity_weight * own
+                + self.company_weight * company
+                + self.recency_weight * recency)
+
+    def top_k(self, articles, k, now_utc=None):
+        """
+        카테고리별 점수 상위 k건의 ID 집합. 동점이면 수집 순서가 앞선 기사 우선.
+        k가 0 이하이면 전체.
+        """
+        records = list(articles)
+        if k <= 0:
+            return {item.id for item in records}
+        scores = self.score(records, now_utc)
+        selected = set()
+        buckets = {}
+        for position, item in enumerate(records):
+            buckets.setdefault(item.category, []).append(position)
+        for positions in buckets.values():
+            positions = np.asarray(positions)
+            order = np.argsort(-scores[positions], kind="stable")[:k]
+            selected.update(records[p].id for p in positions[order])
+        return selected
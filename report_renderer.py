@@ -0,0 +1,261 @@
+"""
+보고서 렌더러 (미리 컴파일한 템플릿).
+
+- 정적인 <head>/CSS는 import 시 한 번만 만들어 두고 재사용
+- 카드/단신 조각은 미리 만든 포맷 템플릿으로 렌더링한 뒤 list-join으로 결합 (반복 += 연결 없음)
+- risk 색상은 인라인 스타일 대신 .risk-* 클래스 하나로 관리
+- 분류된 기사 목록을 한 번만 순회하면서 전체 HTML / Executive Summary 전용 HTML / 텍스트 버전을 함께 생성
+"""
+import html
+import random
+from collections import namedtuple
+
+RISK_ORDER = {"Critical": 0, "Warning": 1, "Info": 2}
+
+RenderedReport = namedtuple("RenderedReport", ["html", "exec_html", "text"])
+
+REPORT_CSS = """        body { font-family: 'Pretendard', 'Malgun Gothic', sans-serif; line-height: 1.6; color: #333; background-color: #f2f4f7; margin: 0; padding: 0; }
+        .email-container { max-width: 850px; margin: 0 auto; background-color: #ffffff; border-radius: 16px; overflow: hidden; box-shadow: 0 4px 15px rgba(0,0,0,0.05); }
+        .header { background-color: #0054a6; color: #ffffff; padding: 40px 50px; }
+        .content { padding: 50px; }
+        
+        .weather-box { background-color: #eaf4fc; padding: 25px; border-radius: 12px; margin-bottom: 50px; border: 1px solid #dbeafe; }
+        .weather-title { margin: 0 0 10px 0; color: #0054a6; font-size: 20px; font-weight: 700; }
+        
+        .cat-title { font-size: 22px; color: #111; margin: 60px 0 20px 0; border-left: 5px solid #0054a6; padding-left: 15px; font-weight: 700; }
+        
+        .card { background-color: #ffffff; border: 1px solid #eaecf0; border-radius: 16px; padding: 30px; margin-bottom: 20px; box-shadow: 0 4px 6px rgba(0,0,0,0.02); }
+        .card-title { font-size: 20px; font-weight: 700; color: #101828; margin-bottom: 12px; line-height: 1.4; word-break: keep-all; }
+        .card-body { font-size: 16px; color: #475467; line-height: 1.7; margin-bottom: 20px; word-break: keep-all; }
+        
+        .insight-table { width: 100%; border-collapse: separate; border-spacing: 0; margin-bottom: 20px; border-radius: 8px; }
+        .insight-label { padding: 15px; width: 1%; white-space: nowrap; vertical-align: top; font-weight: 700; font-size: 15px; }
+        .insight-text { padding: 15px; font-size: 15px; line-height: 1.6; vertical-align: top; word-break: keep-all; }
+        
+        .risk-Critical, .exec-badge-Critical { background-color: #fdecea; color: #d32f2f; }
+        .risk-Warning, .exec-badge-Warning { background-color: #fff4e5; color: #ed6c02; }
+        .risk-Info, .exec-badge-Info { background-color: #f0f9ff; color: #0288d1; }
+        
+        .btn { display: inline-block; background-color: #fff; color: #344054; border: 1px solid #d0d5dd; padding: 8px 16px; text-decoration: none; border-radius: 6px; font-size: 13px; font-weight: 600; cursor: pointer; }
+        
+        .headline-box { background-color: #f9fafb; padding: 20px; border-radius: 8px; margin-top: 10px; }
+        .headline-title { font-size: 15px; font-weight: 700; color: #667085; margin-bottom: 10px; }
+        .headline-item { margin-bottom: 8px; font-size: 14px; color: #555; list-style: none; }
+        .headline-link { text-decoration: none; color: #4b5563; transition: color 0.2s; word-break: keep-all; cursor: pointer; }
+        .headline-link:hover { color: #0054a6; text-decoration: underline; }
+
+        .exec-summary { background-color: #f8f9ff; border: 1px solid #c7d2fe; border-radius: 12px; padding: 25px 30px; margin-bottom: 50px; }
+        .exec-summary-title { margin: 0 0 16px 0; color: #3730a3; font-size: 16px; font-weight: 700; letter-spacing: 0.03em; }
+        .exec-row { display: flex; align-items: flex-start; gap: 14px; padding: 10px 0; border-bottom: 1px solid #e0e7ff; }
+        .exec-row:last-child { border-bottom: none; padding-bottom: 0; }
+        .exec-num { font-size: 20px; font-weight: 800; color: #4f46e5; min-width: 28px; line-height: 1.4; }
+        .exec-badge { font-size: 11px; font-weight: 700; padding: 2px 8px; border-radius: 20px; white-space: nowrap; margin-top: 3px; }
+        .exec-text { font-size: 15px; color: #1e1b4b; font-weight: 600; line-height: 1.5; word-break: keep-all; }
+
+        .easter-egg-wrapper { text-align: center; margin: 30px 0; }
+        .easter-egg {
+            display: inline-block;
+            font-size: 12px;
+            color: transparent; 
+            cursor: help;
+            transition: all 0.5s ease;
+            user-select: all;
+        }
+        .easter-egg:hover {
+            color: #ff6b6b;
+            transform: scale(1.1) rotate(2deg);
+            font-weight: bold;
+        }
+"""
+
+# 정적 부분: import 시 한 번만 생성
+HTML_HEAD = (
+    "\n    <!DOCTYPE html>\n    <html>\n    <head>\n    <style>\n"
+    + REPORT_CSS
+    + "    </style>\n    </head>\n    <body>\n        <div class=\"email-container\">"
+)
+
+HTML_FOOTER = """
+                <div style="margin-top: 60px; text-align: center; color: #98a2b3; font-size: 13px; border-top: 1px solid #eee; padding-top: 20px;">
+                    <p>본 리포트는 AI Agent 시스템에 의해 실시간으로 생성되었습니다.</p>
+                    <p>문의: 구매계약기획그룹 송승호 프로 | © POSCO E&C</p>
+                </div>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+
+EGG_HTML = """
+    <div class="easter-egg-wrapper">
+        <div class="easter-egg">
+            오? 저를 발견하셨군요! 연락주시면 커피 한잔 사드릴께요
+        </div>
+    </div>
+    """
+
+# 동적 조각: 포맷 메서드를 미리 바인딩해 두고 호출만 함
+_render_header = """
+            <div class="header">
+                <h1 style="margin:0; font-size:28px;">Daily Market & Risk Briefing</h1>
+                <div style="margin-top:10px; opacity:0.9;">POSCO E&C {team} | {today_str}</div>
+            </div>
+            <div class="content">
+                <div class="weather-box">
+                    <h2 class="weather-title">🌤️ Market Weather Summary</h2>
+                    <div style="font-size: 17px;">{weather_summary}</div>
+                </div>
+                {exec_summary}
+    """.format
+
+_render_exec_summary = """
+    <div class="exec-summary">
+        <div class="exec-summary-title">📋 Executive Summary — 오늘의 핵심 3가지</div>
+        {rows}
+    </div>""".format
+
+_render_exec_row = """
+        <div class="exec-row">
+            <div class="exec-num">{num}</div>
+            <div>
+                <span class="exec-badge exec-badge-{risk}">{risk}</span>
+                <div class="exec-text" style="margin-top:4px;">{title}</div>
+            </div>
+        </div>""".format
+
+_render_category_title = '<div class="cat-title">[{category}]</div>'.format
+
+_render_card = """
+                <div class="card">
+                    <div class="card-title">{title}</div>
+                    <div class="card-body">{summary}</div>
+                    
+                    <table class="insight-table risk-{risk}">
+                        <tr>
+                            <td class="insight-label">💡 Insight:</td>
+                            <td class="insight-text">{insight}</td>
+                        </tr>
+                    </table>
+                    <div style="text-align: right;">
+                        <a href="{link}" class="btn" target="_blank" rel="noopener noreferrer">🔗 원문 기사 보기</a>
+                    </div>
+                </div>
+                """.format
+
+HEADLINE_BOX_OPEN = """
+            <div class="headline-box">
+                <div class="headline-title">📌 관련 주요 단신</div>
+                <ul style="padding-left: 20px; margin: 0;">
+            """
+HEADLINE_BOX_CLOSE = "</ul></div>"
+
+_render_headline = """
+                <li class="headline-item">
+                    <a href="{link}" class="headline-link" target="_blank" rel="noopener noreferrer">{title}</a>
+                </li>
+                """.format
+
+
+def top_exec_cards(ai_data, limit=3):
+    """risk_level 우선순위(Critical→Warning→Info)로 정렬한 상위 카드."""
+    return sorted(
+        ai_data.get('selected_cards', []),
+        key=lambda c: RISK_ORDER.get(c.get('risk_level', 'Info'), 2)
+    )[:limit]
+
+
+def _title_of(articles, article_id):
+    item = articles.get(article_id)
+    return item.title if item is not None else '제목 없음'
+
+
+def render_exec_summary(ai_data, articles):
+    """Executive Summary 블록 (articles: ArticleCollection). 선정 카드가 없으면 빈 문자열."""
+    cards = top_exec_cards(ai_data)
+    if not cards:
+        return ''
+    rows = [
+        _render_exec_row(
+            num=idx,
+            risk=card.get('risk_level', 'Info'),
+            title=html.escape(_title_of(articles, card['id'])),
+        )
+        for idx, card in enumerate(cards, start=1)
+    ]
+    return _render_exec_summary(rows="".join(rows))
+
+
+def render_report(ai_data, articles, today_str, rng=random, team="구매계약실"):
+    """
+    ArticleCollection의 카테고리 버킷(카테고리 순서, 수집 순서 유지)을 한 번 순회하여 세 가지 버전을 생성.
+    - html: 전체 보고서 (카드 + 단신 + 이스터에그)
+    - exec_html: 시장 날씨 요약 + Executive Summary만 담은 짧은 보고서
+    - text: 메일 클라이언트용 plain-text 버전
+    team: 머리말에 표시할 부서명 (프로필별)
+    """
+    selected_map = {card['id']: card for card in ai_data.get('selected_cards', [])}
+    weather_summary = ai_data.get('weather_summary', '시장 분석 데이터 없음')
+
+    exec_html = render_exec_summary(ai_data, articles)
+    header_html = _render_header(team=team, today_str=today_str, weather_summary=weather_summary, exec_summary=exec_html)
+
+    text_lines = [
+        f"Daily Market & Risk Briefing | POSCO E&C {team} | {today_str}",
+        "",
+        "■ Market Weather Summary",
+        weather_summary,
+    ]
+    exec_cards = top_exec_cards(ai_data)
+    if exec_cards:
+        text_lines += ["", "■ Executive Summary — 오늘의 핵심 3가지"]
+        for idx, card in enumerate(exec_cards, start=1):
+            title = _title_of(articles, card['id'])
+            text_lines.append(f"{idx}. [{card.get('risk_level', 'Info')}] {title}")
+
+    content_parts = []
+    for cat_name, items in articles.by_category().items():
+        parts = [_render_category_title(category=cat_name)]
+        headline_parts = []
+        text_lines += ["", f"■ [{cat_name}]"]
+        headline_lines = []
+
+        for item in items:
+            # [수정 5] RSS에서 수집된 뉴스 제목을 HTML에 삽입 전 이스케이프 처리
+            safe_title = html.escape(item.title)
+            safe_link = html.escape(item.link, quote=True)
+            card = selected_map.get(item.id)
+            if card is not None:
+                risk = card.get('risk_level', 'Info')
+                parts.append(_render_card(
+                    title=safe_title, summary=card['summary'], insight=card['insight'],
+                    risk=risk if risk in RISK_ORDER else 'Info', link=safe_link,
+                ))
+                text_lines += [
+                    f"▶ [{risk}] {item.title}",
+                    f"   {card['summary']}",
+                    f"   💡 Insight: {card['insight']}",
+                    f"   {item.link}",
+                ]
+            else:
+                headline_parts.append(_render_headline(title=safe_title, link=safe_link))
+                headline_lines.append(f" - {item.title} ({item.link})")
+
+        if headline_parts:
+            parts.append(HEADLINE_BOX_OPEN)
+            parts.extend(headline_parts)
+            parts.append(HEADLINE_BOX_CLOSE)
+            text_lines.append("📌 관련 주요 단신")
+            text_lines.extend(headline_lines)
+
+        content_parts.append("".join(parts))
+
+    if len(content_parts) > 1:
+        insert_pos = rng.randint(1, len(content_parts))
+        content_parts.insert(insert_pos, EGG_HTML)
+    else:
+        content_parts.append(EGG_HTML)
+
+    full_html = "".join([HTML_HEAD, header_html, "\n                ", "".join(content_parts), HTML_FOOTER])
+    exec_only_html = "".join([HTML_HEAD, header_html, HTML_FOOTER])
+    text_lines += ["", "본 리포트는 AI Agent 시스템에 의해 실시간으로 생성되었습니다.", "문의: 구매계약기획그룹 송승호 프로 | © POSCO E&C"]
+    return RenderedReport(html=full_html, exec_html=exec_only_html, text="\n".join(text_lines))
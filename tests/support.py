@@ -0,0 +1,49 @@
+"""
+news_bot을 import하는 테스트의 공용 설정.
+
+news_bot은 import 시점에 환경변수로 설정을 읽으므로, 처음 import하기 전에 임시 캐시 디렉터리·스텁 LLM·
+로컬 전용 설정을 넣어 둡니다 (실제 Google News/Gemini/SMTP에는 연결하지 않음).
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def load_news_bot():
+    if "news_bot" not in sys.modules:
+        os.environ.update({
+            "NEWS_CACHE_DIR": tempfile.mkdtemp(prefix="news-test-"),
+            "NO_PROXY": "127.0.0.1,localhost",
+            "no_proxy": "127.0.0.1,localhost",
+            "LLM_BACKEND": "stub",
+            "STUB_LLM_LATENCY": "0",
+            "ARTICLE_STORE_ENABLED": "0",
+            "TREND_INDEX_ENABLED": "0",
+            "RETRY_BASE_DELAY": "0.01",
+            "RETRY_MAX_DELAY": "0.02",
+        })
+    import news_bot
+    return news_bot
+
+
+def fresh_state(nb):
+    """실행마다 새 캐시 디렉터리의 피드 캐시/리다이렉트 캐시/메트릭 객체 사용 (benchmarks/run_suite.py와 같은 방식)."""
+    from benchmarks.run_suite import reset_state
+
+    cache_dir = tempfile.mkdtemp(prefix="news-test-run-")
+    reset_state(nb, cache_dir)
+    nb.domain_resolver.offline = True  # HEAD 요청 없이 RSS의 매체 정보로 판정 (결과가 네트워크 상태에 좌우되지 않도록)
+    return cache_dir
+
+
+def quiet():
+    """news_bot의 진행 출력 숨김."""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def article_rows(articles):
+    return [(a.id, a.title, a.link, a.keyword, a.category) for a in articles]
@@ -0,0 +1,87 @@
+"""
+링크 정규화(canonical_link)와 이를 키로 쓰는 저장소/컬렉션/추세 색인 테스트.
+
+    python -m pytest tests        (또는 python -m unittest discover tests)
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from article_collection import ArticleCollection  # noqa: E402
+from article_store import ArticleStore, canonical_link  # noqa: E402
+from trend_index import TrendIndex  # noqa: E402
+
+# 같은 기사: 추적 인자/프래그먼트/호스트 대소문자만 다름
+SAME_ARTICLE = [
+    ("https://news.google.com/rss/articles/CBMiabc?oc=5", "https://news.google.com/rss/articles/CBMiabc"),
+    ("https://news.google.com/rss/articles/CBMiabc?hl=ko&gl=KR&ceid=KR:ko", "https://news.google.com/rss/articles/CBMiabc"),
+    ("https://News.Example.com/a/1?utm_source=x&utm_medium=y#top", "https://news.example.com/a/1"),
+    ("https://example.com/news/read.php?id=101&fbclid=abc", "https://example.com/news/read.php?id=101"),
+    ("https://example.com/news/read.php?fbclid=abc&id=101", "https://example.com/news/read.php?id=101"),
+]
+# 다른 기사: 쿼리 인자로 기사를 구분하는 매체
+DIFFERENT_ARTICLES = [
+    ("https://example.com/news/read.php?id=101", "https://example.com/news/read.php?id=102"),
+    ("https://example.com/article.asp?no=7&sec=2", "https://example.com/article.asp?no=8&sec=2"),
+    ("https://example.com/view?aid=1&oc=5", "https://example.com/view?aid=2&oc=5"),
+]
+
+
+class CanonicalLinkTest(unittest.TestCase):
+    def test_tracking_params_are_stripped(self):
+        for link, expected in SAME_ARTICLE:
+            with self.subTest(link=link):
+                self.assertEqual(canonical_link(link), expected)
+
+    def test_article_query_is_kept(self):
+        for first, second in DIFFERENT_ARTICLES:
+            with self.subTest(first=first):
+                self.assertNotEqual(canonical_link(first), canonical_link(second))
+
+    def test_query_encoding_is_preserved(self):
+        link = "https://example.com/search?q=%EA%B1%B4%EC%84%A4+%EC%9E%90%EC%9E%AC&page=2"
+        self.assertEqual(canonical_link(link), link)
+
+
+class LinkKeyedIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="store-test-")
+
+    def test_store_skips_only_the_reported_article(self):
+        store = ArticleStore(os.path.join(self.tmp, "articles.db"))
+        store.record("https://example.com/news/read.php?id=101&utm_source=rss", "첫 번째 기사", "accepted", "v1")
+        store.mark_reported(["https://example.com/news/read.php?id=101"])
+        store.close()
+
+        store = ArticleStore(os.path.join(self.tmp, "articles.db"))
+        self.assertEqual(store.should_skip("https://example.com/news/read.php?id=101&fbclid=z", "제목 변경", "v1"),
+                         "already_reported")
+        self.assertIsNone(store.should_skip("https://example.com/news/read.php?id=102", "두 번째 기사", "v1"))
+        store.close()
+
+    def test_collection_keeps_query_distinct_articles(self):
+        articles = ArticleCollection(["시장"])
+        articles.add("첫 번째 기사", "https://example.com/article.asp?no=7", "철근", "시장")
+        self.assertTrue(articles.has_link("https://example.com/article.asp?no=7&utm_campaign=x"))
+        self.assertFalse(articles.has_link("https://example.com/article.asp?no=8"))
+
+    def test_trend_index_counts_query_distinct_articles(self):
+        articles = ArticleCollection(["시장"])
+        articles.add("첫 번째 기사", "https://example.com/news/read.php?id=101", "철근", "시장")
+        articles.add("두 번째 기사", "https://example.com/news/read.php?id=102", "철근", "시장")
+        articles.add("첫 번째 기사", "https://example.com/news/read.php?id=101&oc=5", "철근", "시장")
+        index = TrendIndex(os.path.join(self.tmp, "trends.db"))
+        try:
+            self.assertEqual(index.record("2026-10-19", "기본", articles), (2, 0))
+            rollup = index.rollup("기본", "2026-10-19", "2026-10-19")
+        finally:
+            index.close()
+        self.assertEqual(rollup["keywords"]["철근"], 2)
+        self.assertEqual(rollup["categories"]["시장"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
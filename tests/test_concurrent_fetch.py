@@ -0,0 +1,54 @@
+"""
+RSS 동시 수집이 순차 수집과 같은 결과(같은 기사, 같은 ID 순서)를 내는지 확인.
+
+검색어마다 응답 지연이 다른 로컬 피드 서버(호스트) 세 곳에 나눠 요청하여, 요청이 끝나는 순서가
+검색어 순서와 달라도 결과는 검색어 순서대로 처리되는지 봅니다.
+
+    python -m pytest tests        (또는 python -m unittest discover tests)
+"""
+import unittest
+from unittest import mock
+
+from support import article_rows, fresh_state, load_news_bot, quiet
+
+from benchmarks.local_server import FixtureServer
+
+HOST_LATENCIES = (0.15, 0.0, 0.05)
+
+
+class ConcurrentFetchTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.nb = load_news_bot()
+        cls.servers = [FixtureServer(latency=latency, entries=30).start() for latency in HOST_LATENCIES]
+
+    @classmethod
+    def tearDownClass(cls):
+        for server in cls.servers:
+            server.stop()
+
+    def collect(self, workers):
+        nb = self.nb
+        fresh_state(nb)
+        keywords = list(nb.KEYWORDS[:9])
+        hosts = {keyword: self.servers[i % len(self.servers)].base_url for i, keyword in enumerate(keywords)}
+        build_feed_url = nb.build_feed_url
+
+        def feed_url(keyword, time_window_days=1):
+            return build_feed_url(keyword, time_window_days).replace(nb.GOOGLE_NEWS_BASE_URL, hosts[keyword], 1)
+
+        with mock.patch.object(nb, "KEYWORDS", keywords), mock.patch.object(nb, "FETCH_MAX_WORKERS", workers), \
+                mock.patch.object(nb, "build_feed_url", feed_url), quiet():
+            return article_rows(nb.fetch_news())
+
+    def test_concurrent_matches_sequential(self):
+        sequential = self.collect(workers=1)
+        concurrent = self.collect(workers=8)
+
+        self.assertGreater(len(sequential), 30)
+        self.assertEqual(concurrent, sequential)
+        self.assertEqual([row[0] for row in concurrent], list(range(len(concurrent))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+상주 모드(daemon.BriefingDaemon) 후보 누적 테스트: 같은 발송일의 수집 결과는 저장된 후보에 합쳐지고
+(링크/유사 제목 중복 제거, news_bot.merge_snapshots), 피드 창에서 밀려난 기사도 발송 후보에 남는지 확인.
+
+    python -m pytest tests        (또는 python -m unittest discover tests)
+"""
+import os
+import random
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from support import load_news_bot, quiet
+
+from daemon import KST, BriefingDaemon
+
+nb = load_news_bot()
+
+
+def row(title, link, keyword="철근"):
+    return {"title": title, "link": link, "keyword": keyword, "category": "시장", "date": "", "published": None}
+
+
+A = row("철근 가격 3개월 연속 상승", "https://example.com/news?id=1")
+B = row("레미콘 운송 거부 사흘째", "https://example.com/news?id=2")
+B_AGAIN = row("레미콘 운송 거부 사흘째 - 뉴스1", "https://example.com/news?id=2&oc=5")
+C = row("시멘트 단가 인상 추진", "https://example.com/news?id=3")
+D = row("건설 원자재 수입 감소", "https://example.com/news?id=4")
+
+
+class FakeClock:
+    def __init__(self, start):
+        self.now = start.timestamp()
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, **delta):
+        self.now += timedelta(**delta).total_seconds()
+
+
+class MergeSnapshotsTest(unittest.TestCase):
+    def test_merge_keeps_saved_and_adds_new(self):
+        merged = nb.merge_snapshots({"default": [A, B]}, {"default": [B_AGAIN, C], "safety": [D]})
+        self.assertEqual(merged, {"default": [A, B, C], "safety": [D]})
+
+    def test_duplicates_by_link_or_similar_title(self):
+        same_link = row("전혀 다른 제목", "https://EXAMPLE.com/news?id=1&utm_source=rss")
+        similar_title = row("철근 가격 3개월 연속 상승세", "https://other.example.com/a")
+        merged = nb.merge_snapshots({"default": [A]}, {"default": [same_link, similar_title, C]})
+        self.assertEqual(merged["default"], [A, C])
+
+    def test_no_saved_snapshot(self):
+        self.assertEqual(nb.merge_snapshots(None, {"default": [A, A]}), {"default": [A]})
+
+
+class DaemonAccumulationTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock(datetime(2026, 10, 19, 1, 0, tzinfo=KST))  # 월요일 01:00, 발송 07:00
+        self.polls = [{"default": [A, B]}, {"default": [B_AGAIN, C]}, {"default": [C]}]
+        self.sent = []
+        self.daemon = BriefingDaemon(
+            self.poll, self.send, os.path.join(tempfile.mkdtemp(prefix="daemon-test-"), "state.json"),
+            send_time=(7, 0), poll_minutes=60, jitter=0.0, clock=self.clock, rng=random.Random(0),
+            merge=nb.merge_snapshots,
+        )
+
+    def poll(self, send_day):
+        return self.polls.pop(0) if self.polls else {"default": []}
+
+    def send(self, send_day, snapshot):
+        self.sent.append((send_day.isoformat(), snapshot))
+        return True
+
+    def test_articles_leaving_the_feed_window_are_kept(self):
+        with quiet():
+            self.daemon.step()                  # 01:00 첫 수집: A, B
+            self.clock.advance(hours=1)
+            self.daemon.step()                  # 02:00: B(추적 인자만 다름), C
+            self.clock.advance(hours=1)
+            self.daemon.step()                  # 03:00: C만 (A, B는 피드 창에서 밀려남)
+            self.assertEqual(self.daemon.state["snapshot"], {"default": [A, B, C]})
+
+            self.clock.now = datetime(2026, 10, 19, 7, 0, tzinfo=KST).timestamp()
+            self.daemon.step()                  # 발송 직전 수집 후 발송
+        self.assertEqual(self.sent, [("2026-10-19", {"default": [A, B, C]})])
+
+    def test_new_send_day_starts_fresh(self):
+        with quiet():
+            self.daemon.step()
+            self.clock.now = datetime(2026, 10, 19, 7, 0, tzinfo=KST).timestamp()
+            self.daemon.step()
+            self.polls = [{"default": [D]}]
+            self.clock.advance(hours=1)
+            self.daemon.step()                  # 다음 발송일(화요일)의 첫 수집
+        self.assertEqual(self.daemon.state["snapshot_for"], "2026-10-20")
+        self.assertEqual(self.daemon.state["snapshot"], {"default": [D]})
+
+
+if __name__ == "__main__":
+    unittest.main()
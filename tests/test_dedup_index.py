@@ -0,0 +1,74 @@
+"""
+유사 제목 색인(dedup_index.TitleIndex)이 기존 전수 비교 is_duplicate_topic(difflib 유사도 > 0.7)과
+같은 판정을 내리는지 고정 코퍼스로 확인. fetch_news와 같이 "중복이면 버리고 아니면 수집"을 반복합니다.
+
+    python -m pytest tests        (또는 python -m unittest discover tests)
+"""
+import difflib
+import unittest
+from types import SimpleNamespace
+
+from support import load_news_bot
+
+from benchmarks.title_corpus import generate_titles
+from dedup_index import REBUILD_MIN_SIZE, TitleIndex
+
+nb = load_news_bot()
+
+
+def decisions(titles):
+    """(TitleIndex 판정, 전수 비교 판정) 목록. 수집 목록은 두 방식이 각자 따로 쌓음."""
+    index = TitleIndex(threshold=0.7)
+    items = []
+    result = []
+    for title in titles:
+        indexed = index.is_duplicate(title)
+        brute = nb.is_duplicate_topic(title, items)
+        result.append((indexed, brute))
+        if not indexed:
+            index.add(title)
+        if not brute:
+            items.append(SimpleNamespace(title=title))  # is_duplicate_topic은 기사의 .title을 읽음
+    return result
+
+
+class TitleIndexTest(unittest.TestCase):
+    def test_matches_difflib_on_fixed_corpus(self):
+        titles = generate_titles(400, seed=42)
+        result = decisions(titles)
+
+        mismatches = [(pos, titles[pos], pair) for pos, pair in enumerate(result) if pair[0] != pair[1]]
+        self.assertEqual(mismatches, [])
+        kept = sum(1 for indexed, _ in result if not indexed)
+        self.assertGreater(kept, REBUILD_MIN_SIZE * 4)  # 색인 재구성이 여러 번 일어나는 크기
+        self.assertGreater(len(titles) - kept, 20)      # 중복 판정도 충분히 포함
+
+    def test_threshold_boundary(self):
+        # ratio가 정확히 0.7이면 중복 아님, 0.7을 넘으면 중복 (기존 조건: similarity > 0.7)
+        base = "abcdefghij"
+        cases = [
+            ("abcdefgxyz", False),   # 2·7 / 20 = 0.7
+            ("abcdefghxy", True),    # 2·8 / 20 = 0.8
+            ("abcdefg", True),       # 2·7 / 17 ≈ 0.82 (길이가 달라도 ratio 기준)
+            ("jihgfedcba", False),   # 같은 글자, 다른 순서
+            ("", False),
+        ]
+        index = TitleIndex(threshold=0.7)
+        index.add(base)
+        for title, expected in cases:
+            with self.subTest(title=title):
+                self.assertEqual(difflib.SequenceMatcher(None, title, base).ratio() > 0.7, expected)
+                self.assertEqual(index.is_duplicate(title), expected)
+
+    def test_empty_titles(self):
+        index = TitleIndex(threshold=0.7)
+        self.assertFalse(index.is_duplicate(""))
+        index.add("철근 가격 상승")
+        self.assertFalse(index.is_duplicate(""))
+        index.add("")
+        self.assertEqual(index.find_duplicate(""), 1)  # SequenceMatcher는 빈 문자열끼리 ratio 1.0
+        self.assertFalse(index.is_duplicate("철근"))
+
+
+if __name__ == "__main__":
+    unittest.main()
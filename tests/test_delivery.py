@@ -0,0 +1,77 @@
+"""
+SMTP 발송 스케줄러(delivery) 테스트. benchmarks/smtp_sink.py의 로컬 SMTP 서버로 받습니다.
+
+    python -m pytest tests        (또는 python -m unittest discover tests)
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.smtp_sink import SMTPSink  # noqa: E402
+from delivery import STATUS_FAILED, DeliveryLog, DeliveryScheduler  # noqa: E402
+
+MESSAGE = b"Subject: test\r\n\r\nhello\r\n"
+MESSAGE_KEY = "[Daily] 2026-10-19"
+RECIPIENTS = [f"user{i}@localhost" for i in range(5)]
+
+
+class DeliverySchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.log = DeliveryLog(os.path.join(tempfile.mkdtemp(prefix="delivery-test-"), "deliveries.db"))
+        self.sleeps = []
+
+    def tearDown(self):
+        self.log.close()
+        if hasattr(self, "sink"):
+            self.sink.stop()
+
+    def scheduler(self, **kwargs):
+        options = dict(starttls=False, batch_size=2, messages_per_minute=600000, burst=100, timeout=5,
+                       log=self.log, sleep=self.sleeps.append)  # 재연결 백오프/속도 제한 대기는 기록만 하고 건너뜀
+        options.update(kwargs)
+        return DeliveryScheduler("127.0.0.1", self.sink.port, "bot@localhost", **options)
+
+    def test_reconnects_after_dropped_connection(self):
+        self.sink = SMTPSink(disconnects=1).start()
+        scheduler = self.scheduler()
+        result = scheduler.deliver(MESSAGE, RECIPIENTS, MESSAGE_KEY)
+
+        self.assertEqual(result.sent, RECIPIENTS)
+        self.assertEqual(result.failed, [])
+        self.assertEqual(scheduler.reconnects, 1)
+        self.assertEqual(scheduler.connects, 2)
+        self.assertEqual(len(self.sleeps), 1)  # 재연결 전 백오프 한 번
+        self.assertEqual(self.sink.messages, 3)
+        self.assertEqual(self.sink.recipients, len(RECIPIENTS))
+
+    def test_resumes_failed_recipients_from_log(self):
+        # 첫 배치에서 연결이 끊기고 재시도하지 않으면 그 배치만 실패로 기록
+        self.sink = SMTPSink(disconnects=1).start()
+        first = self.scheduler(max_retries=0).deliver(MESSAGE, RECIPIENTS, MESSAGE_KEY)
+        self.assertEqual(first.failed, RECIPIENTS[:2])
+        self.assertEqual(first.sent, RECIPIENTS[2:])
+        self.assertEqual(self.log.delivered(MESSAGE_KEY), set(RECIPIENTS[2:]))
+        failed_rows = self.log._conn.execute(
+            "SELECT recipient FROM deliveries WHERE status = ?", (STATUS_FAILED,)).fetchall()
+        self.assertEqual({row[0] for row in failed_rows}, set(RECIPIENTS[:2]))
+
+        # 재실행은 이미 받은 수신자를 건너뛰고 실패한 수신자에게만 발송
+        second = self.scheduler().deliver(MESSAGE, RECIPIENTS, MESSAGE_KEY)
+        self.assertEqual(second.sent, RECIPIENTS[:2])
+        self.assertEqual(second.skipped, RECIPIENTS[2:])
+        self.assertEqual(second.failed, [])
+        self.assertEqual(self.log.delivered(MESSAGE_KEY), set(RECIPIENTS))
+        self.assertEqual(self.sink.recipients, len(RECIPIENTS))
+
+        # 모두 받은 뒤에는 아무것도 보내지 않음
+        third = self.scheduler().deliver(MESSAGE, RECIPIENTS, MESSAGE_KEY)
+        self.assertEqual(third.sent, [])
+        self.assertEqual(third.skipped, RECIPIENTS)
+        self.assertEqual(self.sink.messages, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+FilterEngine(정규식 하나로 한 번에 판정)이 기존 함수 is_spam_news / is_video_content / is_overseas_local_news와
+같은 판정을 내리는지 확인. 기존 함수는 아래에 원래 구현 그대로 두고 비교합니다.
+
+    python -m pytest tests        (또는 python -m unittest discover tests)
+"""
+import random
+import unittest
+from types import SimpleNamespace
+
+from support import load_news_bot
+
+from benchmarks.title_corpus import SOURCES, generate_titles
+from filter_engine import RULE_OVERSEAS, RULE_SPAM, RULE_VIDEO, FilterEngine
+
+nb = load_news_bot()
+
+
+def legacy_is_spam_news(title):
+    for bad_word in nb.EXCLUDE_KEYWORDS:
+        if bad_word in title: return True
+    return False
+
+
+def legacy_is_video_content(title):
+    return any(kw in title for kw in nb.VIDEO_KEYWORDS)
+
+
+def legacy_is_overseas_local_news(title, source):
+    if any(company in title for company in nb.KOREAN_COMPANIES):
+        return False
+    combined = title + source
+    return any(src.lower() in combined.lower() for src in nb.OVERSEAS_LOCAL_SOURCES)
+
+
+def legacy_rule(title, source):
+    """fetch_news의 기존 검사 순서: 스팸 → 영상 → 해외 현지 매체."""
+    if legacy_is_spam_news(title):
+        return RULE_SPAM
+    if legacy_is_video_content(title):
+        return RULE_VIDEO
+    if legacy_is_overseas_local_news(title, source):
+        return RULE_OVERSEAS
+    return None
+
+
+# (제목, source, 규칙, 걸린 단어, 건설사, 건설사로 통과된 해외 매체)
+CASES = [
+    ("철근 가격 3개월 연속 상승 - 건설경제", "건설경제", None, None, None, None),
+    ("건설주 급등, 특징주로 주목", "", RULE_SPAM, "급등", None, None),
+    ("[영상] 레미콘 공급 중단 현장", "", RULE_VIDEO, "[영상]", None, None),
+    ("[VOD] 시멘트 단가 인상", "", RULE_VIDEO, "[VOD]", None, None),
+    ("[vod] 시멘트 단가 인상", "", RULE_VIDEO, "[vod]", None, None),
+    ("[영상] 건설 주가 급락", "", RULE_SPAM, "주가", None, None),  # 스팸이 영상보다 우선
+    ("베트남 건설 시장 확대 - 인사이드비나", "인사이드비나", RULE_OVERSEAS, "인사이드비나", None, None),
+    ("Vietnam steel demand rises", "VnExpress International", RULE_OVERSEAS, "vnexpress", None, None),
+    ("베트남 고속도로 착공", "VIETSTOCK", RULE_OVERSEAS, "vietstock", None, None),
+    ("현대건설, 베트남 수주 - 인사이드비나", "인사이드비나", None, None, "현대건설", "인사이드비나"),
+    ("현대건설 주가 급등", "", RULE_SPAM, "주가", "현대건설", None),  # 건설사는 해외 매체 규칙만 무시
+    ("GS건설 [포토] 준공식", "", RULE_VIDEO, "[포토]", "GS건설", None),
+    ("베트남 수주 소식", "현대건설 vnexpress", RULE_OVERSEAS, "vnexpress", None, None),  # 건설사는 제목에서만
+    ("해외 발주 동향 insi", "devina 보도", RULE_OVERSEAS, "insidevina", None, None),  # 제목+source 경계에 걸친 매체명
+    ("건설 물량 거래", "량 급증", None, None, None, None),  # 스팸 단어는 제목 안에서만
+    ("뉴스영상뉴스 모음", "", RULE_VIDEO, "뉴스영상", None, None),  # 겹치는 영상 태그
+    ("비트코인 채굴장 건설", "", RULE_SPAM, "비트코인", None, None),  # 긴 단어와 그 안의 짧은 단어(코인)
+    ("포스코이앤씨 DL이앤씨 공동 수주", "", None, None, "포스코이앤씨", None),
+]
+
+
+class FilterEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = FilterEngine(nb.EXCLUDE_KEYWORDS, nb.VIDEO_KEYWORDS, nb.KOREAN_COMPANIES,
+                                   nb.OVERSEAS_LOCAL_SOURCES)
+
+    def test_verdict_table(self):
+        for title, source, rule, term, company, overridden in CASES:
+            with self.subTest(title=title, source=source):
+                verdict = self.engine.scan(title, source)
+                self.assertEqual(tuple(verdict), (rule, term, company, overridden))
+                self.assertEqual(verdict.rule, legacy_rule(title, source))
+
+    def test_rule_functions_match_legacy(self):
+        # news_bot의 기존 함수 이름은 FilterEngine 위에서 그대로 동작해야 함
+        for title, source, *_ in CASES:
+            with self.subTest(title=title, source=source):
+                entry = SimpleNamespace(title=title, source=SimpleNamespace(title=source))
+                self.assertEqual(nb.is_spam_news(title), legacy_is_spam_news(title))
+                self.assertEqual(nb.is_video_content(title), legacy_is_video_content(title))
+                self.assertEqual(nb.is_overseas_local_news(entry), legacy_is_overseas_local_news(title, source))
+
+    def test_matches_legacy_on_title_corpus(self):
+        rng = random.Random(7)
+        extra_sources = SOURCES + ["인사이드비나", "VnExpress", "Vietstock", "insidevina.com"]
+        mismatches = []
+        for title in generate_titles(3000, seed=11):
+            source = rng.choice(extra_sources)
+            if self.engine.scan(title, source).rule != legacy_rule(title, source):
+                mismatches.append((title, source))
+        self.assertEqual(mismatches, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
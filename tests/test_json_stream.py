@@ -0,0 +1,211 @@
+"""
+스트리밍 응답 증분 파서(json_stream.AnalysisStreamParser) 테스트.
+
+같은 응답을 여러 방식으로 잘라 넣어도(문자열·이스케이프 중간에서 잘려도) 한 번에 넣은 것과 같은 결과가 나오는지,
+깨지거나 검증에 실패한 카드만 빠지는지, 스트림이 중간에 끊기면 그때까지 완성된 결과만 남는지 확인합니다.
+
+    python -m pytest tests        (또는 python -m unittest discover tests)
+"""
+import json
+import unittest
+from unittest import mock
+
+from support import fresh_state, load_news_bot, quiet
+
+from json_stream import AnalysisStreamParser
+
+VALID_IDS = {1, 2, 3, 4}
+
+# 문자열 안에 따옴표/역슬래시/유니코드 이스케이프/괄호가 들어 있는 응답 (앞뒤 설명 문구와 마크다운 태그 포함)
+RESPONSE = (
+    '분석 결과입니다.\n```json\n'
+    '{"weather_summary": "🌧️ \\"철근\\" 가격 {급등} [주의] \\\\ \\uc2dc\\uba58\\ud2b8 \\ud83c\\udf27",\n'
+    ' "selected_cards": [\n'
+    '  {"id": 1, "summary": "단가 \\"}\\" 인상 ]", "insight": "계약 \\\\ 검토", "risk_level": "Critical"},\n'
+    '  {"id": "2", "summary": "공급 {지연}", "insight": "대체 업체 확보", "risk_level": "Warning"}\n'
+    ' ]}\n```\n끝.'
+)
+EXPECTED = {
+    "weather_summary": '🌧️ "철근" 가격 {급등} [주의] \\ 시멘트 🌧',
+    "selected_cards": [
+        {"id": 1, "summary": '단가 "}" 인상 ]', "insight": "계약 \\ 검토", "risk_level": "Critical"},
+        {"id": 2, "summary": "공급 {지연}", "insight": "대체 업체 확보", "risk_level": "Warning"},
+    ],
+}
+
+
+def card(card_id, risk_level="Info", summary="요약", insight="시사점"):
+    return {"id": card_id, "summary": summary, "insight": insight, "risk_level": risk_level}
+
+
+def parse(chunks, valid_ids=VALID_IDS):
+    parser = AnalysisStreamParser(valid_ids)
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    return parser, events
+
+
+class ChunkBoundaryTest(unittest.TestCase):
+    def test_single_chunk(self):
+        parser, events = parse([RESPONSE])
+        self.assertTrue(parser.done)
+        self.assertEqual(parser.result(), EXPECTED)
+        self.assertEqual(parser.rejected, [])
+        self.assertEqual([kind for kind, _ in events], ["weather_summary", "card", "card"])
+
+    def test_every_split_point(self):
+        # 두 조각으로 나누는 모든 위치: 이스케이프 역슬래시 바로 뒤, \uXXXX 중간, 따옴표 직전 등을 모두 포함
+        for cut in range(1, len(RESPONSE)):
+            with self.subTest(cut=cut, around=RESPONSE[max(0, cut - 3):cut + 3]):
+                parser, _ = parse([RESPONSE[:cut], RESPONSE[cut:]])
+                self.assertTrue(parser.done)
+                self.assertEqual(parser.result(), EXPECTED)
+
+    def test_one_character_chunks(self):
+        parser, events = parse(list(RESPONSE))
+        self.assertTrue(parser.done)
+        self.assertEqual(parser.result(), EXPECTED)
+        self.assertEqual(events, [("weather_summary", EXPECTED["weather_summary"]),
+                                  ("card", EXPECTED["selected_cards"][0]),
+                                  ("card", EXPECTED["selected_cards"][1])])
+
+    def test_events_arrive_when_each_value_closes(self):
+        first_card_end = RESPONSE.index('"Critical"}') + len('"Critical"}')
+        parser = AnalysisStreamParser(VALID_IDS)
+        self.assertEqual([kind for kind, _ in parser.feed(RESPONSE[:first_card_end - 1])], ["weather_summary"])
+        self.assertEqual(parser.feed(RESPONSE[first_card_end - 1:first_card_end]),
+                         [("card", EXPECTED["selected_cards"][0])])
+        self.assertFalse(parser.done)
+
+    def test_text_after_top_level_object_is_ignored(self):
+        parser, _ = parse([json.dumps(EXPECTED, ensure_ascii=False), ' {"weather_summary": "두 번째"}'])
+        self.assertEqual(parser.result(), EXPECTED)
+
+
+class RejectedCardTest(unittest.TestCase):
+    def test_invalid_cards_are_dropped_individually(self):
+        cards = [
+            card(1),
+            card(9),                                 # 목록에 없는 ID
+            card(2, risk_level="High"),              # 허용되지 않는 risk_level
+            card(3, insight="  "),                   # 빈 insight
+            card(1, summary="같은 ID 다시"),          # 중복 ID
+            card(True),                              # bool은 ID로 인정하지 않음
+            "카드가 아닌 값",
+            card(4, risk_level="Warning"),
+        ]
+        text = json.dumps({"weather_summary": "맑음", "selected_cards": cards}, ensure_ascii=False)
+        parser, _ = parse([text[i:i + 7] for i in range(0, len(text), 7)])
+
+        self.assertTrue(parser.done)
+        self.assertEqual([c["id"] for c in parser.cards], [1, 4])
+        reasons = [reason for _, reason in parser.rejected]
+        self.assertEqual(len(reasons), 5)  # 문자열 원소는 객체가 아니므로 카드로 잡히지 않음
+        self.assertIn("존재하지 않는 ID: 9", reasons[0])
+        self.assertIn("risk_level", reasons[1])
+        self.assertIn("insight 누락", reasons[2])
+        self.assertIn("중복 ID: 1", reasons[3])
+        self.assertIn("존재하지 않는 ID: True", reasons[4])
+
+    def test_malformed_card_does_not_break_following_cards(self):
+        text = ('{"weather_summary": "흐림", "selected_cards": ['
+                '{"id": 1, "summary": "a" "b", "insight": "c", "risk_level": "Info"}, '
+                '{"id": 2, "summary": "정상", "insight": "정상", "risk_level": "Info",}, '
+                '{"id": 3, "summary": "정상", "insight": "정상", "risk_level": "Info"}]}')
+        parser, _ = parse([text[:40], text[40:95], text[95:]])
+
+        self.assertTrue(parser.done)
+        self.assertEqual([c["id"] for c in parser.cards], [3])
+        self.assertEqual(len(parser.rejected), 2)
+        self.assertTrue(all(reason.startswith("JSON 오류") for _, reason in parser.rejected))
+        self.assertEqual(parser.result()["weather_summary"], "흐림")
+
+    def test_nested_objects_are_not_cards(self):
+        text = ('{"weather_summary": "맑음", "meta": {"selected_cards": [{"id": 1}]}, '
+                '"selected_cards": [{"id": 2, "summary": "s", "insight": "i", "risk_level": "Info", '
+                '"extra": {"id": 3}}]}')
+        parser, _ = parse([text])
+        self.assertEqual([c["id"] for c in parser.cards], [2])
+        self.assertEqual(parser.rejected, [])
+
+
+class TruncatedStreamTest(unittest.TestCase):
+    def test_partial_card_is_dropped(self):
+        cut = RESPONSE.index('{"id": "2"') + 20
+        parser, _ = parse([RESPONSE[:cut]])
+
+        self.assertFalse(parser.done)
+        self.assertEqual(parser.result(), {"weather_summary": EXPECTED["weather_summary"],
+                                           "selected_cards": EXPECTED["selected_cards"][:1]})
+        self.assertEqual(parser.rejected, [])
+
+    def test_truncated_inside_weather_summary(self):
+        cut = RESPONSE.index("\\uc2dc") + 3  # \uXXXX 이스케이프 중간에서 끊김
+        parser, _ = parse([RESPONSE[:cut]])
+        self.assertFalse(parser.done)
+        self.assertIsNone(parser.result())
+
+    def test_cards_without_weather_summary(self):
+        text = '{"selected_cards": [{"id": 4, "summary": "s", "insight": "i", "risk_level": "Info"}, {"id": 1, "su'
+        parser, _ = parse([text])
+        self.assertFalse(parser.done)
+        self.assertEqual(parser.result(), {"selected_cards": [card(4, summary="s", insight="i")]})
+
+    def test_no_json_at_all(self):
+        parser, events = parse(["죄송하지만 ", "답변할 수 없습니다."])
+        self.assertEqual(events, [])
+        self.assertFalse(parser.done)
+        self.assertIsNone(parser.result())
+
+
+class BrokenStreamBackend:
+    """조각 몇 개를 보낸 뒤 연결이 끊기는 스트리밍 백엔드."""
+
+    model_name = "broken-stream"
+
+    def __init__(self, chunks, fail_after):
+        self.chunks = chunks
+        self.fail_after = fail_after
+        self.calls = 0
+
+    def generate_stream(self, prompt, safety_settings=None, timeout=None):
+        self.calls += 1
+        for chunk in self.chunks[:self.fail_after]:
+            yield chunk
+        raise ConnectionResetError("stream reset")
+
+
+class GenerateStreamedFallbackTest(unittest.TestCase):
+    """news_bot.generate_streamed: 끊긴 스트림은 재시도·캐시 없이 그때까지 완성된 결과로 대체."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.nb = load_news_bot()
+
+    def run_stream(self, backend):
+        nb = self.nb
+        fresh_state(nb)
+        with mock.patch.object(nb, "_llm_backend", backend), mock.patch.object(nb, "LLM_STREAMING", True), quiet():
+            return nb.generate_streamed("prompt", VALID_IDS)
+
+    def test_broken_stream_keeps_completed_cards(self):
+        cut = RESPONSE.index('{"id": "2"') + 5
+        backend = BrokenStreamBackend([RESPONSE[:60], RESPONSE[60:cut], RESPONSE[cut:]], fail_after=2)
+
+        data = self.run_stream(backend)
+
+        self.assertEqual(backend.calls, 1)  # 받은 조각이 있으면 재시도하지 않음
+        self.assertEqual(data, {"weather_summary": EXPECTED["weather_summary"],
+                                "selected_cards": EXPECTED["selected_cards"][:1]})
+        key = self.nb.llm_cache.make_key(backend.model_name, "prompt", self.nb.SAFETY_SETTINGS)
+        self.assertIsNone(self.nb.llm_cache.get(key))  # 끝까지 받지 못한 응답은 캐시하지 않음
+
+    def test_broken_stream_before_any_value_returns_none(self):
+        backend = BrokenStreamBackend([RESPONSE[:30], RESPONSE[30:]], fail_after=1)
+        self.assertIsNone(self.run_stream(backend))
+        self.assertEqual(backend.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
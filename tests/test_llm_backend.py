@@ -0,0 +1,46 @@
+"""
+스텁 LLM 백엔드(llm_backend.StubBackend) 테스트: 분석 프롬프트의 프로필(부서)에 맞는 응답을 만드는지 확인.
+
+    python -m pytest tests        (또는 python -m unittest discover tests)
+"""
+import json
+import unittest
+
+from support import load_news_bot
+
+from article_collection import ArticleCollection
+from llm_backend import StubBackend, create_backend
+
+nb = load_news_bot()
+
+
+def sample_items(profile):
+    items = ArticleCollection(profile.category_map.keys())
+    for i, (category, keywords) in enumerate(list(profile.category_map.items())[:3]):
+        items.add(f"{keywords[0]} 관련 기사 {i}", f"https://example.com/{i}", keywords[0], category, date="")
+    return items
+
+
+class StubBackendTest(unittest.TestCase):
+    def insights(self, backend, profile):
+        prompt = nb.build_analysis_prompt(sample_items(profile), profile=profile)
+        cards = json.loads(backend.generate(prompt))["selected_cards"]
+        self.assertTrue(cards)
+        return {card["insight"] for card in cards}
+
+    def test_insight_follows_active_profile(self):
+        backend = StubBackend(team=nb.REPORT_TEAM)
+        base = nb.default_profile()
+        safety = base.derive("safety", [], team="안전보건실", insight_label="안전보건실 대응 방안")
+
+        self.assertEqual(self.insights(backend, base), {f"[stub] {base.insight_label} 검토 필요."})
+        self.assertEqual(self.insights(backend, safety), {"[stub] 안전보건실 대응 방안 검토 필요."})
+
+    def test_configured_team_without_profile_label(self):
+        prompt = "ID:0 | [시장] [날짜:] 철근 가격 상승\n"
+        card, = json.loads(create_backend("stub", team="해외사업실").generate(prompt))["selected_cards"]
+        self.assertEqual(card["insight"], "[stub] 해외사업실 대응 방안 검토 필요.")
+
+
+if __name__ == "__main__":
+    unittest.main()
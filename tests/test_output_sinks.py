@@ -0,0 +1,101 @@
+"""
+출력 대상(output_sinks) 동시 발송/재시도 테스트. 웹훅은 benchmarks/local_server.py의 로컬 서버로 받습니다.
+
+    python -m pytest tests        (또는 python -m unittest discover tests)
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.local_server import FixtureServer  # noqa: E402
+from output_sinks import (  # noqa: E402
+    FileArchiveSink, FunctionSink, ReportContext, WebhookSink, dispatch,
+)
+from report_renderer import RenderedReport  # noqa: E402
+
+REPORT = RenderedReport(html="<p>보고서</p>", exec_html="<p>요약</p>", text="보고서")
+CONTEXT = ReportContext("2026-10-19", "[Daily] 시장 동향", "구매계약실", None, True, "맑음")
+
+
+def setUpModule():
+    # 로컬 서버 요청이 환경의 프록시 설정을 타지 않도록
+    os.environ["NO_PROXY"] = os.environ["no_proxy"] = "127.0.0.1,localhost"
+
+
+class DispatchTest(unittest.TestCase):
+    def setUp(self):
+        self.archive_dir = tempfile.mkdtemp(prefix="sink-test-")
+        self.emails = []
+
+    def tearDown(self):
+        if hasattr(self, "server"):
+            self.server.stop()
+
+    def start_server(self, **kwargs):
+        self.server = FixtureServer(latency=0.0, **kwargs).start()
+        return self.server.base_url + "/webhook"
+
+    def email_sink(self):
+        def publish(report, context, deadline):
+            self.emails.append(context.subject)
+            return True
+        return FunctionSink("email", publish)
+
+    def test_failing_webhook_does_not_block_other_sinks(self):
+        url = self.start_server(webhook_failures=100)
+        sinks = [
+            self.email_sink(),
+            FileArchiveSink(self.archive_dir),
+            WebhookSink(url, timeout=5, request_timeout=1, retry_attempts=2),
+        ]
+        email, archive, webhook = dispatch(sinks, REPORT, CONTEXT, retry_base_delay=0.01, retry_max_delay=0.02)
+
+        self.assertTrue(email.ok)
+        self.assertTrue(archive.ok)
+        self.assertFalse(webhook.ok)
+        self.assertEqual(webhook.attempts, 2)
+        self.assertEqual(self.emails, [CONTEXT.subject])
+        with open(os.path.join(self.archive_dir, "2026-10-19.txt"), encoding="utf-8") as f:
+            self.assertEqual(f.read(), REPORT.text)
+        self.assertEqual(self.server.webhooks, [])
+
+    def test_webhook_5xx_is_retried(self):
+        url = self.start_server(webhook_failures=1)
+        (result,) = dispatch([WebhookSink(url, timeout=5, request_timeout=1, retry_attempts=3)], REPORT, CONTEXT,
+                             retry_base_delay=0.01, retry_max_delay=0.02)
+
+        self.assertTrue(result.ok, result.error)
+        self.assertEqual(result.attempts, 2)
+        self.assertEqual(self.server.requests["webhook"], 2)
+        self.assertEqual(len(self.server.webhooks), 1)
+        self.assertEqual(self.server.webhooks[0]["text"], REPORT.text)
+
+    def test_slow_request_leaves_time_to_retry(self):
+        # 요청 한 건의 제한 시간(request_timeout)이 대상 전체 제한 시간(timeout)을 다 쓰지 않아야 재시도가 가능
+        url = self.start_server()
+        self.server.latency = 0.5
+        (result,) = dispatch([WebhookSink(url, timeout=5, request_timeout=0.1, retry_attempts=3)], REPORT, CONTEXT,
+                             retry_base_delay=0.01, retry_max_delay=0.02)
+
+        self.assertFalse(result.ok)
+        self.assertEqual(result.attempts, 3)
+        self.assertLess(result.seconds, 5)
+
+    def test_failed_required_function_sink_is_not_retried(self):
+        calls = []
+
+        def publish(report, context, deadline):
+            calls.append(context.day)
+            return False
+
+        (result,) = dispatch([FunctionSink("email", publish, retry_attempts=3)], REPORT, CONTEXT,
+                             retry_base_delay=0.01, retry_max_delay=0.02)
+        self.assertFalse(result.ok)
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+"""
+프로필 파일 로딩(news_bot.load_run_profiles) 테스트.
+
+    python -m pytest tests        (또는 python -m unittest discover tests)
+"""
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from support import load_news_bot
+
+nb = load_news_bot()
+
+
+class RunProfilesTest(unittest.TestCase):
+    def load(self, names):
+        cache_dir = tempfile.mkdtemp(prefix="profiles-test-")
+        path = os.path.join(cache_dir, "profiles.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"profiles": [{"name": name, "receivers": ["a@example.com"]} for name in names]}, f)
+        # 테스트 설정은 저장소를 끄므로 기본 저장소가 있는 것처럼 두고 프로필별 저장소 경로만 확인
+        with mock.patch.object(nb, "CACHE_DIR", cache_dir), mock.patch.object(nb, "article_store", object()):
+            return cache_dir, nb.load_run_profiles(path)
+
+    def test_article_store_path_stays_in_cache_dir(self):
+        names = ["safety", "../../escape", "a/b", "해외사업", "..", "c:\\temp"]
+        cache_dir, profiles = self.load(names)
+
+        paths = [profile.article_store.path for profile in profiles]
+        self.assertEqual(os.path.basename(paths[0]), "articles-safety.db")
+        self.assertEqual(os.path.basename(paths[3]), "articles-해외사업.db")
+        for name, path in zip(names, paths):
+            with self.subTest(name=name):
+                self.assertEqual(os.path.dirname(path), cache_dir)
+                self.assertTrue(os.path.basename(path).startswith("articles-"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+검색어 샤드 수집(--shard i/N) 결과를 병합(--merge)하면 한 프로세스로 수집한 것과 같은 기사·같은 ID·같은 보고서가
+나오는지, 리다이렉트 해석(HEAD 요청)도 순차 수집과 같은 기사에만 하는지 확인.
+
+benchmarks/local_server.py의 로컬 피드 서버(리다이렉트/언론사 주소 포함)와 스텁 LLM을 사용합니다.
+
+    python -m pytest tests        (또는 python -m unittest discover tests)
+"""
+import os
+import random
+import unittest
+from unittest import mock
+
+from support import article_rows, fresh_state, load_news_bot, quiet
+
+from benchmarks.local_server import FixtureServer
+
+SHARD_COUNTS = (2, 3)
+
+
+class ShardMergeTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.nb = load_news_bot()
+        cls.server = FixtureServer(latency=0.0, entries=30).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def run_collection(self, collect):
+        """fresh_state 위에서 collect(profile, cache_dir) 실행 → (기사 목록, 보고서, 리다이렉트 요청 수)."""
+        nb = self.nb
+        cache_dir = fresh_state(nb)
+        nb.domain_resolver.offline = False  # 리다이렉트를 로컬 서버로 실제 해석 (요청 수 비교)
+        base_url = self.server.base_url
+        build_feed_url = nb.build_feed_url
+
+        def feed_url(keyword, time_window_days=1):
+            return build_feed_url(keyword, time_window_days).replace(nb.GOOGLE_NEWS_BASE_URL, base_url, 1)
+
+        # 리다이렉트 끝의 언론사 주소 요청도 로컬 서버가 받도록 프록시로 지정
+        proxy = {"HTTP_PROXY": base_url, "http_proxy": base_url}
+        redirects = self.server.requests["redirect"]
+        with mock.patch.object(nb, "KEYWORDS", list(nb.KEYWORDS[:9])), mock.patch.object(nb, "build_feed_url", feed_url), \
+                mock.patch.dict(os.environ, proxy), quiet():
+            profile = nb.default_profile()
+            items = collect(profile, cache_dir)
+            ai_data = nb.generate_analysis_data(items, False, profile)
+            # build_report_variants와 같은 렌더링, 이스터에그 위치만 고정
+            report = nb.render_report(ai_data, items, "2026년 10월 19일", rng=random.Random(0), team=profile.team)
+        return items, report, self.server.requests["redirect"] - redirects
+
+    def sequential(self, profile, cache_dir):
+        return self.nb.fetch_news(profile=profile)
+
+    def sharded(self, count):
+        def collect(profile, cache_dir):
+            paths = [os.path.join(cache_dir, f"shard-{index}-of-{count}.json") for index in range(1, count + 1)]
+            for index, path in enumerate(paths, 1):
+                self.nb.run_shard([profile], index, count, path)
+            collected, is_monday = self.nb.merge_shards([profile], paths)
+            self.assertFalse(is_monday)
+            return collected[profile.name]
+        return collect
+
+    def test_merged_shards_match_sequential_run(self):
+        items, report, redirects = self.run_collection(self.sequential)
+        self.assertGreater(len(items), 30)
+        self.assertGreater(redirects, 0)
+
+        for count in SHARD_COUNTS:
+            with self.subTest(shards=count):
+                merged_items, merged_report, merged_redirects = self.run_collection(self.sharded(count))
+                self.assertEqual(article_rows(merged_items), article_rows(items))
+                self.assertEqual(merged_report, report)
+                # 병합도 중복 제거/건수 제한을 거치며 필요한 기사만 해석 (창 30건 전체를 미리 해석하지 않음)
+                self.assertEqual(merged_redirects, redirects)
+
+
+if __name__ == "__main__":
+    unittest.main()
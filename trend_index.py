@@ -0,0 +1,200 @@
+"""
+일별 보고 이력과 추세 집계 (SQLite).
+
+발송한 보고서의 기사(카테고리, 검색어, Gemini risk_level 판정)를 날짜별로 쌓아 두고,
+같은 트랜잭션에서 일별 집계(검색어별·카테고리별 기사 수, 카테고리별 risk_level 분포)를 함께 갱신합니다.
+주간/월간 추세 보고서는 원본 기사를 다시 훑지 않고 일별 집계 행만 읽어 계산합니다 (기간 일수에 비례).
+
+- items: 원본 기록 (날짜, 프로필, 정규화한 링크 기준으로 한 번만 추가, 추가만 하고 지우지 않음)
+- daily_keywords / daily_categories / daily_risks: 일별 집계. 같은 날 재실행(발송 실패 후 재시도, 상주 모드)으로
+  같은 기사가 다시 들어오면 새로 추가된 기사만 더하고, risk_level이 바뀐 기사는 이전 판정에서 빼고 새 판정에 더함
+"""
+import os
+import sqlite3
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+from article_store import canonical_link
+
+RISK_LEVELS = ("Critical", "Warning", "Info")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    day         TEXT NOT NULL,      -- 보고 날짜 (KST, YYYY-MM-DD)
+    profile     TEXT NOT NULL,
+    link        TEXT NOT NULL,      -- 정규화한 링크
+    title       TEXT NOT NULL,
+    category    TEXT NOT NULL,
+    keyword     TEXT NOT NULL,
+    risk_level  TEXT,               -- AI 분석 카드로 선정된 기사만 (그 외 NULL)
+    recorded_at REAL NOT NULL,
+    PRIMARY KEY (day, profile, link)
+);
+CREATE INDEX IF NOT EXISTS idx_items_profile_day ON items(profile, day);
+
+CREATE TABLE IF NOT EXISTS daily_keywords (
+    day TEXT NOT NULL, profile TEXT NOT NULL, keyword TEXT NOT NULL, count INTEGER NOT NULL,
+    PRIMARY KEY (profile, day, keyword)
+);
+CREATE TABLE IF NOT EXISTS daily_categories (
+    day TEXT NOT NULL, profile TEXT NOT NULL, category TEXT NOT NULL, count INTEGER NOT NULL,
+    PRIMARY KEY (profile, day, category)
+);
+CREATE TABLE IF NOT EXISTS daily_risks (
+    day TEXT NOT NULL, profile TEXT NOT NULL, category TEXT NOT NULL, risk_level TEXT NOT NULL, count INTEGER NOT NULL,
+    PRIMARY KEY (profile, day, category, risk_level)
+);
+"""
+
+
+class TrendIndex:
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+
+    def open(self):
+        if self._conn is not None:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def record(self, day, profile, articles, ai_data=None):
+        """
+        보고서 한 건의 기사(ArticleCollection)와 카드 판정 기록. (새로 추가된 기사 수, risk_level이 바뀐 기사 수) 반환.
+        day: 보고 날짜(date 또는 "YYYY-MM-DD"), ai_data: 분석 결과 (selected_cards의 id → risk_level)
+        """
+        self.open()
+        day = str(day)
+        risks = {card.get("id"): card.get("risk_level") for card in (ai_data or {}).get("selected_cards", [])}
+        keyword_delta, category_delta, risk_delta = Counter(), Counter(), Counter()
+        inserts, updates = [], []
+        now = time.time()
+
+        existing = {  # 링크 → [카테고리, risk_level] (집계는 처음 기록한 카테고리 기준)
+            link: [category, risk] for link, category, risk in self._conn.execute(
+                "SELECT link, category, risk_level FROM items WHERE profile = ? AND day = ?", (profile, day))
+        }
+        for item in articles:
+            link = canonical_link(item.link)
+            risk = risks.get(item.id)
+            if link not in existing:
+                existing[link] = [item.category, risk]  # 같은 보고서 안에서 링크가 겹쳐도 한 번만
+                inserts.append((day, profile, link, item.title, item.category, item.keyword, risk, now))
+                keyword_delta[item.keyword] += 1
+                category_delta[item.category] += 1
+                if risk:
+                    risk_delta[item.category, risk] += 1
+            elif risk and risk != existing[link][1]:
+                category, old_risk = existing[link]
+                if old_risk:
+                    risk_delta[category, old_risk] -= 1
+                risk_delta[category, risk] += 1
+                existing[link][1] = risk
+                updates.append((risk, day, profile, link))
+
+        with self._conn:
+            self._conn.executemany("INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?)", inserts)
+            self._conn.executemany("UPDATE items SET risk_level = ? WHERE day = ? AND profile = ? AND link = ?", updates)
+            self._bump("daily_keywords", "keyword", [(day, profile, k, n) for k, n in keyword_delta.items()])
+            self._bump("daily_categories", "category", [(day, profile, c, n) for c, n in category_delta.items()])
+            self._conn.executemany(
+                """
+                INSERT INTO daily_risks (day, profile, category, risk_level, count) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(profile, day, category, risk_level) DO UPDATE SET count = count + excluded.count
+                """,
+                [(day, profile, c, r, n) for (c, r), n in risk_delta.items() if n],
+            )
+        return len(inserts), len(updates)
+
+    def _bump(self, table, column, rows):
+        self._conn.executemany(
+            f"""
+            INSERT INTO {table} (day, profile, {column}, count) VALUES (?, ?, ?, ?)
+            ON CONFLICT(profile, day, {column}) DO UPDATE SET count = count + excluded.count
+            """,
+            rows,
+        )
+
+    def rollup(self, profile, start, end):
+        """
+        start~end(포함) 기간의 집계: {"days", "articles", "keywords", "categories", "risks"}.
+        일별 집계 테이블만 읽음 (원본 기사는 읽지 않음).
+        """
+        self.open()
+        span = (profile, str(start), str(end))
+        where = "WHERE profile = ? AND day BETWEEN ? AND ?"
+        keywords = Counter(dict(self._conn.execute(
+            f"SELECT keyword, SUM(count) FROM daily_keywords {where} GROUP BY keyword", span)))
+        categories = Counter(dict(self._conn.execute(
+            f"SELECT category, SUM(count) FROM daily_categories {where} GROUP BY category", span)))
+        risks = {}
+        for category, risk, count in self._conn.execute(
+                f"SELECT category, risk_level, SUM(count) FROM daily_risks {where} GROUP BY category, risk_level", span):
+            if count:
+                risks.setdefault(category, Counter())[risk] = count
+        days = self._conn.execute(f"SELECT COUNT(DISTINCT day) FROM daily_categories {where}", span).fetchone()[0]
+        return {
+            "days": days,
+            "articles": sum(categories.values()),
+            "keywords": keywords,
+            "categories": categories,
+            "risks": risks,
+        }
+
+    def mentions(self, profile, phrase, start, end):
+        """기간 안에 제목에 phrase가 들어간 기사 수 (집계에 없는 임의 문구용, 해당 기간의 원본 기사만 검색)."""
+        self.open()
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM items WHERE profile = ? AND day BETWEEN ? AND ? AND instr(title, ?) > 0",
+            (profile, str(start), str(end), phrase),
+        ).fetchone()[0]
+
+    def trend_report(self, profile, end, days=7, top=10):
+        """
+        end까지 최근 days일 추세 보고서(텍스트). 직전 같은 길이 기간과 비교하여
+        검색어별 기사 수 증감과 카테고리별 Critical 판정 증감을 표시.
+        """
+        end = date.fromisoformat(str(end))
+        start = end - timedelta(days=days - 1)
+        prev_end = start - timedelta(days=1)
+        prev_start = prev_end - timedelta(days=days - 1)
+        current = self.rollup(profile, start, end)
+        previous = self.rollup(profile, prev_start, prev_end)
+
+        lines = [
+            f"📈 [{profile}] {start} ~ {end} ({days}일) 추세 — 보고일 {current['days']}일, 기사 {current['articles']}건 "
+            f"(직전 {days}일 {previous['articles']}건)",
+            "",
+            "■ 검색어별 기사 수 (직전 기간 대비)",
+        ]
+        for keyword, count in current["keywords"].most_common(top):
+            lines.append(f"  {keyword}: {count}건 ({_signed(count - previous['keywords'].get(keyword, 0))})")
+
+        lines += ["", "■ 카테고리별 기사 수와 AI 위험도 판정 (Critical/Warning/Info)"]
+        for category, count in current["categories"].most_common():
+            risks = current["risks"].get(category, Counter())
+            histogram = "/".join(str(risks.get(level, 0)) for level in RISK_LEVELS)
+            lines.append(f"  {category}: {count}건, 판정 {histogram}")
+
+        rising = []
+        for category in set(current["risks"]) | set(previous["risks"]):
+            now_critical = current["risks"].get(category, Counter()).get("Critical", 0)
+            before_critical = previous["risks"].get(category, Counter()).get("Critical", 0)
+            if now_critical > before_critical:
+                rising.append((now_critical - before_critical, category, now_critical, before_critical))
+        if rising:
+            lines += ["", "■ Critical 판정이 늘어난 카테고리"]
+            for _, category, now_critical, before_critical in sorted(rising, reverse=True):
+                lines.append(f"  {category}: Critical {before_critical} → {now_critical}건")
+        return "\n".join(lines)
+
+
+def _signed(delta):
+    return f"+{delta}" if delta > 0 else ("±0" if delta == 0 else str(delta))